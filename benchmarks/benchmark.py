@@ -0,0 +1,168 @@
+"""
+Benchmarks for the DAC encoding and transfer paths and for the VISA instrument classes. Everything runs against the
+simulated transport and a simulated VISA instrument, so no hardware is needed. Results are written as JSON so they can
+be compared between releases.
+
+Usage::
+
+    python benchmark.py --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+from multichannel_control.lightSource import TSL510
+from multichannel_control.opticalPowerMeter import KEYSIGHT81634B
+
+
+def timed(function, repeat: int) -> np.ndarray:
+    """Calls function repeat times and returns the duration of each call in seconds"""
+    durations = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations[i] = time.perf_counter() - start
+    return durations
+
+
+def latency_summary(durations: np.ndarray) -> dict:
+    return {"calls": len(durations),
+            "mean_us": float(np.mean(durations) * 1e6),
+            "p50_us": float(np.percentile(durations, 50) * 1e6),
+            "p99_us": float(np.percentile(durations, 99) * 1e6)}
+
+
+def bench_encode(n: int) -> dict:
+    """Encoding rate of _make_word (per sample) and encode_words (vectorized)"""
+    samples = np.random.rand(n)
+    n_scalar = min(n, 100000)
+
+    start = time.perf_counter()
+    for value in samples[:n_scalar].tolist():
+        DAC8568._make_word(command="WRITE_AND_UPDATE", channel="A", value=value)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    DAC8568.encode_words("WRITE_AND_UPDATE", "A", samples).tobytes()
+    vectorized = time.perf_counter() - start
+
+    return {"make_word_samples_per_s": n_scalar / scalar,
+            "encode_words_samples_per_s": n / vectorized}
+
+
+def bench_transfer(n: int, baud_rate: int, transaction_latency: float) -> dict:
+    """Samples per second for single writes and batched streaming, measured and modelled"""
+    samples = np.random.rand(n)
+    results = {}
+
+    def run(name, play, framed_transfers=False):
+        transport = SimulatedSPITransport(baud_rate=baud_rate, transaction_latency=transaction_latency,
+                                          framed_transfers=framed_transfers)
+        dac = DAC8568(baud_rate=baud_rate, transport=transport)
+        dac.connect()
+        transport.reset()
+        start = time.perf_counter()
+        play(dac)
+        wall = time.perf_counter() - start
+        results[name] = {"host_samples_per_s": n / wall,
+                         "modelled_samples_per_s": n / transport.elapsed,
+                         "transactions": transport.transactions}
+
+    def single(dac):
+        for value in samples.tolist():
+            dac.write_and_update(channel="A", value=value)
+
+    run("write_and_update", single)
+    # One transaction per word, like transport.BusioSPITransport
+    run("stream_waveform", lambda dac: dac.stream_waveform(channel="A", samples=samples))
+    # One transaction per chunk, like transport.FtdiSPITransport
+    run("stream_waveform_framed", lambda dac: dac.stream_waveform(channel="A", samples=samples),
+        framed_transfers=True)
+
+    # 8 channel staircase where one channel steps per frame, for full and change-only frames. Delta mode sends 2 of
+    # the 9 words per frame. With framed transfers each chunk is one transaction, so the modelled rate follows the
+    # number of words. With one transaction per word the fixed cost of each transaction dominates instead.
+    staircase = np.zeros((n, 8), dtype=np.uint16)
+    staircase[np.arange(n), np.arange(n) % 8] = np.arange(n) % 2 ** 16
+    staircase = np.maximum.accumulate(staircase, axis=0)
+    run("stream_frames_staircase", lambda dac: dac.stream_frames(staircase, codes=True), framed_transfers=True)
+    run("stream_frames_delta_staircase", lambda dac: dac.stream_frames(staircase, delta=True, codes=True),
+        framed_transfers=True)
+    run("stream_frames_delta_staircase_per_word",
+        lambda dac: dac.stream_frames(staircase, delta=True, codes=True))
+    return results
+
+
+def bench_memory(n: int) -> dict:
+    """Bytes of encoded buffer per sample and peak traced allocation per sample while streaming"""
+    samples = np.random.rand(n)
+    transport = SimulatedSPITransport(transaction_latency=0., framed_transfers=True)
+    dac = DAC8568(baud_rate=100000, transport=transport)
+    dac.connect()
+    transport.reset()
+
+    tracemalloc.start()
+    dac.stream_waveform(channel="A", samples=samples)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"encoded_bytes_per_sample": DAC8568.encode_words("WRITE", "A", samples).nbytes / n,
+            "stream_peak_bytes_per_sample": (peak - transport.bytes_written) / n}
+
+
+def bench_visa(repeat: int, latency: float) -> dict:
+    """Call latency of the instrument getters against a simulated instrument, with the state cache disabled"""
+    meter = KEYSIGHT81634B(cache_ttl=0., resource=SimulatedInstrument({":READ:POW?": "-1.234E+01"}, latency=latency))
+    laser = TSL510(cache_ttl=0., resource=SimulatedInstrument({":POW:ACT?": "1.000", ":POW:LEV:MIN?": "-15.0",
+                                                               ":POW:LEV:MAX?": "10.0", ":WAV:MIN?": "1500.0",
+                                                               ":WAV:MAX?": "1630.0", ":POW:STAT?": "1",
+                                                               ":POW:ATT:AUT?": "0", ":POW:SHUT?": "0",
+                                                               ":POW:UNIT?": "0", ":WAV:UNIT?": "0"},
+                                                              latency=latency))
+
+    return {"KEYSIGHT81634B.get_power": latency_summary(timed(meter.get_power, repeat)),
+            "TSL510.get_power_true": latency_summary(timed(laser.get_power_true, repeat)),
+            "TSL510.get_range_power": latency_summary(timed(laser.get_range_power, repeat)),
+            "TSL510.get_range_color": latency_summary(timed(laser.get_range_color, repeat)),
+            "TSL510.snapshot": latency_summary(timed(laser.snapshot, repeat))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100000, help="Number of waveform samples")
+    parser.add_argument("--baud-rate", type=int, default=1000000, help="Modelled SPI clock rate")
+    parser.add_argument("--transaction-latency", type=float, default=0.001,
+                        help="Modelled USB latency per SPI transaction in seconds")
+    parser.add_argument("--visa-repeat", type=int, default=1000, help="Number of calls per VISA getter")
+    parser.add_argument("--visa-latency", type=float, default=0., help="Simulated VISA round trip in seconds")
+    parser.add_argument("--output", help="File to write the JSON results to. Defaults to STDOUT.")
+    args = parser.parse_args()
+
+    results = {"python": platform.python_version(),
+               "numpy": np.__version__,
+               "parameters": vars(args),
+               "encode": bench_encode(args.samples),
+               "transfer": bench_transfer(args.samples, args.baud_rate, args.transaction_latency),
+               "memory": bench_memory(args.samples),
+               "visa": bench_visa(args.visa_repeat, args.visa_latency)}
+
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import unittest
+
+import numpy as np
+
+from multichannel_control.asyncInstruments import AsyncInstrument
+from multichannel_control.lightSource import TSL510
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+from TestKEYSIGHT81634B import simulated_meter
+from TestTSL510 import simulated_laser
+
+
+def _timed(intervals: list, method, *args):
+    """Calls method and records when it started and ended"""
+    start = time.perf_counter()
+    result = method(*args)
+    intervals.append((start, time.perf_counter()))
+    return result
+
+
+class TestAsyncInstruments(unittest.TestCase):
+
+    def test_concurrent_devices(self):
+        laser = simulated_laser(latency=0.05)
+        meter = simulated_meter({":READ:POW?": "1.5E-06"})
+        meter._inst.latency = 0.05
+        intervals = []
+
+        async def main():
+            async_laser, async_meter = AsyncInstrument(laser), AsyncInstrument(meter)
+            _, power = await asyncio.gather(async_laser.call(_timed, intervals, laser.set_color, 1550.),
+                                            async_meter.call(_timed, intervals, meter.get_power))
+            return power
+
+        self.assertEqual(1.5e-6, asyncio.run(main()))
+        (_, first_end), (second_start, _) = sorted(intervals)
+        self.assertLess(second_start, first_end)
+
+    def test_shared_session_is_serialized(self):
+        laser = simulated_laser(latency=0.02)
+        other = TSL510(resource=laser._inst)
+        intervals = []
+
+        async def main():
+            await asyncio.gather(AsyncInstrument(laser).call(_timed, intervals, laser.set_power, 1.),
+                                 AsyncInstrument(other).call(_timed, intervals, other.set_power, 2.))
+
+        asyncio.run(main())
+        (_, first_end), (second_start, _) = sorted(intervals)
+        self.assertGreaterEqual(second_start, first_end)
+
+    def test_same_device_is_serialized(self):
+        laser = simulated_laser(latency=0.02)
+
+        async def main():
+            async_laser = AsyncInstrument(laser)
+            await asyncio.gather(*(async_laser.set_power(float(power)) for power in range(5)))
+
+        start = time.perf_counter()
+        asyncio.run(main())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual(5, len(laser._inst.writes))
+
+    def test_stream_waveform(self):
+        transport = SimulatedSPITransport()
+
+        async def main():
+            dac = await AsyncInstrument.open(DAC8568, baud_rate=100000, transport=transport)
+            await dac.stream_waveform("A", np.linspace(0., 1., 100))
+
+        asyncio.run(main())
+        self.assertEqual(102, transport.transactions)
+
+
+if __name__ == '__main__':
+    unittest.main()
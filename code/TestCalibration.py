@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from multichannel_control.calibration import ChannelCalibration, DACCalibration, calibrate
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+
+
+class SimulatedMeter:
+    """Reads a quadratic function of the output of channel A of a simulated DAC"""
+
+    def __init__(self, transport: SimulatedSPITransport, channel: int):
+        self.transport = transport
+        self.channel = channel
+
+    def get_power(self) -> float:
+        voltage = self.transport.outputs(reference_voltage=1., gain=1.)[self.channel]
+        return 1e-3 * voltage ** 2 + 1e-6
+
+
+class TestCalibration(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = SimulatedSPITransport(transaction_latency=0.)
+        self.dac = DAC8568(baud_rate=100000, transport=self.transport)
+
+    def test_calibrate_and_stream_power(self):
+        self.dac.calibration = calibrate(self.dac, SimulatedMeter(self.transport, 1), ["B"], points=65,
+                                         settle_time=0.)
+        targets = np.linspace(1e-4, 9e-4, 50)
+        self.transport.reset()
+        self.dac.stream_power("B", targets)
+
+        voltages = self.transport.output_history(reference_voltage=1., gain=1.)[:, 1]
+        np.testing.assert_allclose(targets, 1e-3 * voltages ** 2 + 1e-6, rtol=1e-2)
+
+    def test_set_channel_powers(self):
+        self.dac.calibration = DACCalibration({"A": ChannelCalibration([0., 1.], [0., 2.]),
+                                               "C": ChannelCalibration([0., 1.], [2., 0.])})
+        self.dac.set_channel_powers({"A": 1., "C": 0.5})
+        outputs = self.transport.outputs(reference_voltage=2 ** 16, gain=1.)
+        self.assertEqual([0x7FFF, 0xBFFF], [outputs[0], outputs[2]])
+
+    def test_stream_scalar_power(self):
+        self.dac.calibration = DACCalibration({"A": ChannelCalibration([0., 1.], [0., 2.])})
+        self.dac.stream_power("A", 1.)
+        self.assertEqual(0x7FFF, self.transport.outputs(reference_voltage=2 ** 16, gain=1.)[0])
+
+    def test_monotonic_fit(self):
+        calibration = ChannelCalibration([0., 0.25, 0.5, 0.75, 1.], [0., 2., 1., 3., 4.])
+        np.testing.assert_allclose([0., 1.5, 1.5, 3., 4.], calibration.fitted_powers)
+        np.testing.assert_allclose([0.375], calibration.to_value([1.5]))
+        self.assertEqual((0., 4.), calibration.power_range)
+
+        plateau = ChannelCalibration([0., 0.5, 0.7, 1.], [3., 1., 1., 0.])
+        np.testing.assert_allclose([0.6], plateau.to_value([1.]))
+        np.testing.assert_allclose([2., 0.5], plateau.to_power([0.3, 0.8]))
+
+    def test_not_invertible(self):
+        with self.assertRaises(ValueError):
+            ChannelCalibration([0., 0.5, 1.], [1., 1., 1.])
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), "calibration.npz")
+        DACCalibration({"A": ChannelCalibration([0., 1.], [1., 3.])}).save(path)
+        loaded = DACCalibration.load(path)
+        np.testing.assert_allclose([0.25], loaded["A"].to_value([1.5]))
+
+
+if __name__ == '__main__':
+    unittest.main()
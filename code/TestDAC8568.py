@@ -1,21 +1,192 @@
 import unittest
 
-#from DAC8568 import make_word, float_to_uint16
+import numpy as np
+
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import FtdiSPITransport, SimulatedSPITransport, SPIBus, SPITransport, _FtdiBus
+
+
+class RecordingFtdi:
+    """Stands in for pyftdi.ftdi.Ftdi and records the MPSSE command buffers"""
+
+    def __init__(self):
+        self.writes = []
+
+    def write_data(self, data) -> None:
+        self.writes.append(bytes(data))
+
+
+def stub_ftdi_transports(cs_pins) -> list:
+    """FtdiSPITransports on one _FtdiBus whose board is a RecordingFtdi, with the clock idling high"""
+    bus = _FtdiBus.__new__(_FtdiBus)
+    SPIBus.__init__(bus)
+    bus.chip_selects = sum(1 << pin for pin in cs_pins)
+    bus.clock_idle = 0x01
+    bus.set_bits = 0x80  # Ftdi.SET_BITS_LOW
+    bus.write_command = 0x10  # Ftdi.WRITE_BYTES_PVE_MSB
+    bus.ftdi = RecordingFtdi()
+    transports = []
+    for pin in cs_pins:
+        transport = FtdiSPITransport.__new__(FtdiSPITransport)
+        transport._cs = 1 << pin
+        transport.bus = bus
+        transports.append(transport)
+    return transports
 
 
 class TestDAC8568(unittest.TestCase):
-    if __name__ == '__main__':
-        unittest.main()
 
-    # def testInstantialte(self):
-    #     val = make_word(prefix_bits=0b00, control_bits=0b0011, address_bits=0b0000, data_bits=0b1111111111111111,
-    #                       feature_bits=0b0000)
-    #     #val = DAC8568.makeFrame(0b00, 0b0011, 0b0000, 0b1111111111111111, 0b0000)
-    #
-    #     self.assertEqual(bytes(0b000011000011111111111111110000), val)
+    def setUp(self):
+        self.transport = SimulatedSPITransport()
+        self.dac = DAC8568(baud_rate=100000, transport=self.transport)
+        self.dac.connect()
+        self.transport.reset()
+
+    def test_initialization(self):
+        transport = SimulatedSPITransport()
+        dac = DAC8568(baud_rate=100000, transport=transport)
+        self.assertEqual(0, transport.transactions)
+        dac.connect()
+        dac.connect()
+        self.assertEqual([0x07000000, 0x090A0000], transport.words.tolist())
+
+    def test_connect_on_first_use(self):
+        transport = SimulatedSPITransport()
+        dac = DAC8568(baud_rate=100000, transport=transport)
+        dac.write_and_update(channel="A", value=1.)
+        self.assertEqual([0x07000000, 0x090A0000, 0x030FFFF0], transport.words.tolist())
+
+    def test_use_after_close(self):
+        transport = SimulatedSPITransport()
+        dac = DAC8568(baud_rate=100000, transport=transport)
+        dac.connect()
+        dac.close()
+        dac.close()
+        with self.assertRaises(RuntimeError):
+            dac.write_and_update(channel="A", value=1.)
+        with self.assertRaises(RuntimeError):
+            dac.connect()
+        self.assertEqual(2, transport.transactions)
+
+    def test_ftdi_frame_commands(self):
+        chip, other = stub_ftdi_transports([3, 4])
+        words = DAC8568.encode_words("WRITE", ["A", "B"], [0., 1.])
+        chip.write_frames(words, 4)
+        self.assertEqual(1, len(chip.bus.ftdi.writes))
+
+        # Idle: clock high and both chip-select lines (D3, D4) high. Pins D0, D1, D3 and D4 are outputs.
+        select, release = [0x80, 0x19 & ~0x08, 0x1B], [0x80, 0x19, 0x1B]
+        expected = b"".join(bytes(select + [0x10, 3, 0]) + word + bytes(release) for word in
+                            (words[:1].tobytes(), words[1:].tobytes()))
+        self.assertEqual(expected, chip.bus.ftdi.writes[0])
+
+        # Chips on one bus are interleaved frame by frame, each word with its own chip-select line
+        chip.bus.write_samples([(chip, words, [0, 1, 2]), (other, words[::-1].copy(), [0, 1, 2])], 4)
+        commands = np.frombuffer(chip.bus.ftdi.writes[1], dtype=np.uint8).reshape(4, 13)
+        self.assertEqual([0x11, 0x09, 0x11, 0x09], commands[:, 1].tolist())
+        self.assertEqual([words[0], words[1], words[1], words[0]],
+                         [np.frombuffer(row[6:10].tobytes(), dtype=">u4")[0] for row in commands])
+
+    def test_transport_framing(self):
+        with self.assertRaises(TypeError):
+            SPITransport()
+        with self.assertRaises(AssertionError):
+            self.transport.write(DAC8568.encode_words("WRITE", ["A", "B"], [0., 1.]).tobytes())
+        self.transport.write_frames(DAC8568.encode_words("WRITE", ["A", "B"], [0., 1.]), 4)
+        self.assertEqual(2, self.transport.transactions)
+
+    def test_make_word(self):
+        word = DAC8568._make_word(command="WRITE_AND_UPDATE", channel="A", value=1.)
+        self.assertEqual(b'\x03\x0F\xFF\xF0', word)
+
+    def test_float_to_int(self):
+        self.assertEqual(DAC8568._float_to_int(0.), 0x0000)
+        self.assertEqual(DAC8568._float_to_int(1.), 0xFFFF)
+        self.assertEqual(DAC8568._float_to_int(0.5), 0x7FFF)
+
+    def test_encode_words_matches_make_word(self):
+        samples = np.linspace(0., 1., 101)
+        expected = b''.join(DAC8568._make_word(command="WRITE_AND_UPDATE", channel="C", value=float(y))
+                            for y in samples)
+        self.assertEqual(expected, DAC8568.encode_words("WRITE_AND_UPDATE", "C", samples).tobytes())
+
+    def test_encode_words_arrays(self):
+        words = DAC8568.encode_words(commands=["WRITE", "UPDATE"], channels=["H", "ALL"],
+                                     values=np.array([0xFFFF, 0], dtype=np.uint16), codes=True)
+        self.assertEqual(b'\x00\x7F\xFF\xF0\x01\xF0\x00\x00', words.tobytes())
+
+    def test_encode_words_out_of_range(self):
+        with self.assertRaises(AssertionError):
+            DAC8568.encode_words("WRITE_AND_UPDATE", "A", [0.5, 1.5])
+        with self.assertRaises(AssertionError):
+            DAC8568.encode_words("WRITE_AND_UPDATE", "A", [-1, 2])
+        with self.assertRaises(AssertionError):
+            DAC8568.encode_words("WRITE_AND_UPDATE", "A", [0.5], codes=True)
+        with self.assertRaises(AssertionError):
+            DAC8568.encode_words("WRITE_AND_UPDATE", "Z", [0.5])
+
+    def test_encode_frames(self):
+        frames = np.array([[0x0001, 0x0002], [0x0003, 0x0004]], dtype=np.uint16)
+        words = self.dac._encode_frames(["A", "B"], frames, codes=True)
+        self.assertEqual([0x00000010, 0x00100020, 0x01F00000, 0x00000030, 0x00100040, 0x01F00000], words.tolist())
+
+    def test_channels_to_byte(self):
+        self.assertEqual(0b10000001, DAC8568._channels_to_byte(["A", "H"]))
+        self.assertEqual(0b11111111, DAC8568._channels_to_byte(["ALL"]))
+
+    def test_stream_waveform(self):
+        samples = np.arange(0, 2 ** 16, 2 ** 8, dtype=np.uint16)
+        self.dac.stream_waveform(channel="B", samples=samples, chunk_size=7, codes=True)
+        self.assertEqual(len(samples), self.transport.transactions)
+        history = self.transport.output_history(reference_voltage=1., gain=1.)
+        np.testing.assert_allclose(samples[1:] / 2 ** 16, history[:, 1])
+
+    def test_set_channels(self):
+        self.dac.set_channels({"A": 1., "C": 0.5})
+        np.testing.assert_allclose([0xFFFF, 0, 0x7FFF, 0, 0, 0, 0, 0],
+                                   self.transport.outputs(reference_voltage=2 ** 16, gain=1.))
+        self.assertEqual(1, len(self.transport.output_history()))
+        self.assertEqual(3, self.transport.transactions)  # The DAC latches a word when chip select is released
+
+        self.dac.set_channels(np.linspace(0., 1., 8))
+        self.assertEqual(2, len(self.transport.output_history()))
+
+        self.dac.set_channels({"A": 1, "B": 0})  # Integers are values too unless codes is set
+        self.assertEqual([0xFFFF, 0], self.transport.outputs(2 ** 16, 1.)[:2].tolist())
+        self.dac.set_channels({"A": 1, "B": 0}, codes=True)
+        self.assertEqual([1, 0], self.transport.outputs(2 ** 16, 1.)[:2].tolist())
+
+    def test_stream_frames(self):
+        frames = np.random.randint(0, 2 ** 16, size=(20, 8), dtype=np.uint16)
+        self.dac.stream_frames(frames, codes=True)
+        np.testing.assert_array_equal(frames, self.transport.output_history(reference_voltage=2 ** 16, gain=1.))
+
+    def test_stream_frames_delta(self):
+        frames = np.repeat(np.arange(1, 11, dtype=np.uint16)[:, np.newaxis], 4, axis=1)  # Staircase
+        frames[:, 1] = 7
+        frames[:, 3] = 3
+        frames[5:, 3] = 99
+        self.dac.stream_frames(frames, channels=["A", "B", "C", "D"], delta=True, codes=True)
+        # 5 words for the first frame, then 3 (A, C and UPDATE) or 4 when D changes as well
+        self.assertEqual(5 + 8 * 3 + 4, len(self.transport.words))
+        np.testing.assert_array_equal(frames, self.transport.output_history(2 ** 16, 1.)[:, :4])
+
+        self.transport.reset()
+        self.dac.set_channels({"A": 10, "B": 8}, delta=True, codes=True)
+        self.assertEqual([0x00100080, 0x01F00000], self.transport.words.tolist())
+        self.dac.set_channels({"A": 10, "B": 8}, delta=True, codes=True)
+        self.assertEqual(2, len(self.transport.words))
+
+        self.dac.write_and_update(channel="C", value=0.)  # Clears the shadow copy
+        self.transport.reset()
+        self.dac.set_channels({"A": 10}, delta=True, codes=True)
+        self.assertEqual(2, len(self.transport.words))
+
+    def test_channel_register_words(self):
+        self.dac.write_to_ldac_register(["A", "H"])
+        self.dac.power_up_dac(["ALL"])
+        self.assertEqual([0x06000081, 0x040000FF], self.transport.words.tolist())
 
-    # def test_float_to_uint(self):
-    #     self.assertEqual(float_to_uint16(0.), b'\x00\x00');
-    #     self.assertEqual(float_to_uint16(1.), b'\xFF\xFF');
-    #     self.assertEqual(float_to_uint16(0.5), b'\x7F\xFF');
 
+if __name__ == '__main__':
+    unittest.main()
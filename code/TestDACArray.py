@@ -0,0 +1,86 @@
+import time
+import unittest
+
+import numpy as np
+
+from multichannel_control.dacArray import DACArray
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPIBus, SimulatedSPITransport
+
+
+class TestDACArray(unittest.TestCase):
+
+    def setUp(self):
+        self.transports = [SimulatedSPITransport(transaction_latency=0.) for _ in range(3)]
+        self.dacs = DACArray([DAC8568(baud_rate=100000, transport=transport) for transport in self.transports])
+        self.dacs.connect()
+        for transport in self.transports:
+            transport.reset()
+
+    def tearDown(self):
+        self.dacs.close()
+
+    def test_locate(self):
+        self.assertEqual(24, self.dacs.channel_count)
+        self.assertEqual((0, "A"), self.dacs.locate(0))
+        self.assertEqual((1, "B"), self.dacs.locate(9))
+        self.assertEqual((2, "H"), self.dacs.locate(23))
+
+    def test_set_channels(self):
+        values = np.arange(24, dtype=np.uint16) * 1000
+        self.dacs.set_channels(values, codes=True)
+        outputs = np.concatenate([transport.outputs(2 ** 16, 1.) for transport in self.transports])
+        np.testing.assert_array_equal(values, outputs)
+
+        transactions = self.transports[1].transactions
+        self.dacs.set_channels({3: 7, 20: 9}, codes=True)
+        self.assertEqual(7, self.transports[0].outputs(2 ** 16, 1.)[3])
+        self.assertEqual(transactions, self.transports[1].transactions)
+        self.assertEqual(9, self.transports[2].outputs(2 ** 16, 1.)[4])
+
+    def test_stream_frames(self):
+        frames = np.random.randint(1, 2 ** 16, size=(50, 3), dtype=np.uint16)
+        self.dacs.stream_frames(frames, channels=[0, 8, 17], codes=True)
+        np.testing.assert_array_equal(frames[:, 0], self.transports[0].output_history(2 ** 16, 1.)[:, 0])
+        np.testing.assert_array_equal(frames[:, 1], self.transports[1].output_history(2 ** 16, 1.)[:, 0])
+        np.testing.assert_array_equal(frames[:, 2], self.transports[2].output_history(2 ** 16, 1.)[:, 1])
+
+    def test_shared_bus(self):
+        bus = SimulatedSPIBus()
+        transports = [SimulatedSPITransport(transaction_latency=0., bus=bus) for _ in range(2)]
+        dacs = DACArray([DAC8568(baud_rate=100000, transport=transport) for transport in transports])
+        frames = np.random.randint(1, 2 ** 16, size=(10, 16), dtype=np.uint16)
+        dacs.stream_frames(frames, chunk_size=4, codes=True)
+        self.assertEqual(3, bus.transactions)
+        # The words of frame i of both chips are sent before those of frame i + 1
+        self.assertEqual([0] * 9 + [1] * 9, [transports.index(transport) for transport in bus.selects[:18]])
+        self.assertEqual(180, len(bus.selects))
+        for chip, transport in enumerate(transports):
+            np.testing.assert_array_equal(frames[:, chip * 8:chip * 8 + 8], transport.output_history(2 ** 16, 1.))
+
+        # Delta mode only sends the chips and channels that changed
+        frames[:, 3] = 7
+        dacs.stream_frames(frames[-1:], delta=True, codes=True)
+        bus.selects.clear()
+        dacs.stream_frames(frames[-1:], delta=True, codes=True)
+        self.assertEqual([], bus.selects)
+        words = len(transports[1].words)
+        dacs.set_channels({9: 5}, delta=True, codes=True)
+        self.assertEqual(words + 2, len(transports[1].words))
+        self.assertEqual(5, transports[1].outputs(2 ** 16, 1.)[1])
+        dacs.close()
+
+    def test_buses_run_in_parallel(self):
+        transports = [SimulatedSPITransport(transaction_latency=0.01, framed_transfers=True, realtime=True)
+                      for _ in range(4)]
+        dacs = DACArray([DAC8568(baud_rate=1000000, transport=transport) for transport in transports])
+        dacs.connect()
+        start = time.perf_counter()
+        dacs.stream_frames(np.zeros((20, 32)), chunk_size=1)
+        wall = time.perf_counter() - start
+        dacs.close()
+        self.assertLess(wall, 0.5 * sum(transport.elapsed for transport in transports))
+
+
+if __name__ == '__main__':
+    unittest.main()
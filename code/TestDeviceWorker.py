@@ -0,0 +1,70 @@
+import time
+import unittest
+
+import numpy as np
+
+from multichannel_control.deviceWorker import DeviceWorker, SharedRingBuffer
+from multichannel_control.opticalPowerMeter import KEYSIGHT81634B
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+from multichannel_control.transport import SimulatedSPITransport
+
+
+class TestSharedRingBuffer(unittest.TestCase):
+
+    def test_wrap_and_overrun(self):
+        ring = SharedRingBuffer(capacity=4, width=2)
+        try:
+            attached = SharedRingBuffer(4, 2, name=ring.name)
+            self.assertEqual(3, ring.write(np.arange(6).reshape(3, 2)))
+            np.testing.assert_array_equal([[0, 1], [2, 3]], attached.read(2))
+            self.assertEqual(3, ring.write(np.arange(10, 18).reshape(4, 2)))
+            self.assertEqual(1, ring.overruns)
+            self.assertEqual(2, len(attached.peek()))  # Up to the end of the ring
+            np.testing.assert_array_equal([[4, 5], [10, 11], [12, 13], [14, 15]], attached.read())
+            self.assertEqual(0, len(ring))
+            attached.close()
+        finally:
+            ring.close()
+
+
+class TestDeviceWorker(unittest.TestCase):
+
+    def test_dac(self):
+        with DeviceWorker(DAC8568, kwargs={"baud_rate": 100000,
+                                           "transport": SimulatedSPITransport(transaction_latency=0.)}) as dac:
+            dac.stream_waveform(channel="B", samples=np.arange(1, 11, dtype=np.uint16), codes=True)
+            transport = dac.get("_transport")
+            np.testing.assert_array_equal(np.arange(1, 11), transport.output_history(2 ** 16, 1.)[:, 1])
+            with self.assertRaises(AssertionError):
+                dac.stream_waveform(channel="Z", samples=[0.5])
+
+    def test_stream(self):
+        meter = KEYSIGHT81634B(cache_ttl=0., resource=SimulatedInstrument({":READ:POW?": "-1.5E+01\n"}))
+        with DeviceWorker(built_device, args=(meter,), capacity=100) as worker:
+            start = time.time()
+            worker.start_stream("get_power")
+            self.assertTrue(worker.streaming)
+            while len(worker.results) < 10:
+                time.sleep(0.001)
+            worker.stop_stream()
+            self.assertFalse(worker.streaming)
+            records = worker.results.read()
+            self.assertGreaterEqual(len(records), 10)
+            np.testing.assert_array_equal(-15., records[:, 1])
+            self.assertTrue(np.all(records[:, 0] >= start))
+
+            worker.start_stream("get_errors")  # No response, so the stream stops with an error
+            while worker.streaming:
+                time.sleep(0.001)
+            with self.assertRaises(KeyError):
+                worker.stop_stream()
+
+
+def built_device(device):
+    """Returns a device that was built in the controller process"""
+    return device
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from multichannel_control import discovery
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+
+
+class SimulatedResourceManager:
+    """Hands out SimulatedInstruments by address and counts bus scans"""
+
+    def __init__(self, idns: dict):
+        self.idns = idns
+        self.opened = []
+        self.scans = 0
+
+    def list_resources(self):
+        self.scans += 1
+        return tuple(self.idns.keys())
+
+    def open_resource(self, address, open_timeout=None):
+        if self.idns[address] is None:
+            raise IOError("No device at {}".format(address))
+        inst = SimulatedInstrument({'*IDN?': self.idns[address]})
+        self.opened.append(inst)
+        return inst
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_file = os.path.join(tempfile.mkdtemp(), "resources.json")
+        self.rm = SimulatedResourceManager({"GPIB0::1::INSTR": "Agilent Technologies,8163B,MY48208514,V5.25(72637)",
+                                            "GPIB0::2::INSTR": None,
+                                            "GPIB0::3::INSTR": "SANTEC,TSL-510,14040011,0002.0085"})
+
+    def test_scan_closes_other_resources(self):
+        inst = discovery.find_instrument(self.rm, "TSL-510", cache_file=self.cache_file)
+        self.assertEqual("SANTEC,TSL-510,14040011,0002.0085", inst.query('*IDN?'))
+        self.assertFalse(inst.closed)
+        self.assertEqual(1, sum(not opened.closed for opened in self.rm.opened))
+
+    def test_cached_address_skips_scan(self):
+        discovery.find_instrument(self.rm, "TSL-510", cache_file=self.cache_file)
+        discovery.find_instrument(self.rm, "8163B", cache_file=self.cache_file)
+        self.assertEqual(1, self.rm.scans)
+
+    def test_rescan_when_cached_address_is_stale(self):
+        discovery.find_instrument(self.rm, "TSL-510", cache_file=self.cache_file)
+        self.rm.idns["GPIB0::3::INSTR"], self.rm.idns["GPIB0::2::INSTR"] = None, self.rm.idns["GPIB0::3::INSTR"]
+        inst = discovery.find_instrument(self.rm, "TSL-510", cache_file=self.cache_file)
+        self.assertIn("TSL-510", inst.query('*IDN?'))
+        self.assertEqual(2, self.rm.scans)
+
+    def test_scan_merges_cache(self):
+        discovery._save_cache(self.cache_file, {"KEITHLEY,2400,1,C30": "GPIB0::9::INSTR",
+                                                "SANTEC,TSL-550,1,1": "GPIB0::1::INSTR"})
+        discovery.find_instrument(self.rm, "TSL-510", cache_file=self.cache_file)
+        cache = discovery._load_cache(self.cache_file)
+        self.assertEqual("GPIB0::9::INSTR", cache["KEITHLEY,2400,1,C30"])  # Didn't answer, so it is kept
+        self.assertNotIn("SANTEC,TSL-550,1,1", cache)  # Its address answers with another ID now
+        self.assertEqual("GPIB0::1::INSTR", cache["Agilent Technologies,8163B,MY48208514,V5.25(72637)"])
+
+    def test_not_found(self):
+        with self.assertRaises(RuntimeError):
+            discovery.find_instrument(self.rm, "N7744A", cache_file=self.cache_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from multichannel_control.instrumentation import Instrumentation, instrument_dac, instrument_visa
+from multichannel_control.lightSource import TSL510
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+from multichannel_control.visaSessions import SessionRegistry
+from TestDiscovery import SimulatedResourceManager
+from TestKEYSIGHT81634B import simulated_meter
+from TestTSL510 import simulated_laser
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_dac(self):
+        instrumentation = Instrumentation()
+        dac = DAC8568(baud_rate=100000, transport=SimulatedSPITransport(transaction_latency=0.))
+        instrument_dac(dac, instrumentation)
+        dac.write_and_update("A", 0.5)
+        dac.write_and_update("B", 0.5)
+        dac.stream_waveform("A", np.zeros(10), chunk_size=4)
+
+        stats = instrumentation.stats()
+        self.assertEqual(2, stats[("DAC8568", "WRITE_AND_UPDATE")]["count"])
+        self.assertEqual(8, stats[("DAC8568", "WRITE_AND_UPDATE")]["bytes"])
+        self.assertEqual(3, stats[("DAC8568", "frames:WRITE_AND_UPDATE")]["count"])
+        self.assertEqual(3, sum(count for _, count in stats[("DAC8568", "frames:WRITE_AND_UPDATE")]["histogram"]))
+
+    def test_visa_and_callbacks(self):
+        instrumentation = Instrumentation()
+        calls = []
+        instrumentation.add_callback(lambda *call: calls.append(call))
+        laser = simulated_laser()
+        instrument_visa(laser, instrumentation)
+        laser.set_power(1.)
+        laser.get_power_true()
+
+        self.assertEqual([("TSL510", ":POW"), ("TSL510", ":POW:ACT?")], [call[:2] for call in calls])
+        self.assertEqual({("TSL510", ":POW"), ("TSL510", ":POW:ACT?")}, set(instrumentation.stats()))
+
+    def test_queries_keyed_by_header(self):
+        instrumentation = Instrumentation()
+        meter = simulated_meter({":SENS:POW:WAV? MAX": "1.7E-06", ":SENS:POW:WAV? MIN": "1.2E-06"})
+        instrument_visa(meter, instrumentation)
+        meter._inst.query(":SENS:POW:WAV? MAX")
+        meter._inst.query(":SENS:POW:WAV? MIN")
+        self.assertEqual(2, instrumentation.stats()[("KEYSIGHT81634B", ":SENS:POW:WAV?")]["count"])
+
+    def test_wrapping_does_not_connect(self):
+        instrumentation = Instrumentation()
+        dac = DAC8568(baud_rate=100000, transport=SimulatedSPITransport(transaction_latency=0.))
+        instrument_dac(dac, instrumentation)
+        self.assertIsNone(dac._connected_transport)
+        dac.write_and_update("A", 0.5)
+        self.assertIn(("DAC8568", "WRITE_AND_UPDATE"), instrumentation.stats())
+
+        rm = SimulatedResourceManager({"GPIB0::3::INSTR": "SANTEC,TSL-510,14040011,0002.0085"})
+        registry = SessionRegistry(resource_manager_factory=lambda: rm, cache_file=None)
+        laser = TSL510(registry=registry)
+        instrument_visa(laser, instrumentation)
+        self.assertEqual(0, rm.scans)
+        laser.set_power(1.)
+        self.assertIn(("TSL510", ":POW"), instrumentation.stats())
+        other = TSL510(registry=registry, resource=rm.opened[0])
+        self.assertIs(laser._session, other._session)  # Keyed by the session, not by the wrapper
+
+    def test_disabled(self):
+        instrumentation = Instrumentation()
+        instrumentation.enabled = False
+        laser = simulated_laser()
+        instrument_visa(laser, instrumentation)
+        laser.get_power_true()
+        self.assertEqual({}, instrumentation.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
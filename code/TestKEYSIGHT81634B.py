@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from multichannel_control.opticalPowerMeter import KEYSIGHT81634B
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+
+
+def simulated_meter(responses: dict, cache_ttl: float = 0.) -> KEYSIGHT81634B:
+    """A KEYSIGHT81634B connected to a SimulatedInstrument instead of a VISA resource"""
+    return KEYSIGHT81634B(cache_ttl=cache_ttl, resource=SimulatedInstrument(responses))
+
+
+class TestKEYSIGHT81634B(unittest.TestCase):
+
+    def test_log_power(self):
+        readings = np.linspace(1e-6, 2e-6, 1000)
+        states = iter(["LOGGING_STABILITY,PROGRESS", "LOGGING_STABILITY,COMPLETE"])
+        meter = simulated_meter({":SENS:FUNC:STAT?": lambda: next(states), ":SENS:FUNC:RES?": readings})
+
+        result = meter.log_power(samples=1000, averaging_time=0.0001)
+        np.testing.assert_allclose(readings, result, rtol=1e-6)
+        self.assertEqual(np.float32, result.dtype)
+        self.assertEqual([":SENS:FUNC:PAR:LOGG 1000,0.0001", ":TRIG:INP IGN", ":SENS:FUNC:STAT LOGG,STAR"],
+                         meter._inst.writes)
+
+    def test_log_power_after_external_trigger(self):
+        meter = simulated_meter({":SENS:FUNC:STAT?": "LOGGING_STABILITY,COMPLETE", ":SENS:FUNC:RES?": [1e-6]},
+                                cache_ttl=60.)
+        meter.set_trigger_input(True)
+        meter.log_power(samples=1, averaging_time=0.0001)
+        self.assertEqual([":TRIG:INP SME", ":SENS:FUNC:PAR:LOGG 1,0.0001", ":TRIG:INP IGN",
+                          ":SENS:FUNC:STAT LOGG,STAR"], meter._inst.writes)
+
+    def test_log_power_timeout(self):
+        meter = simulated_meter({":SENS:FUNC:STAT?": "LOGGING_STABILITY,PROGRESS"})
+        with self.assertRaises(TimeoutError):
+            meter.log_power(samples=10, averaging_time=0.001, timeout=0.05)
+        self.assertEqual(":SENS:FUNC:STAT LOGG,STOP", meter._inst.writes[-1])
+
+    def test_errors_invalidate_cache(self):
+        meter = simulated_meter({":SYST:ERR?": '-113,"Undefined header"'}, cache_ttl=60.)
+        meter.set_wavelength(1.55)
+        meter.set_wavelength(1.55)
+        meter.get_errors()
+        meter.set_wavelength(1.55)
+        self.assertEqual(2, len(meter._inst.writes))
+
+        # The cache belongs to the session, so errors read through another object clear it as well
+        other = KEYSIGHT81634B(resource=meter._inst)
+        other.set_wavelength(1.55)
+        self.assertEqual(2, len(meter._inst.writes))
+        other.get_errors()
+        meter.set_wavelength(1.55)
+        self.assertEqual(3, len(meter._inst.writes))
+
+
+if __name__ == '__main__':
+    unittest.main()
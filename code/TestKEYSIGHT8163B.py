@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from multichannel_control.opticalPowerMeter import KEYSIGHT81634B
+from multichannel_control.powerMeterMainframe import KEYSIGHT8163B
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+from multichannel_control.tools import PowerUnit
+
+RESPONSES = {'*OPT?': '81634B,81635A,81689A,                 \n',
+             ':READ1:CHAN1:POW?': '-1.0E+01\n', ':READ2:CHAN1:POW?': '-2.0E+01\n', ':READ2:CHAN2:POW?': '-3.0E+01\n'}
+
+
+class TestKEYSIGHT8163B(unittest.TestCase):
+
+    def setUp(self):
+        self.inst = SimulatedInstrument(RESPONSES)
+        self.mainframe = KEYSIGHT8163B(cache_ttl=float("inf"), resource=self.inst)
+
+    def test_channels(self):
+        self.assertEqual({1: "81634B", 2: "81635A", 3: "81689A"}, self.mainframe.modules())
+        self.assertEqual([(1, 1), (2, 1), (2, 2)], self.mainframe.channels)
+
+    def test_read_powers(self):
+        np.testing.assert_array_equal([-10., -20., -30.], self.mainframe.read_powers())
+        np.testing.assert_array_equal([-10., -20., -30.], self.mainframe.read_powers())
+        self.assertEqual(['*OPT?'] + 2 * [':READ1:CHAN1:POW?;:READ2:CHAN1:POW?;:READ2:CHAN2:POW?'], self.inst.queries)
+
+    def test_configure(self):
+        self.mainframe.set_power_unit(PowerUnit.W)
+        self.mainframe.set_power_unit(PowerUnit.W)
+        self.mainframe.set_averaging_time(0.1)
+        self.assertEqual([':SENS1:CHAN1:POW:UNIT 1;:SENS2:CHAN1:POW:UNIT 1;:SENS2:CHAN2:POW:UNIT 1',
+                          ':SENS1:CHAN1:POW:ATIM 0.1;:SENS2:CHAN1:POW:ATIM 0.1'], self.inst.writes)
+
+    def test_cache_shared_with_module(self):
+        meter = KEYSIGHT81634B(resource=self.inst)
+        meter.set_power_unit(PowerUnit.W)
+        self.mainframe.set_power_unit(PowerUnit.W)  # Only the channels the meter didn't set
+        self.mainframe.set_power_unit(PowerUnit.dBm)
+        meter.set_power_unit(PowerUnit.W)  # The mainframe changed it, so it is written again
+        self.assertEqual(['SENS:POW:UNIT 1', ':SENS2:CHAN1:POW:UNIT 1;:SENS2:CHAN2:POW:UNIT 1',
+                          ':SENS1:CHAN1:POW:UNIT 0;:SENS2:CHAN1:POW:UNIT 0;:SENS2:CHAN2:POW:UNIT 0', 'SENS:POW:UNIT 1'],
+                         self.inst.writes)
+
+    def test_wavelength_shared_with_module(self):
+        KEYSIGHT81634B(resource=self.inst).set_wavelength(1.55)
+        self.mainframe.set_wavelength(1550.)
+        self.assertEqual(['SENS:POW:WAV 1.55UM', ':SENS2:CHAN1:POW:WAV 1550.0NM;:SENS2:CHAN2:POW:WAV 1550.0NM'],
+                         self.inst.writes)
+
+    def test_explicit_channels(self):
+        mainframe = KEYSIGHT8163B(resource=self.inst, channels=[(2, 2)])
+        np.testing.assert_array_equal([-30.], mainframe.read_powers())
+        self.assertEqual([':READ2:CHAN2:POW?'], self.inst.queries)
+
+
+if __name__ == '__main__':
+    unittest.main()
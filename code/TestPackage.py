@@ -0,0 +1,26 @@
+import subprocess
+import sys
+import unittest
+
+import multichannel_control
+
+
+class TestPackage(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        code = ("import sys, multichannel_control; "
+                "print(any(name in sys.modules for name in ('numpy', 'multichannel_control.powerSource', 'pyvisa', 'board')))")
+        output = subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, check=True).stdout
+        self.assertEqual(b"False", output.strip())
+
+    def test_exports(self):
+        from multichannel_control.powerSource import DAC8568
+        self.assertIs(DAC8568, multichannel_control.DAC8568)
+        for name in multichannel_control.__all__:
+            getattr(multichannel_control, name)
+        with self.assertRaises(AttributeError):
+            multichannel_control.DAC
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from multichannel_control.recorder import MeasurementRecorder
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "capture")
+
+    def test_record_across_segments(self):
+        with MeasurementRecorder(self.directory, fields=("power",), segment_size=25, buffer_size=10) as recorder:
+            for i in range(62):
+                recorder.record(float(i), timestamp=1000. + i)
+
+        data = MeasurementRecorder.load(self.directory)
+        self.assertEqual(3, len(os.listdir(self.directory)))
+        np.testing.assert_array_equal(np.arange(62.), data["power"])
+        np.testing.assert_array_equal(1000. + np.arange(62.), data["time"])
+
+    def test_record_many(self):
+        with MeasurementRecorder(self.directory, fields=("power", "wavelength"), buffer_size=7) as recorder:
+            recorder.record(1., 2.)
+            recorder.record_many(np.arange(20.), np.column_stack((np.arange(20.), np.arange(20.) * 2)))
+            recorder.flush()
+            self.assertEqual(21, recorder.records)
+
+        data = MeasurementRecorder.load(self.directory)
+        self.assertEqual(21, len(data))
+        np.testing.assert_array_equal(np.arange(20.) * 2, data["wavelength"][1:])
+
+    def test_failed_write(self):
+        class FailingRecorder(MeasurementRecorder):
+            def _write(self, records):
+                if self._segment is not None:
+                    raise IOError("Disk full")
+                super()._write(records)
+
+        recorder = FailingRecorder(self.directory, segment_size=100, buffer_size=10)
+        recorder.record_many(np.arange(10.), np.arange(10.))
+        recorder.flush()
+        recorder.record_many(np.arange(5.), np.arange(5.))
+        with self.assertRaises(RuntimeError):
+            recorder.close()
+
+        self.assertFalse(recorder._writer.is_alive())
+        self.assertEqual(["segment_000000.npy"], os.listdir(self.directory))
+        self.assertEqual(10, len(MeasurementRecorder.load(self.directory)))
+
+    def test_existing_recording(self):
+        MeasurementRecorder(self.directory).close()
+        with MeasurementRecorder(self.directory) as recorder:
+            recorder.record(1.)
+        with self.assertRaises(FileExistsError):
+            MeasurementRecorder(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
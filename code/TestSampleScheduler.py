@@ -0,0 +1,31 @@
+import time
+import unittest
+
+from multichannel_control.sampleScheduler import SampleScheduler
+
+
+class TestSampleScheduler(unittest.TestCase):
+
+    def test_batches_when_behind(self):
+        scheduler = SampleScheduler(sample_rate=10000)
+        self.assertEqual(1, scheduler.wait(100))
+        time.sleep(0.005)
+        batch = scheduler.wait(1000)
+        self.assertGreaterEqual(batch, 50)
+        stats = scheduler.stats()
+        self.assertEqual(1 + batch, stats.samples)
+        self.assertGreater(stats.late_samples, 0)
+
+    def test_stats(self):
+        scheduler = SampleScheduler(sample_rate=2000)
+        sent = 0
+        while sent < 100:
+            sent += scheduler.wait(100 - sent)
+        stats = scheduler.stats()
+        self.assertEqual(100, stats.samples)
+        self.assertAlmostEqual(2000, stats.achieved_rate, delta=200)
+        self.assertEqual(stats.batches, sum(count for _, count in stats.jitter_histogram))
+
+
+if __name__ == '__main__':
+    unittest.main()
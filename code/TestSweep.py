@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from multichannel_control.sweep import swept_spectrum
+from TestKEYSIGHT81634B import simulated_meter
+from TestTSL510 import simulated_laser
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_swept_spectrum(self):
+        laser = simulated_laser()
+        readings = np.arange(11, dtype=np.float32)
+        meter = simulated_meter({":SENS:FUNC:STAT?": "LOGGING_STABILITY,COMPLETE", ":SENS:FUNC:RES?": readings})
+
+        spectrum = swept_spectrum(laser, meter, start=1550., stop=1551., step=0.1, speed=100.)
+        np.testing.assert_allclose(np.linspace(1550., 1551., 11), spectrum.wavelength)
+        np.testing.assert_array_equal(readings, spectrum.power)
+
+        self.assertIn(':WAV:SWE 1', laser._inst.writes)
+        self.assertNotIn(':WAV:SWE 0', laser._inst.writes)  # The sweep had finished
+        self.assertEqual([":TRIG:INP SME", ":SENS:FUNC:PAR:LOGG 11,0.0005", ":SENS:FUNC:STAT LOGG,STAR",
+                          ":TRIG:INP IGN"], meter._inst.writes)
+
+    def test_timeout_stops_sweep(self):
+        laser = simulated_laser()
+        laser._inst.responses[':WAV:SWE?'] = '1\n'
+        meter = simulated_meter({":SENS:FUNC:STAT?": "LOGGING_STABILITY,PROGRESS"})
+
+        with self.assertRaises(TimeoutError):
+            swept_spectrum(laser, meter, start=1550., stop=1551., step=0.1, speed=100., timeout=0.05)
+        self.assertEqual(':WAV:SWE 0', laser._inst.writes[-1])
+        self.assertEqual(":TRIG:INP IGN", meter._inst.writes[-1])
+
+    def test_averaging_time_too_long(self):
+        with self.assertRaises(AssertionError):
+            swept_spectrum(simulated_laser(), simulated_meter({}), start=1550., stop=1551., step=0.1, speed=100.,
+                           averaging_time=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
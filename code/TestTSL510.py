@@ -0,0 +1,86 @@
+import unittest
+
+from multichannel_control.lightSource import TSL510
+from multichannel_control.simulatedInstrument import SimulatedInstrument
+
+RESPONSES = {':POW:STAT?': '1\n', ':POW:ATT:AUT?': '0\n', ':POW:SHUT?': '0\n', ':POW:UNIT?': '1\n',
+             ':WAV:UNIT?': '0\n', ':POW:LEV:MIN?': '0.02\n', ':POW:LEV:MAX?': '10.0\n',
+             ':WAV:MIN?': '1500.000\n', ':WAV:MAX?': '1630.000\n', ':POW:ACT?': '1.25\n',
+             ':WAV:SWE?': '0\n'}
+
+
+def simulated_laser(cache_ttl: float = 0., **kwargs) -> TSL510:
+    """A TSL510 connected to a SimulatedInstrument instead of a VISA resource"""
+    return TSL510(cache_ttl=cache_ttl, resource=SimulatedInstrument(RESPONSES, **kwargs))
+
+
+class TestTSL510(unittest.TestCase):
+
+    def test_snapshot_is_one_query(self):
+        laser = simulated_laser()
+        status = laser.snapshot()
+        self.assertEqual(1, len(laser._inst.queries))
+        self.assertTrue(status.ld_on)
+        self.assertFalse(status.shutter_closed)
+        self.assertTrue(status.power_unit_mw)
+        self.assertEqual((0.02, 10.), status.power_range)
+        self.assertEqual((1500., 1630.), status.color_range)
+
+    def test_falls_back_without_compound_queries(self):
+        laser = simulated_laser(compound_queries=False)
+        self.assertEqual((1500., 1630.), laser.get_range_color())
+        self.assertEqual((0.02, 10.), laser.get_range_power())
+        self.assertEqual([':WAV:MIN?;:WAV:MAX?', ':WAV:MIN?', ':WAV:MAX?', ':POW:LEV:MIN?', ':POW:LEV:MAX?'],
+                         laser._inst.queries)
+
+    def test_falls_back_when_compound_query_times_out(self):
+        laser = simulated_laser(compound_timeout=True)
+        self.assertEqual((1500., 1630.), laser.get_range_color())
+        self.assertEqual(1, laser._inst.clears)
+        self.assertEqual(['*CLS'], laser._inst.writes)
+
+        other = TSL510(resource=laser._inst)  # Shares the session, so it doesn't try again
+        self.assertEqual((0.02, 10.), other.get_range_power())
+        self.assertEqual([':WAV:MIN?;:WAV:MAX?', ':WAV:MIN?', ':WAV:MAX?', ':POW:LEV:MIN?', ':POW:LEV:MAX?'],
+                         laser._inst.queries)
+
+    def test_status(self):
+        self.assertIn("Laser Diode Status (0:OFF, 1:ON):            1\n", simulated_laser().status())
+
+    def test_cached_reads(self):
+        laser = simulated_laser(cache_ttl=60.)
+        laser.get_range_power()
+        laser.get_range_power()
+        laser.get_power_true()
+        laser.get_power_true()
+        self.assertEqual([':POW:LEV:MIN?;:POW:LEV:MAX?', ':POW:ACT?', ':POW:ACT?'], laser._inst.queries)
+
+    def test_snapshot_fills_cache(self):
+        laser = simulated_laser(cache_ttl=60.)
+        laser.snapshot()
+        self.assertTrue(laser.get_power_unit())
+        self.assertEqual((1500., 1630.), laser.get_range_color())
+        self.assertEqual(1, len(laser._inst.queries))
+
+    def test_unchanged_writes_are_skipped(self):
+        laser = simulated_laser(cache_ttl=60.)
+        laser.set_power(1.)
+        laser.set_power(1.)
+        laser.set_power(2.)
+        laser.set_wavelength_unit(True)
+        self.assertEqual([':POW 1.0', ':POW 2.0', ':WAV:UNIT 1'], laser._inst.writes)
+
+    def test_unit_change_invalidates(self):
+        laser = simulated_laser(cache_ttl=60.)
+        laser.set_power_unit(False)
+        laser.get_range_power()
+        laser.set_power(1.)
+        laser.set_power_unit(True)
+        laser.set_power(1.)
+        laser.get_range_power()
+        self.assertEqual([':POW:UNIT 0', ':POW 1.0', ':POW:UNIT 1', ':POW 1.0'], laser._inst.writes)
+        self.assertEqual(2, len(laser._inst.queries))
+
+
+if __name__ == '__main__':
+    unittest.main()
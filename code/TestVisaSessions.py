@@ -0,0 +1,69 @@
+import unittest
+
+from multichannel_control.lightSource import TSL510
+from multichannel_control.opticalPowerMeter import KEYSIGHT81634B
+from multichannel_control.visaSessions import SessionRegistry
+from TestDiscovery import SimulatedResourceManager
+
+
+class TestVisaSessions(unittest.TestCase):
+
+    def setUp(self):
+        self.rm = SimulatedResourceManager({"GPIB0::1::INSTR": "Agilent Technologies,8163B,MY48208514,V5.25(72637)",
+                                            "GPIB0::3::INSTR": "SANTEC,TSL-510,14040011,0002.0085"})
+        self.registry = SessionRegistry(resource_manager_factory=lambda: self.rm, cache_file=None)
+
+    def test_shared_session(self):
+        first = TSL510(registry=self.registry)
+        second = TSL510(registry=self.registry)
+        self.assertEqual(0, self.rm.scans)
+        first.connect()
+        second.connect()
+        self.assertIs(first._inst, second._inst)
+        self.assertEqual(2, self.registry.reference_count('TSL-510'))
+        self.assertEqual(1, self.rm.scans)
+
+        inst = first._inst
+        first.close()
+        self.assertFalse(inst.closed)
+        second.close()
+        self.assertTrue(inst.closed)
+        self.assertEqual(0, self.registry.reference_count('TSL-510'))
+
+    def test_close_passed_resource(self):
+        laser = TSL510(registry=self.registry)
+        laser.connect()
+        other = TSL510(registry=self.registry, resource=laser._inst)
+        other.close()
+        self.assertEqual(1, self.registry.reference_count('TSL-510'))
+        self.assertFalse(laser._inst.closed)
+
+    def test_use_after_close(self):
+        laser = TSL510(registry=self.registry)
+        laser.set_power(1.)
+        laser.close()
+        with self.assertRaises(RuntimeError):
+            laser.set_power(2.)
+        self.assertEqual(0, self.registry.reference_count('TSL-510'))
+        self.assertEqual(1, self.rm.scans)
+
+    def test_shared_state(self):
+        first = TSL510(registry=self.registry)
+        second = TSL510(registry=self.registry)
+        first.set_power(1.)
+        second.set_power(1.)
+        self.assertIs(first._cache, second._cache)
+        self.assertEqual([':POW 1.0'], first._inst.writes)
+
+    def test_close_all(self):
+        laser = TSL510(registry=self.registry)
+        meter = KEYSIGHT81634B(registry=self.registry)
+        laser.connect()
+        meter.connect()
+        self.registry.close_all()
+        self.assertTrue(laser._resource.closed)
+        self.assertTrue(meter._resource.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.waveformCache import WaveformCache
+
+
+class TestWaveformCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = WaveformCache()
+        samples = np.linspace(0., 1., 1000)
+        first = cache.get_or_encode("WRITE_AND_UPDATE", "A", samples, DAC8568.encode_words)
+        second = cache.get_or_encode("WRITE_AND_UPDATE", "A", samples.copy(), DAC8568.encode_words)
+        self.assertIs(first, second)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        cache.get_or_encode("WRITE_AND_UPDATE", "B", samples, DAC8568.encode_words)
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(2, len(cache))
+
+    def test_codes_are_part_of_the_key(self):
+        cache = WaveformCache()
+        samples = np.array([0, 1], dtype=np.uint16)
+        values = cache.get_or_encode("WRITE", "A", samples, DAC8568.encode_words)
+        codes = cache.get_or_encode("WRITE", "A", samples, DAC8568.encode_words, codes=True)
+        self.assertEqual([0x00000000, 0x000FFFF0], values.tolist())
+        self.assertEqual([0x00000000, 0x00000010], codes.tolist())
+
+    def test_lru_eviction(self):
+        cache = WaveformCache(max_bytes=2 * 4 * 100)
+        ramps = [np.full(100, i / 10.) for i in range(3)]
+        cache.get_or_encode("WRITE", "A", ramps[0], DAC8568.encode_words)
+        cache.get_or_encode("WRITE", "A", ramps[1], DAC8568.encode_words)
+        cache.get_or_encode("WRITE", "A", ramps[0], DAC8568.encode_words)
+        cache.get_or_encode("WRITE", "A", ramps[2], DAC8568.encode_words)
+
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(800, cache.size_bytes)
+        cache.get_or_encode("WRITE", "A", ramps[0], DAC8568.encode_words)
+        self.assertEqual(2, cache.hits)
+        cache.get_or_encode("WRITE", "A", ramps[1], DAC8568.encode_words)
+        self.assertEqual(4, cache.misses)
+
+    def test_oversized_waveform_is_not_cached(self):
+        cache = WaveformCache(max_bytes=10)
+        buffer = cache.get_or_encode("WRITE", "A", np.zeros(10), DAC8568.encode_words)
+        self.assertEqual(40, buffer.nbytes)
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+from multichannel_control.waveformFile import WaveformFile, WaveformWriter, save_waveform
+from multichannel_control.waveformPlayer import WaveformPlayer
+
+
+class TestWaveformFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "waveform.dacw")
+        self.frames = np.random.randint(1, 2 ** 16, size=(100, 2), dtype=np.uint16)
+        self.transport = SimulatedSPITransport(transaction_latency=0.)
+        self.dac = DAC8568(baud_rate=100000, transport=self.transport)
+        self.dac.connect()
+        self.transport.reset()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for encoded in (False, True):
+            with WaveformWriter(self.path, channels=("C", "F"), sample_rate=1000., encoded=encoded,
+                                loop_start=10) as writer:
+                writer.write(self.frames[:40], codes=True)
+                writer.write(self.frames[40:], codes=True)
+            waveform = WaveformFile(self.path)
+            self.assertEqual(("C", "F"), waveform.channels)
+            self.assertEqual((1000., 100, 10, 100), (waveform.sample_rate, len(waveform), waveform.loop_start,
+                                                     waveform.loop_end))
+            np.testing.assert_array_equal(self.frames, waveform.frames)
+            np.testing.assert_array_equal(DAC8568.encode_frames(["C", "F"], self.frames[5:7], codes=True),
+                                          waveform.words(5, 7))
+        self.assertIsInstance(waveform.words(), np.memmap)
+
+    def test_stream_file(self):
+        samples = np.linspace(0., 1., 50)
+        save_waveform(self.path, samples, channels=("B",), encoded=True)
+        self.dac.stream_file(WaveformFile(self.path), chunk_size=16)
+        np.testing.assert_array_equal(DAC8568.encode_words("WRITE_AND_UPDATE", "B", samples), self.transport.words)
+
+    def test_play_file_loop(self):
+        save_waveform(self.path, self.frames, channels=("A", "B"), codes=True, loop_start=60, loop_end=80)
+        player = WaveformPlayer(self.dac, chunk_size=8)
+        player.play_file(WaveformFile(self.path), loop=True)
+        while player.samples_played < 200:
+            pass
+        player.stop()
+        played = self.transport.output_history(2 ** 16, 1.)[:, :2]
+        np.testing.assert_array_equal(self.frames[:80], played[:80])
+        np.testing.assert_array_equal(self.frames[60:80], played[80:100])
+
+    @unittest.skipUnless(os.path.exists("/proc/self/maps"), "Needs the memory maps of the process")
+    def test_close(self):
+        save_waveform(self.path, self.frames, channels=("A", "B"), codes=True, encoded=True)
+
+        def mapped():
+            with open("/proc/self/maps") as maps:
+                return self.path in maps.read()
+
+        with WaveformFile(self.path) as waveform:
+            self.dac.stream_file(waveform, chunk_size=16)
+            self.assertTrue(mapped())
+        self.assertFalse(mapped())
+        with self.assertRaises(ValueError):
+            waveform.words()
+
+    def test_not_a_waveform(self):
+        with open(self.path, "wb") as file:
+            file.write(b"\0" * 100)
+        with self.assertRaises(ValueError):
+            WaveformFile(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import unittest
+
+import numpy as np
+
+from multichannel_control.powerSource import DAC8568
+from multichannel_control.transport import SimulatedSPITransport
+from multichannel_control.waveformPlayer import WaveformPlayer
+
+
+class TestWaveformPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = SimulatedSPITransport()
+        self.dac = DAC8568(baud_rate=100000, transport=self.transport)
+        self.dac.connect()
+        self.transport.reset()
+
+    def test_play(self):
+        samples = np.arange(1000, dtype=np.uint16)
+        player = WaveformPlayer(self.dac, chunk_size=64)
+        player.play("A", samples, codes=True)
+        self.assertTrue(player.wait(5.))
+        self.assertEqual(1000, player.samples_played)
+        np.testing.assert_array_equal(samples[1:], self.transport.output_history(2 ** 16, 1.)[:, 0])
+
+    def test_loop_pause_and_stop(self):
+        player = WaveformPlayer(self.dac, sample_rate=20000, chunk_size=16)
+        player.play("A", np.linspace(0., 1., 100), loop=True)
+        time.sleep(0.05)
+        player.pause()
+        time.sleep(0.01)
+        played = player.samples_played
+        time.sleep(0.02)
+        self.assertEqual(played, player.samples_played)
+        player.resume()
+        time.sleep(0.02)
+        player.stop()
+        self.assertFalse(player.is_playing)
+        self.assertGreater(player.samples_played, 100)
+
+    def test_loop_empty_waveform(self):
+        player = WaveformPlayer(self.dac)
+        player.play("A", np.array([]), loop=True)
+        self.assertTrue(player.wait(5.))
+        player.play_frames(np.zeros((0, 8)), loop=True)
+        self.assertTrue(player.wait(5.))
+        player.stop()
+        self.assertEqual(0, player.samples_played)
+
+    def test_play_chunks(self):
+        player = WaveformPlayer(self.dac)
+        player.play_chunks("C", (np.full(10, i / 10.) for i in range(5)))
+        self.assertTrue(player.wait(5.))
+        self.assertEqual(50, player.samples_played)
+
+        player.play_chunks("C", (np.full(10, 0.5) for _ in range(2)))
+        self.assertTrue(player.wait(5.))
+        self.assertEqual(20, player.samples_played)
+
+    def test_feeder_error(self):
+        def chunks():
+            yield np.zeros(10)
+            raise ValueError("Generator failed")
+
+        player = WaveformPlayer(self.dac)
+        player.play_chunks("A", chunks())
+        with self.assertRaises(ValueError):
+            player.wait(5.)
+        self.assertFalse(player.is_playing)
+        self.assertEqual(10, player.samples_played)
+        player.stop()  # The error is only raised once
+
+    def test_worker_error(self):
+        class FailingTransport(SimulatedSPITransport):
+            def write_frames(self, buffer, frame_size):
+                raise IOError("Board unplugged")
+
+        self.dac._transport = FailingTransport()
+        player = WaveformPlayer(self.dac, chunk_size=8)
+        player.play("A", np.zeros(100), loop=True)
+        with self.assertRaises(IOError):
+            player.wait(5.)
+        self.assertFalse(player.is_playing)
+
+
+if __name__ == '__main__':
+    unittest.main()
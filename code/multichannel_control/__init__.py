@@ -0,0 +1,70 @@
+"""
+Package interface of the instrument modules. Nothing is imported until a name is used, so importing the package is
+fast and works on machines without visa, board or busio installed. Constructing an instrument doesn't talk to the
+hardware either; that happens in its connect method, which is called on first use.
+
+Example::
+
+    from multichannel_control import DAC8568, TSL510
+
+    dac = DAC8568(baud_rate=100000)
+    laser = TSL510()
+    laser.connect()
+"""
+import importlib
+
+# Name -> module of the package that defines it
+_EXPORTS = {
+    "AsyncInstrument": "asyncInstruments",
+    "BusioSPITransport": "transport",
+    "ChannelCalibration": "calibration",
+    "DAC8568": "powerSource",
+    "DACArray": "dacArray",
+    "DACCalibration": "calibration",
+    "DeviceWorker": "deviceWorker",
+    "FtdiSPITransport": "transport",
+    "Instrumentation": "instrumentation",
+    "KEYSIGHT8163B": "powerMeterMainframe",
+    "KEYSIGHT81634B": "opticalPowerMeter",
+    "MeasurementRecorder": "recorder",
+    "PowerUnit": "tools",
+    "SampleScheduler": "sampleScheduler",
+    "SessionRegistry": "visaSessions",
+    "SharedRingBuffer": "deviceWorker",
+    "SimulatedInstrument": "simulatedInstrument",
+    "SimulatedSPIBus": "transport",
+    "SimulatedSPITransport": "transport",
+    "SPIBus": "transport",
+    "SPITransport": "transport",
+    "Spectrum": "sweep",
+    "StateCache": "stateCache",
+    "TSL510": "lightSource",
+    "TSL510Status": "lightSource",
+    "VisaInstrument": "visaInstrument",
+    "WaveformCache": "waveformCache",
+    "WaveformFile": "waveformFile",
+    "WaveformPlayer": "waveformPlayer",
+    "WaveformWriter": "waveformFile",
+    "calibrate": "calibration",
+    "calibrate_channel": "calibration",
+    "find_instrument": "discovery",
+    "get_registry": "visaSessions",
+    "instrument_dac": "instrumentation",
+    "instrument_visa": "instrumentation",
+    "save_waveform": "waveformFile",
+    "swept_spectrum": "sweep",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    globals()[name] = value  # Later lookups don't go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from .visaInstrument import VisaInstrument
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_locks = weakref.WeakKeyDictionary()  # instrument -> lock, for instruments without a VISA session
+_locks_lock = threading.Lock()
+
+
+def get_executor(max_workers: int = 8) -> ThreadPoolExecutor:
+    """
+    :param max_workers: Size of the pool. Only used when the pool is created by the first call.
+    :return: The bounded thread pool that blocking instrument calls run on
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="instrument")
+        return _executor
+
+
+def _instrument_lock(instrument) -> threading.Lock:
+    """
+    :return: The lock of the VISA session for a visaInstrument.VisaInstrument, so every object that shares the session
+        shares the lock, otherwise a lock of the instrument object
+    """
+    if isinstance(instrument, VisaInstrument):
+        return instrument._session.lock
+    with _locks_lock:
+        lock = _locks.get(instrument)
+        if lock is None:
+            lock = threading.Lock()
+            _locks[instrument] = lock
+        return lock
+
+
+def _locked_call(instrument, function, *args, **kwargs):
+    """Runs function(*args, **kwargs) on the thread pool while holding the lock of instrument"""
+    with _instrument_lock(instrument):
+        return function(*args, **kwargs)
+
+
+def _open(instrument_class, *args, **kwargs):
+    """Constructs an instrument and connects to it"""
+    instrument = instrument_class(*args, **kwargs)
+    instrument.connect()
+    return instrument
+
+
+class AsyncInstrument:
+    """
+    asyncio counterpart of a blocking instrument (TSL510, KEYSIGHT81634B, DAC8568, ...). Every method of the wrapped
+    instrument is available as a coroutine that runs the blocking call on a bounded thread pool. The calls take a
+    threading lock on the pool thread: the lock of the VISA session for VISA instruments, so commands of different
+    wrappers and objects that share a session never interleave, and a lock of the instrument object otherwise. Calls on
+    different instruments run concurrently.
+
+    Example::
+
+        laser = await AsyncInstrument.open(TSL510)
+        meter = await AsyncInstrument.open(KEYSIGHT81634B)
+        dac = AsyncInstrument(DAC8568(baud_rate=100000))
+        await asyncio.gather(laser.set_color(1550.), dac.stream_waveform("A", samples))
+        power = await meter.get_power()
+    """
+
+    def __init__(self, instrument, executor: ThreadPoolExecutor = None):
+        """
+        :param instrument: The blocking instrument object to wrap
+        :param executor: Thread pool to run the calls on. Defaults to the shared pool from get_executor.
+        """
+        self._instrument = instrument
+        self._executor = get_executor() if executor is None else executor
+
+    @classmethod
+    async def open(cls, instrument_class, *args, executor: ThreadPoolExecutor = None, **kwargs) -> "AsyncInstrument":
+        """
+        Constructs a blocking instrument and calls its connect method on the thread pool, so connecting to it doesn't
+        block the event loop.
+
+        :param instrument_class: Class of the instrument, ex. TSL510
+        :param args: Passed on to the constructor
+        :param executor: Thread pool to run the calls on. Defaults to the shared pool from get_executor.
+        :param kwargs: Passed on to the constructor
+        :return: The wrapped instrument
+        """
+        executor = get_executor() if executor is None else executor
+        loop = asyncio.get_running_loop()
+        instrument = await loop.run_in_executor(executor, functools.partial(_open, instrument_class, *args, **kwargs))
+        return cls(instrument, executor)
+
+    @property
+    def instrument(self):
+        """The wrapped blocking instrument. Don't call it while coroutines of this wrapper are running."""
+        return self._instrument
+
+    async def call(self, function, *args, **kwargs):
+        """
+        Runs function(*args, **kwargs) on the thread pool while holding this instrument's lock. Use this to group
+        several blocking calls that must not be interleaved with other commands.
+
+        :return: The return value of function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(_locked_call, self._instrument, function,
+                                                                            *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._instrument, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self.call(attribute, *args, **kwargs)
+
+        return method
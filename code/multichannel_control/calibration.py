@@ -0,0 +1,187 @@
+import time
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+
+def _isotonic_fit(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Least-squares non-decreasing fit of y with the pool adjacent violators algorithm. Neighbouring points are pooled
+    while their means decrease or are equal, so plateaus become a single block.
+
+    :param y: 1D array
+    :return: (mean of each block, strictly increasing; number of points in each block)
+    """
+    means, sizes = [], []
+    for point in y.tolist():
+        means.append(point)
+        sizes.append(1)
+        while len(means) > 1 and means[-2] >= means[-1]:
+            size = sizes[-2] + sizes[-1]
+            means[-2] = (means[-2] * sizes[-2] + means[-1] * sizes[-1]) / size
+            sizes[-2] = size
+            del means[-1], sizes[-1]
+    return np.array(means), np.array(sizes)
+
+
+class ChannelCalibration:
+    """
+    Lookup table between the value written to one DAC channel (0 to 1) and the optical power it produces.
+
+    Measured tables are rarely strictly monotonic because of noise, so the power is first fitted with the closest
+    monotonic (increasing or decreasing, whichever fits better) sequence in the least-squares sense. Points where the
+    fit is flat are merged into one point at their mean value. Between the points of the fit the power is interpolated
+    linearly, in both directions of the lookup.
+    """
+
+    def __init__(self, values, powers):
+        """
+        :param values: DAC values between 0 and 1 in increasing order
+        :param powers: Power measured at each value
+        :raises: ValueError if the table is malformed or the fitted power doesn't change with the value
+        """
+        self.values = np.asarray(values, dtype=np.float64)
+        self.powers = np.asarray(powers, dtype=np.float64)
+        if self.values.shape != self.powers.shape or self.values.ndim != 1 or len(self.values) < 2:
+            raise ValueError("values and powers must be 1D arrays of the same length, with at least 2 points")
+        if np.any(np.diff(self.values) <= 0):
+            raise ValueError("values must be strictly increasing")
+
+        increasing, increasing_sizes = _isotonic_fit(self.powers)
+        decreasing, decreasing_sizes = _isotonic_fit(-self.powers)
+        increasing_error = np.sum((np.repeat(increasing, increasing_sizes) - self.powers) ** 2)
+        decreasing_error = np.sum((np.repeat(-decreasing, decreasing_sizes) - self.powers) ** 2)
+        if increasing_error <= decreasing_error:
+            block_powers, sizes = increasing, increasing_sizes
+        else:
+            block_powers, sizes = -decreasing, decreasing_sizes
+        if len(block_powers) < 2:
+            raise ValueError("The measured power doesn't change with the DAC value, so it can't be inverted")
+
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        block_values = np.add.reduceat(self.values, starts) / sizes
+        self.fitted_powers = np.repeat(block_powers, sizes)  # The monotonic fit at each of the values
+        # np.interp needs increasing x values
+        order = slice(None) if block_powers[-1] > block_powers[0] else slice(None, None, -1)
+        self._block_values = block_values
+        self._block_powers = block_powers
+        self._inverse_powers = block_powers[order]
+        self._inverse_values = block_values[order]
+
+    @property
+    def power_range(self) -> Tuple[float, float]:
+        """(min, max) power that the channel can reach"""
+        return float(self._inverse_powers[0]), float(self._inverse_powers[-1])
+
+    def to_power(self, values) -> np.ndarray:
+        """
+        :param values: DAC values between 0 and 1
+        :return: The expected power for each value, from the monotonic fit
+        """
+        return np.interp(values, self._block_values, self._block_powers)
+
+    def to_value(self, powers) -> np.ndarray:
+        """
+        Inverse lookup, vectorized over an array of target powers.
+
+        :param powers: Target powers. Powers outside of power_range are clipped to it.
+        :return: The DAC value for each power
+        """
+        return np.interp(powers, self._inverse_powers, self._inverse_values)
+
+
+class DACCalibration:
+    """Calibration tables for several channels of a DAC, ex. DAC8568, keyed by channel character"""
+
+    def __init__(self, channels: Dict[str, ChannelCalibration] = None):
+        self.channels = {} if channels is None else dict(channels)
+
+    def __getitem__(self, channel: str) -> ChannelCalibration:
+        if channel not in self.channels:
+            raise KeyError("Channel {} is not calibrated".format(channel))
+        return self.channels[channel]
+
+    def __setitem__(self, channel: str, calibration: ChannelCalibration) -> None:
+        self.channels[channel] = calibration
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self.channels
+
+    def to_values(self, channels, powers) -> np.ndarray:
+        """
+        Converts target powers to DAC values, one channel per column.
+
+        :param channels: Channel characters of the columns of powers
+        :param powers: An N x len(channels) array (or a single row) of target powers
+        :return: DAC values with the same shape as powers
+        """
+        powers = np.asarray(powers, dtype=np.float64)
+        values = np.empty_like(powers)
+        for column, channel in enumerate(channels):
+            values[..., column] = self[channel].to_value(powers[..., column])
+        return values
+
+    def save(self, path: str) -> None:
+        """
+        Stores the tables in a NumPy .npz file.
+
+        :param path: File name
+        """
+        arrays = {}
+        for channel, calibration in self.channels.items():
+            arrays[channel + "_values"] = calibration.values
+            arrays[channel + "_powers"] = calibration.powers
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "DACCalibration":
+        """
+        Reads tables stored with save.
+
+        :param path: File name
+        :return: The calibration
+        """
+        with np.load(path) as arrays:
+            channels = {name[:-len("_values")] for name in arrays.files if name.endswith("_values")}
+            return cls({channel: ChannelCalibration(arrays[channel + "_values"], arrays[channel + "_powers"])
+                        for channel in channels})
+
+
+def calibrate_channel(dac, meter, channel: str, points: int = 33, value_range: Tuple[float, float] = (0., 1.),
+                      settle_time: float = 0.01, readings: int = 1) -> ChannelCalibration:
+    """
+    Sweeps one DAC channel over value_range while reading the power meter, and builds its lookup table. The channel is
+    left at the last value of the sweep.
+
+    :param dac: DAC8568 that drives the actuator
+    :param meter: KEYSIGHT81634B that sees the light controlled by the actuator
+    :param channel: The character that represents the output to calibrate. Ex. "A" or "H".
+    :param points: Number of points in the table
+    :param value_range: (min, max) DAC values to sweep. Restrict it if the power has a peak or dip inside the range,
+        since the table is fitted with a monotonic function.
+    :param settle_time: Time in seconds between setting a value and reading the meter
+    :param readings: Number of meter readings averaged for each point
+    :return: The lookup table
+    :raises: ValueError if the measured power doesn't change with the value
+    """
+    values = np.linspace(value_range[0], value_range[1], points)
+    powers = np.empty(points)
+    for i, value in enumerate(values.tolist()):
+        dac.write_and_update(channel=channel, value=value)
+        time.sleep(settle_time)
+        powers[i] = np.mean([meter.get_power() for _ in range(readings)])
+    return ChannelCalibration(values, powers)
+
+
+def calibrate(dac, meter, channels: Iterable[str], **kwargs) -> DACCalibration:
+    """
+    Calibrates several channels one after the other with calibrate_channel. Only the channel being calibrated should
+    influence the power that the meter sees.
+
+    :param dac: DAC8568 that drives the actuators
+    :param meter: KEYSIGHT81634B that sees the light controlled by the actuators
+    :param channels: Channel characters to calibrate
+    :param kwargs: Passed on to calibrate_channel
+    :return: The lookup tables of all channels
+    """
+    return DACCalibration({channel: calibrate_channel(dac, meter, channel, **kwargs) for channel in channels})
@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .powerSource import DAC8568
+from .sampleScheduler import SampleScheduler
+
+
+class DACArray:
+    """
+    Several DAC8568 chips used as one DAC with 8 outputs per chip. Outputs are addressed with global channel indices:
+    index i is output DAC8568._OUTPUTS[i % 8] of chip i // 8.
+
+    Every chip needs its own transport. The DAC8568 has no serial data output, so chips can't be daisy-chained. With
+    transport.FtdiSPITransport a chip is selected by the URL of its FT232H board and its chip-select pin, so chips
+    can either have a board each or share the clock and data lines of one board with a chip-select pin each (D3 to D7).
+    BusioSPITransport can only drive one chip.
+
+    For each frame the values of one chip are encoded as one "WRITE" per output and one "UPDATE" of all outputs (see
+    DAC8568.stream_frames). The chips that share a bus (transport.SPIBus) are sent together: every chunk of frames of
+    all of them goes out in one combined transfer, with the words of frame i of every chip before those of frame i + 1,
+    so their outputs stay frame-aligned. Separate buses are written in parallel from a pool with one thread per bus, so
+    adding boards keeps the frame rate of a single board.
+
+    Example with two boards, selected by serial number, and two chips on each::
+
+        dacs = DACArray([DAC8568(baud_rate=1000000,
+                                 transport=FtdiSPITransport(1000000, url="ftdi://ftdi:232h:{}/1".format(serial),
+                                                            cs_pin=cs_pin))
+                         for serial in ("FT1ABCDE", "FT2ABCDE") for cs_pin in (3, 4)])
+        dacs.set_channels(np.linspace(0., 1., dacs.channel_count))
+    """
+
+    def __init__(self, dacs: Sequence[DAC8568]):
+        """
+        :param dacs: The chips, in the order of their channel indices. Nothing is sent to them until they are used.
+        """
+        assert len(dacs) > 0, "At least one DAC is needed"
+        self.dacs = list(dacs)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.dacs), thread_name_prefix="dac")
+
+    @property
+    def channel_count(self) -> int:
+        """Number of outputs of all chips together"""
+        return len(self.dacs) * len(DAC8568._OUTPUTS)
+
+    def locate(self, index: int) -> Tuple[int, str]:
+        """
+        :param index: Global channel index
+        :return: (index of the chip in dacs, channel character on that chip)
+        """
+        assert 0 <= index < self.channel_count, "Channel {} is out of range".format(index)
+        chip, output = divmod(index, len(DAC8568._OUTPUTS))
+        return chip, DAC8568._OUTPUTS[output]
+
+    def connect(self) -> None:
+        """Connects to and resets all chips, in parallel"""
+        self._run([(dac.connect, (), {}) for dac in self.dacs])
+
+    def close(self) -> None:
+        """Releases the buses of all chips and stops the thread pool"""
+        for dac in self.dacs:
+            dac.close()
+        self._executor.shutdown()
+
+    def write_and_update(self, index: int, value: float) -> None:
+        """
+        Writes a value to one output and updates it.
+
+        :param index: Global channel index
+        :param value: Value between 0 (inclusive) and 1 (inclusive)
+        """
+        chip, channel = self.locate(index)
+        self.dacs[chip].write_and_update(channel=channel, value=value)
+
+    def set_channels(self, values, delta: bool = False, codes: bool = False) -> None:
+        """
+        Loads new values for several outputs. The outputs of each chip are updated at the same time, and the chips
+        are written in parallel.
+
+        :param values: Either a dict that maps global channel indices to values, or an array of channel_count values.
+            Values are between 0 (inclusive) and 1(inclusive).
+        :param delta: If true, only the outputs that changed are written (see DAC8568.stream_frames)
+        :param codes: If true, the values are 16 bit integer DAC codes
+        """
+        if isinstance(values, dict):
+            channels = list(values.keys())
+            frame = np.asarray(list(values.values()))
+        else:
+            channels = range(self.channel_count)
+            frame = np.asarray(values)
+            assert frame.shape == (self.channel_count,), \
+                "Expected one value for each of the {} channels".format(self.channel_count)
+        self.stream_frames(frame[np.newaxis, :], channels=channels, delta=delta, codes=codes)
+
+    def stream_frames(self, frames, channels: Sequence[int] = None, chunk_size: int = 4096,
+                      frame_rate: float = None, delta: bool = False, codes: bool = False) -> None:
+        """
+        Plays back a multi-channel waveform frame by frame, each bus on its own thread. Returns when all chips are
+        done.
+
+        :param frames: An N x len(channels) array. Row i holds the values of every channel for frame i.
+        :param channels: Global channel indices of the columns of frames. Defaults to all channels in order.
+        :param chunk_size: Number of frames sent to each interface board per chunk
+        :param frame_rate: Optional number of frames per second. Each bus is paced by its own
+            sampleScheduler.SampleScheduler.
+        :param delta: If true, only the outputs that changed are written (see DAC8568.stream_frames)
+        :param codes: If true, frames holds 16 bit integer DAC codes
+        """
+        channels = range(self.channel_count) if channels is None else channels
+        frames = np.asarray(frames)
+        assert frames.ndim == 2 and frames.shape[1] == len(channels), \
+            "Expected frames of shape (N, {})".format(len(channels))
+        calls = []
+        for bus, members in self._group_by_bus(self._split(channels)):
+            scheduler = None if frame_rate is None else SampleScheduler(frame_rate)
+            if len(members) == 1:
+                chip, chip_channels, columns = members[0]
+                calls.append((self.dacs[chip].stream_frames, (np.ascontiguousarray(frames[:, columns]),),
+                              {"channels": chip_channels, "chunk_size": chunk_size, "scheduler": scheduler,
+                               "delta": delta, "codes": codes}))
+            else:
+                calls.append((self._stream_bus, (bus, members, frames, chunk_size, scheduler, delta, codes), {}))
+        self._run(calls)
+
+    def _stream_bus(self, bus, members, frames: np.ndarray, chunk_size: int, scheduler, delta: bool,
+                    codes: bool) -> None:
+        """
+        Plays back frames on several chips that share a bus, with one combined transfer per chunk, see stream_frames.
+
+        :param bus: The transport.SPIBus of the chips
+        :param members: (chip index, channel characters, columns of frames) of each chip, as returned by _split
+        """
+        dacs = [self.dacs[chip] for chip, _, _ in members]
+        encoded = [dac._frame_words(chip_channels, frames[:, columns], delta, codes)
+                   for dac, (_, chip_channels, columns) in zip(dacs, members)]
+        transports = [dac._transport for dac in dacs]
+        for dac in dacs:
+            dac._shadow.fill(-1)  # Set again once all frames are written
+        sent = 0
+        while sent < len(frames):
+            batch = min(chunk_size, len(frames) - sent)
+            if scheduler is not None:
+                batch = scheduler.wait(batch)
+            bus.write_samples([(transport, words, offsets[sent:sent + batch + 1])
+                               for transport, (words, offsets, _) in zip(transports, encoded)], DAC8568._FRAME_SIZE)
+            sent += batch
+        for dac, (_, _, shadow) in zip(dacs, encoded):
+            dac._shadow = shadow
+
+    def _group_by_bus(self, groups: List[Tuple[int, List[str], List[int]]]) -> list:
+        """
+        Groups the chips returned by _split by the bus of their transport. Connects chips that aren't connected yet.
+
+        :return: (transport.SPIBus, chips on it) pairs. Chips with a bus of their own are alone, with None as the bus.
+        """
+        buses = []
+        for group in groups:
+            bus = self.dacs[group[0]]._transport.bus
+            for shared, members in buses:
+                if bus is not None and shared is bus:
+                    members.append(group)
+                    break
+            else:
+                buses.append((bus, [group]))
+        return buses
+
+    def _split(self, channels: Sequence[int]) -> List[Tuple[int, List[str], List[int]]]:
+        """
+        Groups global channel indices by chip.
+
+        :param channels: Global channel indices
+        :return: (chip index, channel characters on the chip, positions of those channels in channels) for every chip
+            that has at least one of the channels
+        """
+        groups = {}
+        for column, index in enumerate(channels):
+            chip, channel = self.locate(index)
+            chip_channels, columns = groups.setdefault(chip, ([], []))
+            chip_channels.append(channel)
+            columns.append(column)
+        return [(chip, chip_channels, columns) for chip, (chip_channels, columns) in sorted(groups.items())]
+
+    def _run(self, calls) -> None:
+        """
+        Runs (function, args, kwargs) calls on the thread pool and waits for all of them. A single call runs on the
+        calling thread. The first exception is raised once every call has finished.
+        """
+        if len(calls) == 1:
+            function, args, kwargs = calls[0]
+            function(*args, **kwargs)
+            return
+        futures = [self._executor.submit(function, *args, **kwargs) for function, args, kwargs in calls]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
@@ -0,0 +1,350 @@
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+_HEADER_BYTES = 64  # Counters at the start of the shared block, padded to a cache line
+_WRITTEN, _READ, _OVERRUNS, _STREAMING = range(4)
+
+
+class SharedRingBuffer:
+    """
+    Ring of float64 records in a multiprocessing.shared_memory block, for one process that writes and one that reads.
+    The counters live in the same block, so both sides see the fill level without sending any messages, and the
+    reader gets the records as views of the shared memory, without copies. When the ring is full new records are
+    dropped and counted in overruns.
+
+    A ring that is pickled, ex. passed to a multiprocessing.Process, is attached to the same block on the other side.
+    Needs Python 3.8 or later.
+    """
+
+    def __init__(self, capacity: int, width: int = 1, name: str = None):
+        """
+        :param capacity: Number of records the ring holds
+        :param width: Number of values per record
+        :param name: Name of an existing block to attach to. If None, a new block is created, and it is removed again
+            by close.
+        """
+        assert capacity > 0 and width > 0, "capacity and width must be positive"
+        self.capacity = capacity
+        self.width = width
+        self._owner = name is None
+        size = _HEADER_BYTES + capacity * width * np.dtype(np.float64).itemsize
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self._counters = np.ndarray((4,), dtype=np.int64, buffer=self._memory.buf)
+        self._data = np.ndarray((capacity, width), dtype=np.float64, buffer=self._memory.buf, offset=_HEADER_BYTES)
+        if self._owner:
+            self._counters[:] = 0
+
+    def __reduce__(self):
+        return SharedRingBuffer, (self.capacity, self.width, self.name)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block"""
+        return self._memory.name
+
+    @property
+    def written(self) -> int:
+        """Number of records written since the ring was created"""
+        return int(self._counters[_WRITTEN])
+
+    @property
+    def overruns(self) -> int:
+        """Number of records that were dropped because the ring was full"""
+        return int(self._counters[_OVERRUNS])
+
+    def __len__(self) -> int:
+        """Number of records that are waiting to be read"""
+        return int(self._counters[_WRITTEN] - self._counters[_READ])
+
+    def write(self, records) -> int:
+        """
+        Appends records. Only the writing process may call this.
+
+        :param records: An N x width array, or a single record
+        :return: Number of records that were written. The rest didn't fit.
+        """
+        records = np.asarray(records, dtype=np.float64).reshape(-1, self.width)
+        free = self.capacity - len(self)
+        if len(records) > free:
+            self._counters[_OVERRUNS] += len(records) - free
+            records = records[:free]
+        start = int(self._counters[_WRITTEN] % self.capacity)
+        first = min(len(records), self.capacity - start)
+        self._data[start:start + first] = records[:first]
+        self._data[:len(records) - first] = records[first:]
+        self._counters[_WRITTEN] += len(records)  # Only after the data, so the reader never sees unwritten records
+        return len(records)
+
+    def peek(self, max_records: int = None) -> np.ndarray:
+        """
+        Returns the oldest unread records without copying them. Only the reading process may call this.
+        If the unread records wrap around the end of the ring, only the part up to the end is returned.
+
+        :param max_records: Largest number of records to return
+        :return: A view of up to max_records x width values. It stays valid until the records are consumed.
+        """
+        available = len(self) if max_records is None else min(len(self), max_records)
+        start = int(self._counters[_READ] % self.capacity)
+        return self._data[start:start + min(available, self.capacity - start)]
+
+    def consume(self, count: int) -> None:
+        """
+        Marks the oldest records as read, so their space can be written again.
+
+        :param count: Number of records, at most len(self)
+        """
+        assert 0 <= count <= len(self), "Can't consume more records than are waiting"
+        self._counters[_READ] += count
+
+    def read(self, max_records: int = None) -> np.ndarray:
+        """
+        Copies the oldest unread records out of the ring and consumes them.
+
+        :param max_records: Largest number of records to read. Defaults to all of them.
+        :return: An N x width array
+        """
+        count = len(self) if max_records is None else min(len(self), max_records)
+        first = self.peek(count)
+        second = self._data[:count - len(first)]
+        records = np.concatenate((first, second))
+        self.consume(count)
+        return records
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, and removes it if this object created it. Views returned by peek must have
+        been dropped.
+        """
+        if self._memory is None:
+            return
+        self._counters = None
+        self._data = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+
+def _picklable(error: Exception) -> Exception:
+    """The error itself if it can be sent back to the controller, otherwise a RuntimeError that describes it"""
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+
+def _serve(factory: Callable, args: tuple, kwargs: dict, commands, replies, results: SharedRingBuffer) -> None:
+    """
+    Main loop of the worker process. Builds the device, then answers commands. While a stream is running, the stream
+    method is called over and over between commands and each result is written to the results ring with a time stamp.
+    """
+    try:
+        device = factory(*args, **kwargs)
+    except Exception as error:
+        replies.put((False, _picklable(error)))
+        results.close()
+        return
+    replies.put((True, None))
+
+    stream = None  # (method, args, kwargs)
+    stream_error = None
+    while True:
+        try:
+            command = commands.get() if stream is None else commands.get_nowait()
+        except queue.Empty:
+            command = ()
+        if command is None:
+            break
+
+        if command:
+            kind, name, call_args, call_kwargs = command
+            try:
+                if kind == "call":
+                    result = getattr(device, name)(*call_args, **call_kwargs)
+                elif kind == "get":
+                    result = getattr(device, name)
+                elif name is None:  # "stream" without a method stops the stream
+                    stream = None
+                    result, stream_error = stream_error, None
+                    if result is not None:
+                        raise result
+                else:
+                    stream = (getattr(device, name), call_args, call_kwargs)
+                    stream_error = None
+                    result = None
+                reply = (True, result)
+            except Exception as error:
+                reply = (False, _picklable(error))
+            results._counters[_STREAMING] = stream is not None  # Before the reply, so the controller sees it
+            replies.put(reply)
+            continue
+
+        method, call_args, call_kwargs = stream
+        try:
+            values = np.asarray(method(*call_args, **call_kwargs), dtype=np.float64).reshape(-1, results.width - 1)
+        except Exception as error:
+            stream = None
+            stream_error = _picklable(error)
+            results._counters[_STREAMING] = 0
+            continue
+        records = np.empty((len(values), results.width))
+        records[:, 0] = time.time()
+        records[:, 1:] = values
+        results.write(records)
+
+    if hasattr(device, "close"):
+        device.close()
+    results.close()
+
+
+class DeviceWorker:
+    """
+    Hosts a device (DAC8568, TSL510, KEYSIGHT81634B, ...) in its own process, so its Python work (encoding, VISA
+    parsing) runs on its own core instead of competing for the GIL with the controller and the other devices.
+
+    The device is constructed in the worker process from a picklable factory, normally its class, and its methods are
+    called through a command queue: every method of the device is available on the worker, and the arguments, return
+    values and exceptions are pickled across. Bulk readings don't go through the queue: start_stream calls a method
+    over and over in the worker and writes each result, with a time stamp, to the results ring in shared memory,
+    where the controller reads it without copies.
+
+    Scripts that use workers need an ``if __name__ == '__main__':`` guard, because worker processes are spawned.
+
+    Example::
+
+        meter = DeviceWorker(KEYSIGHT81634B)
+        meter.set_wavelength(1.55)
+        meter.start_stream("get_power")
+        while running:
+            records = meter.results.read()  # Column 0 holds time stamps, column 1 the powers
+        meter.close()
+    """
+
+    def __init__(self, factory: Callable, args: Sequence = (), kwargs: dict = None, width: int = 1,
+                 capacity: int = 1000000, start_method: str = "spawn"):
+        """
+        Starts the worker process and waits until it has constructed the device.
+
+        :param factory: Picklable function or class that creates the device, ex. DAC8568
+        :param args: Positional arguments of factory
+        :param kwargs: Keyword arguments of factory
+        :param width: Number of values in each result of the stream method, ex. the number of channels for
+            powerMeterMainframe.KEYSIGHT8163B.read_powers. Results with several rows are written as several records.
+        :param capacity: Number of records the results ring holds
+        :param start_method: multiprocessing start method of the worker process
+        :raise: The exception raised by factory, if any
+        """
+        context = multiprocessing.get_context(start_method)
+        self.results = SharedRingBuffer(capacity, width + 1)
+        self._commands = context.Queue()
+        self._replies = context.Queue()
+        self._lock = threading.Lock()
+        self._process = context.Process(target=_serve, args=(factory, tuple(args), kwargs or {}, self._commands,
+                                                               self._replies, self.results), daemon=True)
+        self._process.start()
+        try:
+            self._reply()
+        except Exception:
+            self._process.join()
+            self.results.close()
+            raise
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        """
+        Calls a method of the device in the worker process and waits for it to return.
+
+        :param name: Name of the method
+        :return: The return value of the method
+        :raise: The exception raised by the method, if any
+        """
+        return self._request("call", name, args, kwargs)
+
+    def get(self, name: str) -> Any:
+        """
+        :param name: Name of an attribute or property of the device
+        :return: A copy of its value
+        """
+        return self._request("get", name, (), {})
+
+    def start_stream(self, name: str, *args, **kwargs) -> None:
+        """
+        Starts calling a method of the device over and over, writing every result to results. Commands are still
+        answered in between. A stream that is already running is replaced.
+
+        :param name: Name of the method, ex. "get_power"
+        """
+        self._request("stream", name, args, kwargs)
+
+    def stop_stream(self) -> None:
+        """
+        Stops the stream.
+
+        :raise: The exception that stopped the stream, if the stream method raised one
+        """
+        self._request("stream", None, (), {})
+
+    @property
+    def streaming(self) -> bool:
+        """True while the stream method is being called"""
+        return bool(self.results._counters[_STREAMING])
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def close(self, timeout: float = 5.) -> None:
+        """
+        Closes the device, stops the worker process and frees the results ring. Views from results.peek must have been
+        dropped.
+
+        :param timeout: Time in seconds to wait for the worker before it is terminated
+        """
+        if self._process.is_alive():
+            self._commands.put(None)
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self.results.close()
+
+    def __enter__(self) -> "DeviceWorker":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+    def _request(self, kind: str, name: str, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._commands.put((kind, name, args, kwargs))
+            return self._reply()
+
+    def _reply(self) -> Any:
+        """Waits for the answer to the last command and raises the exception in it, if any"""
+        while True:
+            try:
+                ok, result = self._replies.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError("The worker process exited with code {}".format(self._process.exitcode))
+        if not ok:
+            raise result
+        return result
@@ -0,0 +1,115 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".multichannel_control_resources.json")
+
+
+def find_instrument(rm, target: str, timeout: int = 500, cache_file: Optional[str] = DEFAULT_CACHE_FILE):
+    """
+    Finds the VISA resource whose identification string contains target and returns it opened.
+
+    The address that each identification string was last seen at is cached on disk. If the cache has an address for
+    the target it is tried first, so normally no bus scan is needed. Otherwise, or if the cached address no longer
+    answers with the target, every resource on the bus is probed in parallel and the results are merged into the cache.
+    Entries of instruments that didn't answer, ex. because another program has them open, are kept. Only entries
+    whose address now answers with a different identification string are dropped.
+
+    :param rm: pyvisa ResourceManager
+    :param target: Text to look for in the reply to '*IDN?', ex. 'TSL-510'
+    :param timeout: Timeout in milliseconds for opening and identifying each resource while probing
+    :param cache_file: Path of the JSON cache file. None disables the cache.
+    :return: The opened resource
+    :raises: RuntimeError if no resource matches target
+    """
+    cache = _load_cache(cache_file)
+
+    for idn, address in cache.items():
+        if target in idn:
+            inst, name = _probe(rm, address, timeout)
+            if inst is not None and target in name:
+                return inst
+            if inst is not None:
+                inst.close()
+            break
+
+    found = scan(rm, timeout)
+    match = None
+    for address, (inst, name) in found.items():
+        if match is None and target in name:
+            match = inst
+        else:
+            inst.close()
+
+    cache = {idn: address for idn, address in cache.items() if address not in found or found[address][1] == idn}
+    cache.update((name, address) for address, (_, name) in found.items())
+    _save_cache(cache_file, cache)
+
+    if match is None:
+        raise RuntimeError("Target resource {} cannot be found in the VISA resource manager".format(target))
+    return match
+
+
+def scan(rm, timeout: int = 500) -> Dict[str, tuple]:
+    """
+    Opens and identifies every resource on the bus in parallel. Resources that can't be opened or don't answer within
+    timeout are skipped.
+
+    :param rm: pyvisa ResourceManager
+    :param timeout: Timeout in milliseconds for opening and identifying each resource
+    :return: Dict that maps each address that answered to a tuple (opened resource, identification string). The caller
+        is responsible for closing the resources.
+    """
+    addresses = rm.list_resources()
+    if not addresses:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+        probes = executor.map(lambda address: _probe(rm, address, timeout), addresses)
+        return {address: (inst, name) for address, (inst, name) in zip(addresses, probes) if inst is not None}
+
+
+def _probe(rm, address: str, timeout: int) -> tuple:
+    """
+    Opens one resource and asks for its identification string.
+
+    :return: (resource, identification string), or (None, None) if the resource can't be identified. A resource that
+        fails is closed again.
+    """
+    try:
+        inst = rm.open_resource(address, open_timeout=timeout)
+    except Exception:
+        return None, None
+
+    try:
+        previous_timeout = inst.timeout
+        inst.timeout = timeout
+        name = inst.query('*IDN?').strip()
+        inst.timeout = previous_timeout
+        return inst, name
+    except Exception:
+        inst.close()
+        return None, None
+
+
+def _load_cache(cache_file: Optional[str]) -> Dict[str, str]:
+    """Reads the identification string to address mapping. A missing or broken file gives an empty cache."""
+    if cache_file is None:
+        return {}
+    try:
+        with open(cache_file) as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(cache_file: Optional[str], cache: Dict[str, str]) -> None:
+    """Writes the identification string to address mapping. Failing to write the cache is not an error."""
+    if cache_file is None:
+        return
+    try:
+        with open(cache_file, "w") as file:
+            json.dump(cache, file, indent=2)
+    except OSError:
+        pass
@@ -0,0 +1,189 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from .powerSource import DAC8568
+from .transport import SPITransport
+
+# Upper edges of the latency histogram bins in seconds
+HISTOGRAM_EDGES = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1., float("inf"))
+
+
+class CommandStats:
+    """Counters for one command on one device"""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.total_time = 0.
+        self.max_time = 0.
+        self.histogram = [0] * len(HISTOGRAM_EDGES)
+
+    def add(self, size: int, duration: float) -> None:
+        self.count += 1
+        self.bytes += size
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[bisect.bisect_left(HISTOGRAM_EDGES, duration)] += 1
+
+    def as_dict(self) -> dict:
+        return {"count": self.count,
+                "bytes": self.bytes,
+                "total_time": self.total_time,
+                "mean_time": self.total_time / self.count if self.count else 0.,
+                "max_time": self.max_time,
+                "histogram": list(zip(HISTOGRAM_EDGES, self.histogram))}
+
+
+class Instrumentation:
+    """
+    Collects per-command counts, bytes and latency histograms from instrumented transports and VISA resources, and
+    passes every call on to the registered callbacks, ex. for tracing. Nothing is measured unless a transport or
+    resource is wrapped with instrument_dac or instrument_visa, so there is no cost when it isn't used.
+    """
+
+    def __init__(self):
+        self._stats = {}  # (device, command) -> CommandStats
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self.enabled = True  # Set to False to pause the measurements without unwrapping
+
+    def add_callback(self, callback: Callable[[str, str, int, float], None]) -> None:
+        """
+        :param callback: Called as callback(device, command, bytes, duration in seconds) after every call
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[str, str, int, float], None]) -> None:
+        self._callbacks.remove(callback)
+
+    def record(self, device: str, command: str, size: int, duration: float) -> None:
+        """Adds one call to the statistics"""
+        with self._lock:
+            stats = self._stats.get((device, command))
+            if stats is None:
+                stats = self._stats[(device, command)] = CommandStats()
+            stats.add(size, duration)
+        for callback in self._callbacks:
+            callback(device, command, size, duration)
+
+    def stats(self) -> Dict[Tuple[str, str], dict]:
+        """
+        :return: Dict that maps (device, command) to a dict with count, bytes, total_time, mean_time, max_time and
+            histogram, a list of (upper bin edge in seconds, number of calls) pairs
+        """
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    def slowest(self, n: int = 10) -> list:
+        """
+        :return: The n (device, command) keys with the largest total time, slowest first
+        """
+        stats = self.stats()
+        return sorted(stats, key=lambda key: stats[key]["total_time"], reverse=True)[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _timed(self, device: str, command: str, size: int, function, *args, **kwargs):
+        """Calls function(*args, **kwargs) and records how long it took"""
+        if not self.enabled:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.record(device, command, size, time.perf_counter() - start)
+
+
+class InstrumentedTransport(SPITransport):
+    """Wraps an SPITransport and records every write, keyed by the DAC command of its first word"""
+
+    _COMMAND_NAMES = {bits: name for name, bits in DAC8568._COMMAND.items()}
+
+    def __init__(self, transport: SPITransport, instrumentation: Instrumentation, device: str = "DAC8568"):
+        self.transport = transport
+        self._instrumentation = instrumentation
+        self._device = device
+
+    def _command(self, buffer) -> str:
+        view = memoryview(buffer).cast("B")
+        if len(view) == 0:
+            return "empty"
+        control = view[0] & 0xF
+        return InstrumentedTransport._COMMAND_NAMES.get(control, "0x{:X}".format(control))
+
+    def write(self, buffer) -> None:
+        self._instrumentation._timed(self._device, self._command(buffer), len(memoryview(buffer).cast("B")),
+                                     self.transport.write, buffer)
+
+    def write_frames(self, buffer, frame_size: int) -> None:
+        self._instrumentation._timed(self._device, "frames:" + self._command(buffer),
+                                     len(memoryview(buffer).cast("B")), self.transport.write_frames, buffer,
+                                     frame_size)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class InstrumentedResource:
+    """Wraps a VISA resource and records every write and query, keyed by the SCPI header of the command"""
+
+    def __init__(self, resource, instrumentation: Instrumentation, device: str):
+        self.resource = resource
+        self._instrumentation = instrumentation
+        self._device = device
+
+    @staticmethod
+    def _header(command: str) -> str:
+        """The command without its parameters, ex. ':POW' for ':POW 1.0'"""
+        return command.strip().split(" ", 1)[0]
+
+    def write(self, command: str):
+        return self._instrumentation._timed(self._device, self._header(command), len(command), self.resource.write,
+                                            command)
+
+    def query(self, command: str) -> str:
+        return self._instrumentation._timed(self._device, self._header(command), len(command), self.resource.query,
+                                            command)
+
+    def query_binary_values(self, command: str, *args, **kwargs):
+        return self._instrumentation._timed(self._device, self._header(command), len(command),
+                                            self.resource.query_binary_values, command, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.resource, name)
+
+
+def instrument_dac(dac: DAC8568, instrumentation: Instrumentation, device: str = "DAC8568") -> None:
+    """
+    Starts measuring every transfer of a DAC. Doesn't connect: a DAC that isn't connected yet has its transport
+    wrapped by connect, so the reset words are measured too.
+
+    :param dac: The DAC
+    :param instrumentation: Where the measurements go
+    :param device: Name of the device in the statistics
+    """
+    if dac._transport_wrapper is not None:
+        return
+    dac._transport_wrapper = lambda transport: InstrumentedTransport(transport, instrumentation, device)
+    if dac._connected_transport is not None:
+        dac._connected_transport = dac._transport_wrapper(dac._connected_transport)
+
+
+def instrument_visa(instrument, instrumentation: Instrumentation, device: str = None) -> None:
+    """
+    Starts measuring every write and query of a VISA instrument, ex. TSL510 or KEYSIGHT81634B. Doesn't connect: the
+    session is wrapped when it is first used. The wrapper is only seen by this object, so other objects that share the
+    session aren't measured.
+
+    :param instrument: A visaInstrument.VisaInstrument
+    :param instrumentation: Where the measurements go
+    :param device: Name of the device in the statistics. Defaults to the class name.
+    """
+    if instrument._wrapper is not None:
+        return
+    device = type(instrument).__name__ if device is None else device
+    instrument._wrapper = lambda resource: InstrumentedResource(resource, instrumentation, device)
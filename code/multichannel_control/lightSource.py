@@ -0,0 +1,226 @@
+from typing import List, NamedTuple, Tuple
+
+from .visaInstrument import VisaInstrument, _visa_io_error
+
+
+class TSL510Status(NamedTuple):
+    """Snapshot of the laser state, read with TSL510.snapshot"""
+    ld_on: bool  # Laser Diode is on
+    auto_attenuation: bool  # Power attenuation is automatic rather than manual
+    shutter_closed: bool
+    power_unit_mw: bool  # Power units are mW rather than dBm
+    wavelength_unit_thz: bool  # Wavelength units are THz rather than nm
+    power_range: Tuple[float, float]  # (min, max) in power units
+    color_range: Tuple[float, float]  # (min, max) in wavelength units
+
+
+class TSL510(VisaInstrument):
+    """
+    This class provides a simple interface with the TSL-510 Laser. It creates an
+    object that consists of setters and getters.
+    Most methods require the Laser Diode to be turned on in order to work.
+    After turning the power on or the LD output off, it is recommended that you
+    wait at least 30 seconds before turning on LD output.
+    While the LD light is blinking, communication is not possible.
+    """
+    _TARGET = 'TSL-510'  # the target device is "SANTEC,TSL-510,14040011,0002.0085"
+
+    _SNAPSHOT_QUERIES = (':POW:STAT?', ':POW:ATT:AUT?', ':POW:SHUT?', ':POW:UNIT?', ':WAV:UNIT?',
+                         ':POW:LEV:MIN?', ':POW:LEV:MAX?', ':WAV:MIN?', ':WAV:MAX?')
+
+    def _query_batch(self, queries: Tuple[str, ...]) -> List[str]:
+        """
+        Sends several queries as one semicolon-joined command, so they cost a single bus round trip. If the laser
+        doesn't answer (a device clear then drops any late reply from its output queue, and its error queue is
+        cleared) or the reply doesn't have one field per query, the laser is assumed not to support compound queries:
+        the queries are sent one by one instead, and from then on for every object that uses the session.
+
+        :param queries: SCPI queries, ex. (':WAV:MIN?', ':WAV:MAX?')
+        :return: The stripped reply to each query
+        """
+        session = self._session
+        if session.compound_queries:
+            try:
+                replies = self._inst.query(';'.join(queries)).strip().split(';')
+            except _visa_io_error():
+                self._inst.clear()
+                self._inst.write('*CLS')
+                replies = []
+            if len(replies) == len(queries):
+                return [reply.strip() for reply in replies]
+            session.compound_queries = False
+        return [self._inst.query(query).strip() for query in queries]
+
+    def snapshot(self) -> TSL510Status:
+        """
+        Reads the status flags and the power and color ranges in a single bus round trip.
+
+        :return: The current state of the laser
+        """
+        replies = self._query_batch(TSL510._SNAPSHOT_QUERIES)
+        flags = [bool(int(float(reply))) for reply in replies[:5]]
+        power_min, power_max, color_min, color_max = (float(reply) for reply in replies[5:])
+        status = TSL510Status(*flags, power_range=(power_min, power_max), color_range=(color_min, color_max))
+
+        self._cache.store('ld_on', status.ld_on)
+        self._cache.store('power_unit', status.power_unit_mw)
+        self._cache.store('wavelength_unit', status.wavelength_unit_thz)
+        self._cache.store('power_range', status.power_range)
+        self._cache.store('color_range', status.color_range)
+        return status
+
+    def status(self) -> str:
+        """
+        Queries the device and returns some, but not all, human readable status
+        values for general information and debugging purposes.
+
+        :return: A composite string of various status indicators.
+        """
+
+        status = self.snapshot()
+        str = ""
+        str += "Laser Diode Status (0:OFF, 1:ON):            {:d}\n".format(status.ld_on)
+        str += "Power Attenuation (0:Manual, 1:Auto):        {:d}\n".format(status.auto_attenuation)
+        str += "Shutter (0:Open, 1:Closed):                  {:d}\n".format(status.shutter_closed)
+        str += "Power units are (0:dBm, 1:mW):               {:d}\n".format(status.power_unit_mw)
+        str += "Wavelength units are (0:nm, 1:THz):          {:d}\n".format(status.wavelength_unit_thz)
+        str += "Power range (min, max):                      {}\n".format(status.power_range)
+        str += "Color range (min, max):                      {}\n".format(status.color_range)
+        # And on and on...
+        return str
+
+    @staticmethod
+    def _bool_to_int(value: bool) -> int:
+        """
+        Maps a boolean false to the integer '0' and a boolean true to the integer '1'.
+        :param value:
+        :return: The value 0 or 1
+        """
+        if value:
+            return int(1)
+        else:
+            return int(0)
+
+    def set_wavelength_unit(self, unit: bool) -> None:
+        """
+        Wavelength field can either represent the wavelength(in nm) or the
+        frequency(in THz). Parameter num can either be 0 or 1 (0:nm, 1:THz).
+        Raises exception if num is out of range
+
+        :param unit: If unit is false, the unit is set to nanometers. If true, TeraHertz
+        """
+        if self._cache.write('wavelength_unit', bool(unit),
+                             lambda: self._inst.write(':WAV:UNIT ' + str(self._bool_to_int(unit)))):
+            # Values in the old unit are meaningless now
+            self._cache.invalidate('color', 'color_range')
+
+    def get_wavelength_unit(self) -> bool:
+        """
+        :return: False if the wavelength unit is nanometers, True if it is THz
+        """
+        return self._cache.read('wavelength_unit', lambda: bool(int(float(self._inst.query(':WAV:UNIT?')))))
+
+    def set_color(self, color: float) -> None:
+        """
+        Sets the color of light coming out of the laser.
+
+        :param color: The color of light coming out of the laser. Units are either nanometers or THz,
+            depending on what has been set beforehand.
+        """
+        self._cache.write('color', color, lambda: self._inst.write(':WAV ' + str(color)))
+
+    def set_power_unit(self, value: bool) -> None:
+        """
+        Sets the power unit for the laser. Power field can have units dBm (dBmW) or just mW.
+
+        :param value: Sets the power unit to dBm if false, mW if true.
+        """
+        if self._cache.write('power_unit', bool(value),
+                             lambda: self._inst.write(':POW:UNIT ' + str(self._bool_to_int(value)))):
+            # Values in the old unit are meaningless now
+            self._cache.invalidate('power', 'power_range')
+
+    def get_power_unit(self) -> bool:
+        """
+        :return: False if the power unit is dBm, True if it is mW
+        """
+        return self._cache.read('power_unit', lambda: bool(int(float(self._inst.query(':POW:UNIT?')))))
+
+    def set_power(self, power: float) -> None:
+        """
+        Sets laser power in units set beforehand
+
+        :param power: Output laser power in either dBm or mW.
+        """
+        self._cache.write('power', power, lambda: self._inst.write(':POW ' + str(power)))
+
+    def get_power_true(self) -> float:
+        """
+        Uses power meter inside of laser to measure actual power output (at source)
+
+        :return: Measured power in system units (dBm or mW)
+        """
+        return float(self._inst.query(':POW:ACT?'))
+
+    def get_range_power(self) -> Tuple[float, float]:
+        """
+        Gives a range of power. I don't know what this means: maybe attainable power
+        range or stable power range? May be constant or vary w/
+        temperature, wavelength, etc.
+
+        :return: lower and upper bound of power output in system units (dBm or mW) in tuple (min, max)
+        """
+        return self._cache.read('power_range', lambda: tuple(
+            float(reply) for reply in self._query_batch((':POW:LEV:MIN?', ':POW:LEV:MAX?'))))
+
+    def get_range_color(self) -> Tuple[float, float]:
+        """
+        Not well documented function (see get_range_power)
+
+        :return: a 2 element tuple of color range in system units (nanometers or THz) in tuple (min, max)
+        """
+        return self._cache.read('color_range', lambda: tuple(
+            float(reply) for reply in self._query_batch((':WAV:MIN?', ':WAV:MAX?'))))
+
+    def ld_off(self) -> None:
+        """
+        Turns off the Laser Diode (LD)
+        """
+        self._cache.write('ld_on', False, lambda: self._inst.write(':POW:STAT 0'))
+
+    def configure_sweep(self, start: float, stop: float, speed: float, trigger_step: float) -> None:
+        """
+        Sets up a continuous one-way wavelength sweep with a trigger output pulse every trigger_step, which can be used
+        to clock a power meter.
+
+        :param start: Start wavelength in the current wavelength unit
+        :param stop: Stop wavelength in the current wavelength unit
+        :param speed: Sweep speed in nm/s
+        :param trigger_step: Interval between trigger output pulses in the current wavelength unit
+        """
+        self._inst.write(':WAV:SWE:STAR ' + str(start))
+        self._inst.write(':WAV:SWE:STOP ' + str(stop))
+        self._inst.write(':WAV:SWE:SPE ' + str(speed))
+        self._inst.write(':WAV:SWE:MOD 1')  # 1: continuous sweep, one way
+        self._inst.write(':TRIG:OUTP:STEP ' + str(trigger_step))
+        self._inst.write(':TRIG:OUTP 3')  # 3: a pulse every trigger step
+        # The sweep moves the wavelength away from the last set color
+        self._cache.invalidate('color')
+
+    def start_sweep(self) -> None:
+        """
+        Starts the sweep set up with configure_sweep
+        """
+        self._inst.write(':WAV:SWE 1')
+
+    def stop_sweep(self) -> None:
+        """
+        Stops a sweep in progress
+        """
+        self._inst.write(':WAV:SWE 0')
+
+    def sweep_running(self) -> bool:
+        """
+        :return: True while a sweep is in progress
+        """
+        return int(float(self._inst.query(':WAV:SWE?'))) != 0
@@ -0,0 +1,170 @@
+import time
+from typing import Tuple
+
+import numpy as np
+
+from .tools import PowerUnit;
+from .visaInstrument import VisaInstrument
+
+
+class KEYSIGHT81634B(VisaInstrument):
+    """
+    This class provides a simple interface with the Keysight 81634B lightwave power meter. The device is connected
+    to the computer using a GPIB to USB adapter connected to a multi-device bus.
+    """
+    _TARGET = 'Agilent Technologies,8163B,MY48208514,V5.25(72637)'
+
+    # Slot and channel that commands without a slot number address. Settings are cached under (name, slot, channel),
+    # like powerMeterMainframe.KEYSIGHT8163B does, because both can share a session.
+    _CHANNEL = (1, 1)
+
+    def id(self) -> str:
+        """
+        Queries the module for the identification number
+
+        :return: Identification string
+        """
+
+        return self._inst.query('*IDN?')
+
+    def get_power(self) -> float:
+        """
+        Reads the current power meter value. It provides its own software triggering and does not need a triggering command.
+
+        :return: The current power meter reading as a float value in dBm, W, or dB.
+        """
+
+        #:READ[n][:CHANnel[m]][:SCALar]: POWer[:DC]?
+        return float(self._inst.query(":READ:POW?"))
+
+    def configure_logging(self, samples: int, averaging_time: float) -> None:
+        """
+        Sets up the meter's internal data logging function. Logging takes samples readings, each averaged over
+        averaging_time, and keeps them in the meter until they are fetched.
+
+        :param samples: Number of readings to log
+        :param averaging_time: Averaging time of each reading in seconds
+        """
+        assert samples > 0, "samples must be positive"
+
+        #:SENSe[n][:CHANnel[m]]:FUNCtion:PARameter:LOGGing <data points>,<averaging time>
+        self._inst.write(":SENS:FUNC:PAR:LOGG {:d},{}".format(samples, averaging_time))
+
+    def start_logging(self) -> None:
+        """
+        Starts logging with the parameters from configure_logging. With the default trigger configuration the readings
+        are taken one after the other as fast as the averaging time allows.
+        """
+
+        #:SENSe[n][:CHANnel[m]]:FUNCtion:STATe LOGGing,STARt
+        self._inst.write(":SENS:FUNC:STAT LOGG,STAR")
+
+    def set_trigger_input(self, external: bool) -> None:
+        """
+        Selects how readings are triggered.
+
+        :param external: If true, each trigger input pulse takes one reading (used with start_logging to clock the
+            readings from another instrument). If false, trigger input is ignored.
+        """
+
+        #:TRIGger[n][:CHANnel[m]]:INPut IGNore|SMEasure|CMEasure|...
+        mode = "SME" if external else "IGN"
+        self._cache.write(('trigger_input',) + KEYSIGHT81634B._CHANNEL, mode,
+                          lambda: self._inst.write(":TRIG:INP " + mode))
+
+    def stop_logging(self) -> None:
+        """
+        Stops the logging function
+        """
+        self._inst.write(":SENS:FUNC:STAT LOGG,STOP")
+
+    def logging_complete(self) -> bool:
+        """
+        :return: True once all readings of the logging function have been taken
+        """
+
+        #:SENSe[n][:CHANnel[m]]:FUNCtion:STATe?
+        return "COMPLETE" in self._inst.query(":SENS:FUNC:STAT?").upper()
+
+    def wait_for_logging(self, expected: float, timeout: float) -> None:
+        """
+        Blocks until the logging function has finished.
+
+        :param expected: Expected duration of the logging in seconds. Nothing is queried before that time.
+        :param timeout: Maximum time to wait in seconds
+        :raise: TimeoutError if logging doesn't finish in time. Logging is stopped in that case.
+        """
+        start = time.perf_counter()
+        time.sleep(expected)
+        while not self.logging_complete():
+            if time.perf_counter() - start > timeout:
+                self.stop_logging()
+                raise TimeoutError("Logging did not finish in {} s".format(timeout))
+            time.sleep(min(0.1, max(expected / 100, 0.001)))
+
+    def fetch_logging(self) -> np.ndarray:
+        """
+        Reads back the logged readings as one binary block. The meter sends them as little-endian 32 bit floats.
+
+        :return: Array of the logged power readings in the current power unit
+        """
+
+        #:SENSe[n][:CHANnel[m]]:FUNCtion:RESult?
+        return self._inst.query_binary_values(":SENS:FUNC:RES?", datatype='f', is_big_endian=False,
+                                              container=np.array)
+
+    def log_power(self, samples: int, averaging_time: float, timeout: float = None) -> np.ndarray:
+        """
+        Captures a block of power readings with the internal logging function: configures it, starts it, waits for it
+        to finish and fetches the result. This is much faster than calling get_power in a loop because the readings
+        are not software triggered one by one. Trigger input is ignored, so a trigger setup left by a sweep doesn't
+        stall logging.
+
+        :param samples: Number of readings to log
+        :param averaging_time: Averaging time of each reading in seconds
+        :param timeout: Maximum time to wait for logging to finish in seconds. Defaults to twice the expected
+            duration plus one second.
+        :return: Array of the logged power readings in the current power unit
+        :raise: TimeoutError if logging doesn't finish in time
+        """
+        expected = samples * averaging_time
+        if timeout is None:
+            timeout = 2 * expected + 1.
+
+        self.configure_logging(samples, averaging_time)
+        self.set_trigger_input(False)
+        self.start_logging()
+        self.wait_for_logging(expected, timeout)
+        return self.fetch_logging()
+
+    def set_power_unit(self, power_unit: PowerUnit) -> None:
+        """
+        Sets or returns the units used for absolute readings on a sensor.
+
+        :param power_unit: Power unit that should be used. Either dBm or W.
+        """
+
+        # 0: Current power units are dBm. 1: Current power units are Watts.
+        if power_unit == PowerUnit.dBm:
+            unit_argument = int(0)
+        elif power_unit == PowerUnit.W:
+            unit_argument = int(1)
+        else:
+            raise ValueError("power unit {} is not supported on this device".format(power_unit))
+
+        #:SENSe[n][:CHANnel[m]]:POWer:UNIT/?
+        self._cache.write(('power_unit',) + KEYSIGHT81634B._CHANNEL, unit_argument,
+                          lambda: self._inst.write("SENS:POW:UNIT {}".format(unit_argument)))
+
+    def set_wavelength(self, wavelength: float) -> None:
+        """
+        Sets the power wavelength
+        :param wavelength: Wavelength in micrometers.
+        """
+
+        assert isinstance(wavelength, float), "Incompatible type"
+
+        #:SENSe[n][:CHANnel[m]]:POWer:WAVelength /?
+        # Sent with its unit, so the value cached in nm, the unit that KEYSIGHT8163B uses, is what the meter is set to
+        self._cache.write(('wavelength',) + KEYSIGHT81634B._CHANNEL, wavelength * 1e3,
+                          lambda: self._inst.write("SENS:POW:WAV {}UM".format(wavelength)))
@@ -0,0 +1,152 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .opticalPowerMeter import KEYSIGHT81634B
+from .tools import PowerUnit
+from .visaInstrument import VisaInstrument
+
+_MISSING = object()
+
+
+class KEYSIGHT8163B(VisaInstrument):
+    """
+    This class reads every power sensor in a Keysight 8163B lightwave multimeter mainframe at once. The installed
+    modules are found with *OPT?, settings are written to all channels with one command, and all channels are read with
+    one semicolon-joined query, so a poll costs a single bus round trip however many sensors there are.
+    It shares its session with KEYSIGHT81634B objects connected to the same mainframe.
+
+    Channels are (slot, channel) pairs, ex. (1, 1), (2, 1), (2, 2) for an 81634B in slot 1 and an 81635A in slot 2.
+    """
+    _TARGET = KEYSIGHT81634B._TARGET
+
+    _FIRST_SLOT = 1  # Slot number of the first module listed by *OPT?
+
+    # Number of channels of each power meter module. Other modules, ex. laser sources, are skipped.
+    _CHANNELS = {"81630B": 1, "81634B": 1, "81635A": 2, "81636B": 1, "81618A": 1, "81619A": 2}
+
+    def __init__(self, registry=None, cache_ttl: float = 1.0, resource=None,
+                 channels: Sequence[Tuple[int, int]] = None):
+        """
+        Constructor doesn't talk to the mainframe. The VISA session is opened by connect, which is called automatically
+        the first time the mainframe is used.
+
+        :param registry: visaSessions.SessionRegistry to take the session from. Defaults to the process-wide registry.
+        :param cache_ttl: Number of seconds that settings are cached for (see stateCache). 0 disables the cache.
+        :param resource: An already opened VISA resource to use instead of one from the registry, ex. a
+            simulatedInstrument.SimulatedInstrument
+        :param channels: (slot, channel) pairs to read, in the order of the readings. Defaults to every channel of the
+            installed power meter modules.
+        """
+        super().__init__(registry, cache_ttl, resource)
+        self._channels = None if channels is None else [tuple(channel) for channel in channels]
+        self._read_query = None
+
+    def modules(self) -> Dict[int, str]:
+        """
+        Queries the installed modules.
+
+        :return: Dict that maps slot numbers to module part numbers, ex. {1: "81634B", 2: "81635A"}. Empty slots are
+            left out.
+        """
+        #*OPT?
+        options = self._cache.read('modules', lambda: self._inst.query('*OPT?'))
+        parts = [part.strip() for part in options.strip().split(',')]
+        return {slot: part for slot, part in enumerate(parts, KEYSIGHT8163B._FIRST_SLOT) if part}
+
+    @property
+    def channels(self) -> List[Tuple[int, int]]:
+        """The (slot, channel) pairs that read_powers returns, in order"""
+        if self._channels is None:
+            self._channels = [(slot, channel)
+                              for slot, part in sorted(self.modules().items())
+                              for channel in range(1, KEYSIGHT8163B._CHANNELS.get(part, 0) + 1)]
+        return self._channels
+
+    def read_powers(self) -> np.ndarray:
+        """
+        Reads the current value of every channel with a single query. Each channel provides its own software
+        triggering, like KEYSIGHT81634B.get_power.
+
+        :return: Array with one reading per channel, in the order of channels, in each channel's power unit
+        :raise: RuntimeError if the reply doesn't have one reading per channel
+        """
+        if self._read_query is None:
+            #:READ[n][:CHANnel[m]][:SCALar]: POWer[:DC]?
+            self._read_query = ';'.join(":READ{}:CHAN{}:POW?".format(slot, channel) for slot, channel in self.channels)
+        reply = self._inst.query(self._read_query)
+        readings = np.array(reply.strip().split(';'), dtype=np.float64)
+        if len(readings) != len(self.channels):
+            raise RuntimeError("Expected {} readings but the mainframe replied {}".format(len(self.channels), reply))
+        return readings
+
+    def set_power_unit(self, power_unit: PowerUnit) -> None:
+        """
+        Sets the units used for absolute readings on every channel.
+
+        :param power_unit: Power unit that should be used. Either dBm or W.
+        """
+
+        # 0: Current power units are dBm. 1: Current power units are Watts.
+        if power_unit == PowerUnit.dBm:
+            unit_argument = 0
+        elif power_unit == PowerUnit.W:
+            unit_argument = 1
+        else:
+            raise ValueError("power unit {} is not supported on this device".format(power_unit))
+
+        #:SENSe[n][:CHANnel[m]]:POWer:UNIT/?
+        self._configure('power_unit', ":SENS{}:CHAN{}:POW:UNIT {}", unit_argument, self.channels)
+
+    def set_wavelength(self, wavelength: float) -> None:
+        """
+        Sets the wavelength that every channel is calibrated for.
+
+        :param wavelength: Wavelength in nm
+        """
+
+        #:SENSe[n][:CHANnel[m]]:POWer:WAVelength /?
+        self._configure('wavelength', ":SENS{}:CHAN{}:POW:WAV {}NM", float(wavelength), self.channels)
+
+    def set_averaging_time(self, averaging_time: float) -> None:
+        """
+        Sets the averaging time of every module. The channels of a dual module share the averaging time of channel 1.
+
+        :param averaging_time: Averaging time in seconds
+        """
+
+        #:SENSe[n][:CHANnel[m]]:POWer:ATIMe /?
+        masters = [(slot, channel) for slot, channel in self.channels if channel == 1]
+        self._configure('averaging_time', ":SENS{}:CHAN{}:POW:ATIM {}", float(averaging_time), masters)
+
+    def set_auto_range(self, auto: bool) -> None:
+        """
+        Turns automatic power ranging on or off for every channel.
+
+        :param auto: True for automatic ranging
+        """
+
+        #:SENSe[n][:CHANnel[m]]:POWer:RANGe:AUTO /?
+        self._configure('auto_range', ":SENS{}:CHAN{}:POW:RANG:AUTO {}", int(auto), self.channels)
+
+    def _configure(self, setting: str, command: str, value, channels: Sequence[Tuple[int, int]]) -> None:
+        """
+        Writes a setting to several channels as one semicolon-joined command. Channels whose cached value already
+        matches are left out, and nothing is sent if that is all of them.
+
+        :param setting: Name of the setting in the cache
+        :param command: Format string of the command for one channel, with fields for slot, channel and value
+        :param value: The new value
+        :param channels: (slot, channel) pairs to write to
+        """
+        changed = [channel for channel in channels if self._cache.get((setting,) + channel, _MISSING) != value]
+        self._cache.skipped_writes += len(channels) - len(changed)
+        if not changed:
+            return
+        try:
+            self._inst.write(';'.join(command.format(slot, channel, value) for slot, channel in changed))
+        except Exception:
+            self._cache.invalidate()
+            raise
+        for channel in changed:
+            self._cache.store((setting,) + channel, value)
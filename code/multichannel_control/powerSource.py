@@ -0,0 +1,544 @@
+import os
+import numpy as np
+
+from .transport import BusioSPITransport
+
+
+class DAC8568:
+    """Class to interface with the DAC8568 8 channel digital-to-analog converter via the FT232H controller."""
+
+    _connected_transport = None  # Transport that the DAC was reset through by connect
+    _transport_wrapper = None  # Optional function that wraps the transport in connect, ex. to measure it
+    _closed = False  # Set by close, after which the DAC can't be used
+    _waveform_cache = None
+    _shadow = None  # Output codes of channels "A" to "H" after the last frame written in delta mode, -1 if unknown
+    calibration = None  # calibration.DACCalibration used by the *_power methods
+
+    _FRAME_SIZE = 4  # Number of bytes in a single DAC command word
+
+    _COMMAND = {"WRITE": 0b0000,
+                "UPDATE": 0b0001,
+                "WRITE_AND_UPDATE_ALL": 0b0010,
+                "WRITE_AND_UPDATE": 0b0011
+                }
+
+    _CHANNEL = {"A": 0b0000,
+                "B": 0b0001,
+                "C": 0b0010,
+                "D": 0b0011,
+                "E": 0b0100,
+                "F": 0b0101,
+                "G": 0b0110,
+                "H": 0b0111,
+                "ALL": 0b1111,
+                }
+
+    _OUTPUTS = ("A", "B", "C", "D", "E", "F", "G", "H")  # Channel order used for arrays of output values
+
+    def __init__(self, baud_rate: int, waveform_cache=None, transport=None, calibration=None):
+        """
+            Stores the settings of the DAC. Nothing is sent to the DAC and the interface board isn't opened until
+            connect is called, which happens automatically the first time the DAC is used.
+
+            :param baud_rate: Rate that data is sent from the controller to the DAC. The maximum rate for the DAC is
+                50MHz but the interface board can't get that fast.
+            :param waveform_cache: Optional waveformCache.WaveformCache. When given, waveforms passed to
+                stream_waveform are only encoded the first time they are played.
+            :param transport: Optional transport.SPITransport that carries the command words, ex. a
+                transport.SimulatedSPITransport for running without hardware. Defaults to the FT232H board through
+                transport.BusioSPITransport. Pass a transport.FtdiSPITransport to send each chunk of a waveform in a
+                single USB write.
+            :param calibration: Optional calibration.DACCalibration that maps target optical powers to DAC values for
+                stream_power, stream_power_frames and set_channel_powers
+
+        """
+
+        self._baud_rate = baud_rate
+        self._waveform_cache = waveform_cache
+        self.calibration = calibration
+        self._given_transport = transport  # None means the FT232H board, opened by connect
+        self._shadow = np.full(len(DAC8568._OUTPUTS), -1, dtype=np.int64)
+
+    def connect(self) -> None:
+        """
+            Initializes the connection with the microcontroller board, takes control of pins D0, D1, D3 on the board
+            and resets the DAC. Does nothing if already connected.
+
+            :raise: RuntimeError if the DAC has been closed
+        """
+        if self._closed:
+            raise RuntimeError("The DAC has been closed")
+        if self._connected_transport is not None:
+            return
+
+        #setup interface
+        transport = self._given_transport
+        transport = BusioSPITransport(self._baud_rate) if transport is None else transport
+        if self._transport_wrapper is not None:
+            transport = self._transport_wrapper(transport)
+        self._connected_transport = transport
+
+        # Resets the state of the DAC so we know where we are staring from each time
+        self.software_reset()
+
+        # Make sure that there is no external reference connected. Reference voltage is 2.5V
+        self.internal_reference_on()
+
+    @property
+    def _transport(self):
+        """The transport, connecting first if needed"""
+        if self._connected_transport is None:
+            self.connect()
+        return self._connected_transport
+
+    @_transport.setter
+    def _transport(self, transport) -> None:
+        self._connected_transport = transport
+
+    def close(self) -> None:
+        """Releases the interface board and closes the transport. Using the DAC afterwards raises RuntimeError, since a
+        closed transport can't be used again. Create a new DAC8568 to reconnect."""
+        if self._connected_transport is not None:
+            self._connected_transport.close()
+            self._connected_transport = None
+        self._closed = True
+        self._shadow.fill(-1)
+
+    def _write(self, buffer: bytearray) -> None:
+        """Writes a single command word to the DAC in its own transaction. Use _write_frames for several words."""
+        self._shadow.fill(-1)
+        self._transport.write(buffer)
+
+    def _write_frames(self, buffer: bytes, chunk_size: int) -> None:
+        """Writes a buffer of pre-encoded command words to the DAC.
+
+        The DAC only latches a command when the chip-select line is released after each 32 bit word, so the chunks are
+        handed to the transport as frames of one word each. transport.FtdiSPITransport sends each chunk to the board in
+        a single USB write, other transports may need one transaction per word. The buffer is walked through with a
+        memoryview so no copies are made.
+
+        :param buffer: Contiguous big-endian command words, as produced by encode_words
+        :param chunk_size: Number of words sent per chunk
+        """
+        self._shadow.fill(-1)  # Delta mode sets it again once its frames are written
+        view = memoryview(buffer).cast("B")
+        chunk_bytes = chunk_size * DAC8568._FRAME_SIZE
+        for chunk_start in range(0, len(view), chunk_bytes):
+            self._transport.write_frames(view[chunk_start:chunk_start + chunk_bytes], DAC8568._FRAME_SIZE)
+
+    @staticmethod
+    def _sample_offsets(word_count: int, words_per_sample: int) -> np.ndarray:
+        """The offsets argument of _write_paced for samples that all have words_per_sample words"""
+        return np.arange(0, word_count + 1, words_per_sample)
+
+    def _write_paced(self, words: np.ndarray, offsets: np.ndarray, scheduler, max_batch: int) -> None:
+        """Writes encoded samples at the times given by a scheduler
+
+        :param words: Encoded command words of all samples
+        :param offsets: Index of the first word of each sample followed by len(words), so sample i is
+            words[offsets[i]:offsets[i + 1]]. Samples can have different numbers of words, including none.
+        :param scheduler: A sampleScheduler.SampleScheduler
+        :param max_batch: Largest number of samples written at once when catching up
+        """
+        samples = len(offsets) - 1
+        sent = 0
+        while sent < samples:
+            batch = scheduler.wait(min(max_batch, samples - sent))
+            start, stop = offsets[sent], offsets[sent + batch]
+            if stop > start:
+                self._write_frames(words[start:stop], stop - start)
+            sent += batch
+
+    def _encode(self, commands, channels, values, codes: bool = False) -> np.ndarray:
+        """Encodes command words with encode_words, going through the waveform cache if there is one"""
+        if self._waveform_cache is None:
+            return DAC8568.encode_words(commands, channels, values, codes=codes)
+        return self._waveform_cache.get_or_encode(commands, channels, values, DAC8568.encode_words, codes=codes)
+
+    def internal_reference_on(self) -> None:
+        """Turns the internal reference on (2.5V). There should be no external reference connected when this occurs
+        or it may damage the board"""
+        self._write(DAC8568.to_bytes(0x090A0000))
+
+    def software_reset(self) -> None:
+        """Resets the software in the DAC"""
+        self._write(DAC8568.to_bytes(0x07000000))
+
+    def clear_all_to_zero(self) -> None:
+        """Sets all outputs registers to 0"""
+        self._write(DAC8568.to_bytes(0x05000000))
+
+    def clear_all_to_mid(self) -> None:
+        """Sets all output registers to half way between 0 and maximum"""
+        self._write(DAC8568.to_bytes(0x05000001))
+
+    def clear_all_to_full(self) -> None:
+        """Sets all output registers to their maximum value"""
+        self._write(DAC8568.to_bytes(0x05000002))
+
+    def write_to_register(self, channel: str, value: float) -> None:
+        """Loads a value to the buffer but doesn't update the output
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param value: A value between 0 (inclusive) and 1(inclusive) that outputs a value proportional to the reference
+            voltage
+        """
+        self._write(DAC8568._make_word(command="WRITE", channel=channel, value=value))
+
+    def write_and_update(self, channel: str, value: float):
+        """Loads a value to the buffer and update the output for the selected channel
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param value: A value between 0 (inclusive) and 1(inclusive) that outputs a value proportional to the reference
+            voltage
+        """
+        self._write(DAC8568._make_word(command="WRITE_AND_UPDATE", channel=channel, value=value))
+
+    def write_and_update_all(self, channel: str, value: float):
+        """Loads a value to the buffer and update the outputs for all channels
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param value: A value between 0 (inclusive) and 1(inclusive) that outputs a value proportional to the reference
+            voltage
+        """
+        self._write(DAC8568._make_word(command="WRITE_AND_UPDATE_ALL", channel=channel, value=value))
+
+    def stream_waveform(self, channel: str, samples, command: str = "WRITE_AND_UPDATE",
+                        chunk_size: int = 4096, scheduler=None, codes: bool = False) -> None:
+        """Plays back a waveform on a single channel. The whole waveform is encoded into one contiguous buffer before
+        anything is sent, so the time between samples is only limited by the bus.
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param samples: Array of values between 0 (inclusive) and 1(inclusive) that are output one after the other
+        :param command: The command used for each sample. Defaults to "WRITE_AND_UPDATE".
+        :param chunk_size: Number of samples sent to the interface board per chunk, in one USB write with
+            transport.FtdiSPITransport
+        :param scheduler: Optional sampleScheduler.SampleScheduler that paces the samples to a sample rate. Without it
+            samples are sent as fast as the bus allows.
+        :param codes: If true, samples are 16 bit integer DAC codes instead of values between 0 and 1
+        """
+        words = self._encode(command, channel, samples, codes)
+        if scheduler is None:
+            self._write_frames(words, chunk_size)
+        else:
+            self._write_paced(words, DAC8568._sample_offsets(len(words), 1), scheduler, chunk_size)
+
+    def set_channels(self, values, delta: bool = False, codes: bool = False) -> None:
+        """Loads new values for several channels and updates their outputs at the same time. All input registers are
+        written with the "WRITE" command and then committed together with a single "UPDATE" of all channels, so the
+        outputs don't glitch one after the other.
+
+        :param values: Either a dict that maps channel characters to values, ex. {"A": 0.1, "H": 0.9}, or an array of 8
+            values for channels "A" to "H". Values are between 0 (inclusive) and 1(inclusive).
+        :param delta: If true, only the channels whose value differs from the last value written in delta mode are
+            written (see stream_frames)
+        :param codes: If true, the values are 16 bit integer DAC codes instead of values between 0 and 1
+        """
+        if isinstance(values, dict):
+            channels = list(values.keys())
+            frame = np.asarray(list(values.values()))
+        else:
+            channels = DAC8568._OUTPUTS
+            frame = np.asarray(values)
+            assert frame.shape == (len(channels),), "Expected one value for each of the 8 channels"
+        if delta:
+            self.stream_frames(frame[np.newaxis, :], channels=channels, delta=True, codes=codes)
+        else:
+            words = self._encode_frames(channels, frame[np.newaxis, :], codes)
+            self._write_frames(words, len(words))
+
+    def stream_frames(self, frames, channels=_OUTPUTS, chunk_size: int = 4096, scheduler=None,
+                      delta: bool = False, codes: bool = False) -> None:
+        """Plays back a multi-channel waveform frame by frame. For every frame the input registers of all channels are
+        written and then updated together, like set_channels. All frames are encoded into one buffer before anything is
+        sent.
+
+        In delta mode the DAC keeps a shadow copy of the output codes. Only the channels whose code differs from the
+        previous frame (or from the shadow copy, for the first frame) are written, followed by one "UPDATE" of all
+        channels, and frames where nothing changes send nothing at all. This cuts the traffic of waveforms where most
+        channels hold their value, ex. staircases. Any write outside of delta mode clears the shadow copy, so the
+        first delta frame after it writes every channel.
+
+        :param frames: An N x len(channels) array. Row i holds the values of every channel for frame i.
+        :param channels: The channel characters that correspond to the columns of frames. Defaults to "A" to "H".
+        :param chunk_size: Number of frames sent to the interface board per chunk
+        :param scheduler: Optional sampleScheduler.SampleScheduler that paces the frames to a frame rate
+        :param delta: If true, only the channels that changed are written
+        :param codes: If true, frames holds 16 bit integer DAC codes instead of values between 0 and 1
+        """
+        frames = np.asarray(frames)
+        assert frames.ndim == 2 and frames.shape[1] == len(channels), \
+            "Expected frames of shape (N, {})".format(len(channels))
+        words, offsets, shadow = self._frame_words(channels, frames, delta, codes)
+        if scheduler is None:
+            for start in range(0, len(frames), chunk_size):
+                begin, end = offsets[start], offsets[min(start + chunk_size, len(frames))]
+                if end > begin:
+                    self._write_frames(words[begin:end], end - begin)
+        else:
+            self._write_paced(words, offsets, scheduler, chunk_size)
+        self._shadow = shadow
+
+    def _frame_words(self, channels, frames: np.ndarray, delta: bool, codes: bool):
+        """Encodes frames like stream_frames does, without sending them
+
+        :return: (command words, index of the first word of each frame followed by len(words), the shadow copy of the
+            output codes once the words are written)
+        """
+        if not delta:
+            words = self._encode_frames(channels, frames, codes)
+            shadow = np.full(len(DAC8568._OUTPUTS), -1, dtype=np.int64)
+            return words, DAC8568._sample_offsets(len(words), len(channels) + 1), shadow
+
+        shadow = self._shadow.copy()  # The other channels keep their codes, writing clears self._shadow
+        if len(frames) == 0:
+            return np.empty(0, dtype=">u4"), np.zeros(1, dtype=np.int64), shadow
+        addresses = [DAC8568._OUTPUTS.index(channel) for channel in channels]
+        assert len(set(addresses)) == len(addresses), "Each channel can only appear once"
+        codes = DAC8568._values_to_data_bits(frames, codes)
+
+        previous = np.vstack((shadow[addresses][np.newaxis, :], codes[:-1]))
+        changed = codes != previous
+        keep = np.hstack((changed, changed.any(axis=1)[:, np.newaxis]))
+        words = DAC8568.encode_frames(channels, codes, codes=True).reshape(keep.shape)[keep]
+        offsets = np.concatenate(([0], np.cumsum(keep.sum(axis=1))))
+        shadow[addresses] = codes[-1]
+        return words, offsets, shadow
+
+    def _encode_frames(self, channels, frames: np.ndarray, codes: bool = False) -> np.ndarray:
+        """Encodes frames as one "WRITE" word per channel followed by an "UPDATE" of all channels
+
+        :param channels: The channel characters that correspond to the columns of frames
+        :param frames: An N x len(channels) array of values
+        :param codes: If true, frames holds 16 bit integer DAC codes
+        :returns: A flat array of N * (len(channels) + 1) command words
+        """
+        return self._encode(*DAC8568._frame_arguments(channels, frames), codes=codes).ravel()
+
+    @staticmethod
+    def encode_frames(channels, frames, codes: bool = False) -> np.ndarray:
+        """Static version of _encode_frames that doesn't go through a waveform cache
+
+        :param channels: The channel characters that correspond to the columns of frames
+        :param frames: An N x len(channels) array of values
+        :param codes: If true, frames holds 16 bit integer DAC codes
+        :returns: A flat array of N * (len(channels) + 1) command words
+        """
+        return DAC8568.encode_words(*DAC8568._frame_arguments(channels, np.asarray(frames)), codes=codes).ravel()
+
+    @staticmethod
+    def _frame_arguments(channels, frames: np.ndarray):
+        """The commands, addresses and values that encode_words needs to encode frames"""
+        commands = ["WRITE"] * len(channels) + ["UPDATE"]
+        addresses = list(channels) + ["ALL"]
+        values = np.hstack((frames, np.zeros((frames.shape[0], 1), dtype=frames.dtype)))
+        return commands, addresses, values
+
+    def stream_file(self, waveform, chunk_size: int = 4096, scheduler=None) -> None:
+        """Plays back a waveform file once, from start to end. Files of encoded words are sent straight from the memory
+        map without copies, files of values are encoded one chunk at a time.
+
+        :param waveform: A waveformFile.WaveformFile
+        :param chunk_size: Number of frames sent to the interface board per chunk
+        :param scheduler: Optional sampleScheduler.SampleScheduler that paces the frames to a frame rate
+        """
+        for start in range(0, waveform.frame_count, chunk_size):
+            words = waveform.words(start, start + chunk_size)
+            if scheduler is None:
+                self._write_frames(words, len(words))
+            else:
+                offsets = DAC8568._sample_offsets(len(words), waveform.words_per_frame)
+                self._write_paced(words, offsets, scheduler, chunk_size)
+
+    def _powers_to_values(self, channels, powers) -> np.ndarray:
+        """Looks up the DAC values for target powers, one channel per column of powers"""
+        assert self.calibration is not None, "The DAC has no calibration"
+        return self.calibration.to_values(channels, powers)
+
+    def stream_power(self, channel: str, powers, chunk_size: int = 4096, scheduler=None) -> None:
+        """Like stream_waveform, but takes target optical powers. They are converted to DAC values with the inverse of
+        the calibration table of the channel, for the whole array at once.
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param powers: Array of target powers in the unit the channel was calibrated in, or a single power
+        :param chunk_size: Number of samples sent to the interface board per chunk
+        :param scheduler: Optional sampleScheduler.SampleScheduler that paces the samples to a sample rate
+        """
+        powers = np.atleast_1d(np.asarray(powers, dtype=np.float64))
+        values = self._powers_to_values([channel], powers[:, np.newaxis])[:, 0]
+        self.stream_waveform(channel=channel, samples=values, chunk_size=chunk_size, scheduler=scheduler)
+
+    def stream_power_frames(self, frames, channels=_OUTPUTS, chunk_size: int = 4096, scheduler=None) -> None:
+        """Like stream_frames, but takes target optical powers that are converted with the calibration
+
+        :param frames: An N x len(channels) array of target powers
+        :param channels: The channel characters that correspond to the columns of frames. Defaults to "A" to "H".
+        :param chunk_size: Number of frames sent to the interface board per chunk
+        :param scheduler: Optional sampleScheduler.SampleScheduler that paces the frames to a frame rate
+        """
+        self.stream_frames(self._powers_to_values(channels, frames), channels=channels, chunk_size=chunk_size,
+                           scheduler=scheduler)
+
+    def set_channel_powers(self, powers: dict) -> None:
+        """Like set_channels, but takes target optical powers that are converted with the calibration
+
+        :param powers: A dict that maps channel characters to target powers, ex. {"A": 1e-3}
+        """
+        channels = list(powers.keys())
+        values = self._powers_to_values(channels, [list(powers.values())])[0]
+        self.set_channels(dict(zip(channels, values.tolist())))
+
+    def update_channel(self, channel: str):
+        """Takes the value in the buffer for the selected channel and loads it
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        """
+        self._write(DAC8568._make_word(command="UPDATE", channel=channel))
+
+    def write_to_ldac_register(self, channels: list):
+        """Sets the LDAC register (command 0b0110). The selected channels ignore the LDAC pin.
+
+        :param channels: List of channel characters, ex. ["A", "B"] or ["ALL"]
+        """
+        channels_byte = DAC8568._channels_to_byte(channels)
+        word = DAC8568.to_bytes(0x06000000 | channels_byte)
+        self._write(word)
+
+    def power_up_dac(self, channels: list):
+        """Powers up the selected channels (command 0b0100 with the power down bits cleared)
+
+        :param channels: List of channel characters, ex. ["A", "B"] or ["ALL"]
+        """
+        channels_byte = DAC8568._channels_to_byte(channels)
+        word = DAC8568.to_bytes(0x04000000 | channels_byte)
+        self._write(word)
+
+    @staticmethod
+    def to_bytes(word: int) -> bytearray:
+        """ Converts an integer to an array of 8-bit bytes with length 4 that can be processed by busio.SPI write
+        for the Ti DA8568
+
+        :param word: Integer with 32 bits. Raises assertion error when more significant bits are present
+        :returns: A length 4 array of 8-bits bytes that represent the value of word
+        """
+        assert (word & ~0xFFFFFFFF == 0), "word is too long for 32 bits"
+        return word.to_bytes(4, byteorder="big", signed=False)
+
+    @staticmethod
+    def _make_word_from_bits(prefix_bits: int, control_bits: int, address_bits: int, data_bits: int,
+                             feature_bits: int) -> int:
+        """Make a word for setting DAC register values"""
+        assert (prefix_bits & ~0b1111 == 0)
+        assert (control_bits & ~0b1111 == 0)
+        assert (address_bits & ~0b1111 == 0)
+        assert (data_bits & ~(2 ** 16 - 1) == 0)
+        assert (feature_bits & ~0b1111 == 0)
+        word = prefix_bits << 28 | control_bits << 24 | address_bits << 20 | data_bits << 4 | feature_bits
+        return DAC8568.to_bytes(word)
+
+    @staticmethod
+    def _make_word(command: str, channel: str, value: float):
+        """"""
+        assert channel in DAC8568._CHANNEL.keys(), "Invalid channel: {}".format(channel)
+        return DAC8568._make_word_from_bits(prefix_bits=0,
+                                            control_bits=DAC8568._COMMAND[command],
+                                            address_bits=DAC8568._CHANNEL[channel],
+                                            data_bits=DAC8568._float_to_int(value),
+                                            feature_bits=0)
+
+    @staticmethod
+    def encode_words(commands, channels, values, codes: bool = False) -> np.ndarray:
+        """Vectorized equivalent of _make_word. Encodes arrays of commands, channels and values into DAC command words
+        in one shot. The three arguments are broadcast against each other, so any of them may be a single value.
+
+        :param commands: Command name(s) from _COMMAND, ex. "WRITE", or their integer control bits
+        :param channels: Channel name(s) from _CHANNEL, ex. "A" or "H", or their integer address bits
+        :param values: Values between 0 (inclusive) and 1 (inclusive), whatever their dtype
+        :param codes: If true, values are integers that already hold the 16 bit DAC code
+        :returns: An array of big-endian 32 bit words. Call tobytes() on it to get the buffer that is sent to the DAC.
+        """
+        control_bits = DAC8568._lookup_bits(DAC8568._COMMAND, commands)
+        address_bits = DAC8568._lookup_bits(DAC8568._CHANNEL, channels)
+        data_bits = DAC8568._values_to_data_bits(values, codes)
+        words = control_bits << 24 | address_bits << 20 | data_bits << 4
+        return np.ascontiguousarray(words, dtype=">u4")
+
+    @staticmethod
+    def _lookup_bits(table: dict, keys) -> np.ndarray:
+        """Maps an array of names from a lookup table (_COMMAND or _CHANNEL) to their bits
+
+        :param table: The lookup table
+        :param keys: A name, an array of names or an array of integer bits
+        :returns: An array of uint32 bits with the same shape as keys
+        """
+        keys = np.asarray(keys)
+        if keys.dtype.kind in "iu":
+            assert np.all(np.isin(keys, list(table.values()))), "Invalid bits: {}".format(keys)
+            return keys.astype(np.uint32)
+
+        names, inverse = np.unique(keys, return_inverse=True)
+        for name in names:
+            assert name in table.keys(), "Invalid key: {}".format(name)
+        bits = np.array([table[name] for name in names], dtype=np.uint32)
+        return bits[inverse].reshape(keys.shape)
+
+    @staticmethod
+    def _values_to_data_bits(values, codes: bool = False) -> np.ndarray:
+        """Vectorized equivalent of _float_to_int
+
+        :param values: Values from 0 (inclusive) to 1 (inclusive), or integers from 0 to 2**16 - 1 if codes is true
+        :param codes: If true, values are 16 bit DAC codes and are only range checked
+        :returns: An array of uint32 holding the 16 bit codes
+        """
+        values = np.asarray(values)
+        if codes:
+            assert values.dtype.kind in "iu", "DAC codes must be integers"
+            assert np.all((values >= 0) & (values <= 2 ** 16 - 1)), "Codes are out of range"
+            return values.astype(np.uint32)
+
+        values = values.astype(np.float64, copy=False)
+        assert np.all((values >= 0.) & (values <= 1.)), "Values are out of range"
+        return (values * (2 ** 16 - 1)).astype(np.uint32)
+
+    @staticmethod
+    def _channels_to_byte(channels: list):
+        channel_byte = 0
+        if "H" in channels:
+            channel_byte |= 0b10000000
+        if "G" in channels:
+            channel_byte |= 0b01000000
+        if "F" in channels:
+            channel_byte |= 0b00100000
+        if "E" in channels:
+            channel_byte |= 0b00010000
+        if "D" in channels:
+            channel_byte |= 0b00001000
+        if "C" in channels:
+            channel_byte |= 0b00000100
+        if "B" in channels:
+            channel_byte |= 0b00000010
+        if "A" in channels:
+            channel_byte |= 0b00000001
+        if "ALL" in channels:
+            channel_byte |= 0b11111111
+        return channel_byte
+
+    @staticmethod
+    def _float_to_int(value: float) -> int:
+        """Takes a floating point value between [0, 1] and converts it to a 16bit integer
+
+        :param value: a value from 0 (inclusive) to 1 (inclusive)
+        :returns: a 16 bit scaled value of value
+        """
+
+        assert 0. <= value <= 1., "Value: {} is out of range".format(value)
+        return int(value * (2 ** 16 - 1))
+
+
+if __name__ == '__main__':
+
+
+
+    assert (os.environ["BLINKA_FT232H"] == '1')
+
+    dac_instance = DAC8568(baud_rate=100000)
@@ -0,0 +1,203 @@
+import glob
+import os
+import queue
+import threading
+import time
+from typing import Sequence
+
+import numpy as np
+
+_SEGMENT_NAME = "segment_{:06d}.npy"
+
+
+class MeasurementRecorder:
+    """
+    Appends timestamped readings, ex. from KEYSIGHT81634B.get_power or TSL510.get_power_true, to memory-mapped .npy
+    segment files in a directory. Readings are collected in a small preallocated buffer in RAM. Full buffers are handed
+    to a background thread that copies them into the current segment, so the acquisition loop never waits on disk I/O
+    unless the disk can't keep up, and the memory use stays the same however long the capture runs.
+
+    Each record has a "time" field (seconds since the epoch) and one float field for each name in fields.
+
+    Example::
+
+        with MeasurementRecorder("capture", fields=("power",)) as recorder:
+            while running:
+                recorder.record(meter.get_power())
+        data = MeasurementRecorder.load("capture")
+    """
+
+    def __init__(self, directory: str, fields: Sequence[str] = ("value",), segment_size: int = 1000000,
+                 buffer_size: int = 10000, buffers: int = 2):
+        """
+        :param directory: Directory for the segment files. It is created if needed and must not contain segments.
+        :param fields: Names of the values in each record
+        :param segment_size: Number of records per segment file
+        :param buffer_size: Number of records per RAM buffer
+        :param buffers: Number of RAM buffers. record blocks when all of them are waiting to be written.
+        """
+        assert segment_size > 0 and buffer_size > 0 and buffers > 0, "Sizes must be positive"
+        os.makedirs(directory, exist_ok=True)
+        if glob.glob(os.path.join(directory, "segment_*.npy")):
+            raise FileExistsError("{} already contains a recording".format(directory))
+
+        self.directory = directory
+        self.dtype = np.dtype([("time", np.float64)] + [(name, np.float64) for name in fields])
+        self._segment_size = segment_size
+
+        self._free = queue.Queue()
+        for _ in range(buffers):
+            self._free.put(np.empty(buffer_size, dtype=self.dtype))
+        self._full = queue.Queue()
+        self._buffer = self._free.get()
+        self._count = 0  # Records in self._buffer
+
+        self._segment = None
+        self._segment_index = -1
+        self._segment_count = 0  # Records in self._segment
+        self._error = None
+        self.records = 0  # Records handed to the recorder
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def record(self, *values: float, timestamp: float = None) -> None:
+        """
+        Appends one record.
+
+        :param values: One value for each field
+        :param timestamp: Time of the reading in seconds since the epoch. Defaults to now.
+        """
+        self._buffer[self._count] = (time.time() if timestamp is None else timestamp,) + values
+        self._count += 1
+        self.records += 1
+        if self._count == len(self._buffer):
+            self._hand_off()
+
+    def record_many(self, timestamps, values) -> None:
+        """
+        Appends a block of records, ex. the result of KEYSIGHT81634B.log_power.
+
+        :param timestamps: Array of N times in seconds since the epoch
+        :param values: An N x len(fields) array, or an array of N values if there is a single field
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(timestamps), -1)
+        names = self.dtype.names
+        start = 0
+        while start < len(timestamps):
+            n = min(len(timestamps) - start, len(self._buffer) - self._count)
+            block = self._buffer[self._count:self._count + n]
+            block["time"] = timestamps[start:start + n]
+            for column, name in enumerate(names[1:]):
+                block[name] = values[start:start + n, column]
+            self._count += n
+            self.records += n
+            start += n
+            if self._count == len(self._buffer):
+                self._hand_off()
+
+    def flush(self) -> None:
+        """Hands the partly filled buffer to the writer and waits until everything recorded so far is on disk"""
+        if self._count:
+            self._hand_off()
+        self._full.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Writes the remaining records, stops the writer thread and trims the last segment to its real length. The writer
+        is stopped and the segment trimmed even if writing failed, and the error is raised after that.
+        """
+        try:
+            self.flush()
+        finally:
+            self._full.put(None)
+            self._writer.join()
+            self._trim_segment()
+        self._raise_error()
+
+    def __enter__(self) -> "MeasurementRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def load(directory: str, mmap: bool = True) -> np.ndarray:
+        """
+        Reads a recording back.
+
+        :param directory: Directory the recording was written to
+        :param mmap: If true and there is a single segment, it is returned memory-mapped instead of read into RAM
+        :return: Structured array of all records
+        """
+        paths = sorted(glob.glob(os.path.join(directory, "segment_*.npy")))
+        segments = [np.load(path, mmap_mode="r" if mmap else None) for path in paths]
+        if len(segments) == 1:
+            return segments[0]
+        return np.concatenate(segments) if segments else np.empty(0)
+
+    def _hand_off(self) -> None:
+        """Queues the current buffer for writing and continues in a free one"""
+        self._raise_error()
+        self._full.put((self._buffer, self._count))
+        self._buffer = self._free.get()
+        self._count = 0
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Writing the recording failed") from self._error
+
+    def _write_loop(self) -> None:
+        """Writer thread: copies full buffers into the segment files"""
+        while True:
+            item = self._full.get()
+            if item is None:
+                self._full.task_done()
+                return
+            buffer, count = item
+            try:
+                if self._error is None:
+                    self._write(buffer[:count])
+            except Exception as error:
+                self._error = error
+            finally:
+                self._free.put(buffer)
+                self._full.task_done()
+
+    def _write(self, records: np.ndarray) -> None:
+        start = 0
+        while start < len(records):
+            if self._segment is None or self._segment_count == self._segment_size:
+                self._next_segment()
+            n = min(len(records) - start, self._segment_size - self._segment_count)
+            self._segment[self._segment_count:self._segment_count + n] = records[start:start + n]
+            self._segment_count += n
+            start += n
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, _SEGMENT_NAME.format(index))
+
+    def _next_segment(self) -> None:
+        """Closes the current segment and preallocates the next one"""
+        if self._segment is not None:
+            self._segment.flush()
+        self._segment_index += 1
+        self._segment = np.lib.format.open_memmap(self._segment_path(self._segment_index), mode="w+",
+                                                  dtype=self.dtype, shape=(self._segment_size,))
+        self._segment_count = 0
+
+    def _trim_segment(self) -> None:
+        """Rewrites the last segment with only the records that were written to it"""
+        if self._segment is None:
+            return
+        self._segment.flush()
+        if self._segment_count < self._segment_size:
+            path = self._segment_path(self._segment_index)
+            # Written through a file object, so np.save doesn't append .npy and load never picks up a leftover
+            with open(path + ".tmp", "wb") as file:
+                np.save(file, self._segment[:self._segment_count])
+            del self._segment
+            os.replace(path + ".tmp", path)
+        self._segment = None
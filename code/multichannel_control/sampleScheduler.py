@@ -0,0 +1,131 @@
+import bisect
+import time
+from typing import NamedTuple, Tuple
+
+
+class SchedulerStats(NamedTuple):
+    """Summary of how well a waveform kept to its requested sample rate"""
+    requested_rate: float  # Samples per second that were asked for
+    achieved_rate: float  # Samples per second that were actually sent
+    samples: int  # Number of samples sent
+    batches: int  # Number of times the scheduler released samples
+    late_samples: int  # Samples sent more than the late tolerance after their deadline
+    mean_jitter: float  # Mean lateness of each batch in seconds
+    max_jitter: float  # Largest lateness of a batch in seconds
+    jitter_histogram: Tuple[Tuple[float, int], ...]  # (upper bin edge in seconds, number of batches) pairs
+
+
+class SampleScheduler:
+    """
+    Paces writes to a sample rate. Sample i is due at start + i / sample_rate, measured with time.perf_counter_ns.
+    Before each write the caller asks the scheduler how many samples to send: the scheduler sleeps until the next
+    deadline and, if the caller has fallen behind, releases every sample that is already due in one batch so the
+    waveform catches up instead of drifting.
+
+    Example::
+
+        scheduler = SampleScheduler(sample_rate=1000)
+        sent = 0
+        while sent < len(samples):
+            n = scheduler.wait(len(samples) - sent)
+            write(samples[sent:sent + n])
+            sent += n
+        print(scheduler.stats())
+    """
+
+    # Upper edges of the jitter histogram bins in nanoseconds
+    _HISTOGRAM_EDGES_NS = (1000, 10000, 100000, 1000000, 10000000, 100000000, float("inf"))
+
+    def __init__(self, sample_rate: float, late_tolerance: float = None, spin_time: float = 0.001):
+        """
+        :param sample_rate: Requested number of samples per second
+        :param late_tolerance: A sample is counted as late when it is sent more than this many seconds after its
+            deadline. Defaults to one sample period.
+        :param spin_time: The last part of each wait, in seconds, is spent busy waiting instead of sleeping because
+            time.sleep is not precise enough for short periods
+        """
+        assert sample_rate > 0, "sample_rate must be positive"
+        self.sample_rate = sample_rate
+        self._period_ns = 1e9 / sample_rate
+        self._late_tolerance_ns = self._period_ns if late_tolerance is None else late_tolerance * 1e9
+        self._spin_time_ns = spin_time * 1e9
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the statistics. The first sample after a reset is due immediately."""
+        self._start_ns = None
+        self._last_ns = None
+        self._samples = 0
+        self._batches = 0
+        self._late_samples = 0
+        self._jitter_sum_ns = 0
+        self._jitter_max_ns = 0
+        self._histogram = [0] * len(SampleScheduler._HISTOGRAM_EDGES_NS)
+
+    def rebase(self) -> None:
+        """Moves the deadlines so the next sample is due now, ex. after a pause. The statistics are kept."""
+        if self._start_ns is not None:
+            self._start_ns = time.perf_counter_ns() - self._samples * self._period_ns
+
+    def wait(self, max_samples: int) -> int:
+        """
+        Blocks until the next sample is due and returns how many samples should be sent now. The scheduler assumes
+        that exactly that many samples are sent before the next call.
+
+        :param max_samples: Largest batch the caller is able to send
+        :return: Number of samples to send, between 1 and max_samples
+        """
+        assert max_samples > 0, "max_samples must be positive"
+        if self._start_ns is None:
+            self._start_ns = time.perf_counter_ns()
+        deadline = self._start_ns + self._samples * self._period_ns
+
+        now = time.perf_counter_ns()
+        if now < deadline:
+            self._sleep_until(deadline)
+            now = time.perf_counter_ns()
+
+        due = int((now - self._start_ns) // self._period_ns) + 1 - self._samples
+        batch = max(1, min(due, max_samples))
+        self._record(now, now - deadline, batch)
+        return batch
+
+    def _sleep_until(self, deadline_ns: float) -> None:
+        """Sleeps until shortly before the deadline and spins for the rest"""
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining > self._spin_time_ns:
+            time.sleep((remaining - self._spin_time_ns) / 1e9)
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+
+    def _record(self, now_ns: int, lateness_ns: float, batch: int) -> None:
+        """Updates the statistics for a batch whose first sample was sent lateness_ns after its deadline"""
+        lateness_ns = max(0., lateness_ns)
+        if lateness_ns > self._late_tolerance_ns:
+            # Sample k of the batch is (lateness - k * period) late
+            self._late_samples += min(batch, int((lateness_ns - self._late_tolerance_ns) // self._period_ns) + 1)
+        self._jitter_sum_ns += lateness_ns
+        self._jitter_max_ns = max(self._jitter_max_ns, lateness_ns)
+        self._histogram[bisect.bisect_left(SampleScheduler._HISTOGRAM_EDGES_NS, lateness_ns)] += 1
+        self._samples += batch
+        self._batches += 1
+        self._last_ns = now_ns
+
+    def stats(self) -> SchedulerStats:
+        """
+        :return: Statistics for the samples released since the last reset
+        """
+        if self._batches == 0:
+            achieved_rate = 0.
+        else:
+            elapsed_ns = self._last_ns - self._start_ns + self._period_ns
+            achieved_rate = self._samples / (elapsed_ns / 1e9)
+        return SchedulerStats(requested_rate=self.sample_rate,
+                              achieved_rate=achieved_rate,
+                              samples=self._samples,
+                              batches=self._batches,
+                              late_samples=self._late_samples,
+                              mean_jitter=self._jitter_sum_ns / self._batches / 1e9 if self._batches else 0.,
+                              max_jitter=self._jitter_max_ns / 1e9,
+                              jitter_histogram=tuple((edge / 1e9, count) for edge, count in
+                                                     zip(SampleScheduler._HISTOGRAM_EDGES_NS, self._histogram)))
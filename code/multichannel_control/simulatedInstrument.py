@@ -0,0 +1,80 @@
+import time
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+
+class SimulatedInstrument:
+    """
+    Stand-in for a pyvisa resource so the instrument classes can be exercised without a GPIB bus. Queries are answered
+    from a table of canned responses and every command is recorded.
+
+    Example::
+
+        inst = SimulatedInstrument({'*IDN?': 'SANTEC,TSL-510,14040011,0002.0085', ':POW:ACT?': '1.25'})
+    """
+
+    def __init__(self, responses: Dict[str, Union[str, Callable[[], str]]] = None, latency: float = 0.,
+                 compound_queries: bool = True, compound_timeout: bool = False):
+        """
+        :param responses: Maps query strings to their reply. A reply can also be a function that returns the reply.
+            Replies to binary queries (see query_binary_values) are sequences of numbers.
+        :param latency: Time in seconds that every query and write sleeps for, to model a bus round trip
+        :param compound_queries: If true, semicolon-joined queries are answered with semicolon-joined replies. If false
+            only the first query of a compound query is answered, like an instrument without support for them.
+        :param compound_timeout: If true, compound queries aren't answered at all and fail with pyvisa's timeout error.
+            Needs pyvisa.
+        """
+        self.compound_queries = compound_queries
+        self.compound_timeout = compound_timeout
+        self.responses = {} if responses is None else dict(responses)
+        self.latency = latency
+        self.timeout = 2000  # Milliseconds, like pyvisa resources
+        self.writes = []  # Every command written, in order
+        self.queries = []  # Every query sent, in order
+        self.clears = 0  # Number of device clears
+        self.closed = False
+
+    def write(self, command: str) -> None:
+        self._wait()
+        self.writes.append(command)
+
+    def query(self, command: str) -> str:
+        self._wait()
+        self.queries.append(command)
+        if command not in self.responses and ';' in command:
+            if self.compound_timeout:
+                from pyvisa.constants import StatusCode
+                from pyvisa.errors import VisaIOError
+                raise VisaIOError(StatusCode.error_timeout)
+            queries = command.split(';') if self.compound_queries else command.split(';')[:1]
+            return ';'.join(self._reply(query).strip() for query in queries) + '\n'
+        return self._reply(command)
+
+    def _reply(self, command: str) -> str:
+        """Looks up the reply to a single query"""
+        if command not in self.responses:
+            raise KeyError("No simulated response for query {}".format(command))
+        reply = self.responses[command]
+        return reply() if callable(reply) else reply
+
+    def query_binary_values(self, command: str, datatype: str = 'f', is_big_endian: bool = False,
+                            container=list):
+        """Answers a binary block query with the sequence of numbers in the responses table"""
+        self._wait()
+        self.queries.append(command)
+        return container(np.asarray(self._reply(command), dtype=np.dtype(datatype)))
+
+    def clear(self) -> None:
+        """Like a VISA device clear"""
+        self._wait()
+        self.clears += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    def _wait(self) -> None:
+        if self.closed:
+            raise RuntimeError("Simulated instrument is closed")
+        if self.latency:
+            time.sleep(self.latency)
@@ -0,0 +1,89 @@
+import time
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class StateCache:
+    """
+    Time-stamped cache of instrument settings. Values that were read from or written to an instrument are remembered
+    for ttl seconds: reads within that time are served from the cache, and writes that would not change the cached
+    value are skipped. Any error while talking to the instrument clears the cache, because its state is then unknown.
+    """
+
+    def __init__(self, ttl: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttl: Number of seconds a value stays valid. 0 disables caching, float("inf") never expires values.
+        :param clock: Function that returns the current time in seconds
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._values = {}  # key -> (value, time stamp)
+        self.hits = 0
+        self.misses = 0
+        self.skipped_writes = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        :return: The cached value for key, or default if there is none or it has expired
+        """
+        entry = self._values.get(key)
+        if entry is None or self._clock() - entry[1] >= self.ttl:
+            return default
+        return entry[0]
+
+    def read(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for key, or calls fetch to read it from the instrument and caches the result.
+
+        :param key: Name of the setting
+        :param fetch: Function that reads the setting from the instrument
+        :return: The value of the setting
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        try:
+            value = fetch()
+        except Exception:
+            self.invalidate()
+            raise
+        self.store(key, value)
+        return value
+
+    def write(self, key: Hashable, value: Any, send: Callable[[], None]) -> bool:
+        """
+        Calls send to write a setting to the instrument, unless the cache already holds the same value.
+
+        :param key: Name of the setting
+        :param value: New value of the setting
+        :param send: Function that writes the value to the instrument
+        :return: True if the value was written, False if the write was skipped
+        """
+        if self.get(key, _MISSING) == value:
+            self.skipped_writes += 1
+            return False
+
+        try:
+            send()
+        except Exception:
+            self.invalidate()
+            raise
+        self.store(key, value)
+        return True
+
+    def store(self, key: Hashable, value: Any) -> None:
+        """Records a value that is known to be the current state of the instrument"""
+        self._values[key] = (value, self._clock())
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Forgets the given settings, or every setting if no key is given.
+        """
+        if not keys:
+            self._values.clear()
+        for key in keys:
+            self._values.pop(key, None)
@@ -0,0 +1,66 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .lightSource import TSL510
+from .opticalPowerMeter import KEYSIGHT81634B
+
+
+class Spectrum(NamedTuple):
+    """Power readings and the wavelength each one was taken at"""
+    wavelength: np.ndarray  # nm
+    power: np.ndarray  # In the power unit of the meter
+
+
+def swept_spectrum(laser: TSL510, meter: KEYSIGHT81634B, start: float, stop: float, step: float, speed: float,
+                   averaging_time: float = None, timeout: float = None) -> Spectrum:
+    """
+    Measures a spectrum with a continuous laser sweep instead of setting the color point by point. The laser sends a
+    trigger output pulse every step, which must be wired to the trigger input of the power meter mainframe. The meter's
+    logging function takes one reading per pulse, and the whole block of readings is fetched once the sweep is done.
+
+    The laser's wavelength unit must be nm.
+
+    :param laser: The light source
+    :param meter: The power meter
+    :param start: Start wavelength in nm
+    :param stop: Stop wavelength in nm
+    :param step: Wavelength between readings in nm
+    :param speed: Sweep speed in nm/s
+    :param averaging_time: Averaging time of each reading in seconds. It has to be shorter than the time between
+        two trigger pulses (step / speed), and defaults to half of it.
+    :param timeout: Maximum time to wait for the sweep in seconds. Defaults to twice the sweep duration plus 5 seconds.
+    :return: The measured spectrum
+    :raise: TimeoutError if the meter doesn't receive all trigger pulses in time. The laser sweep is stopped if it is
+        still running, also on any other error.
+    """
+    assert stop > start, "stop must be larger than start"
+    assert not laser.get_wavelength_unit(), "The laser wavelength unit must be nm"
+
+    points = int(round((stop - start) / step)) + 1
+    step_time = step / speed
+    if averaging_time is None:
+        averaging_time = step_time / 2
+    assert averaging_time < step_time, "averaging_time must be shorter than step / speed ({} s)".format(step_time)
+    duration = (stop - start) / speed
+    if timeout is None:
+        timeout = 2 * duration + 5.
+
+    laser.configure_sweep(start, stop, speed, step)
+    meter.set_trigger_input(True)
+    sweep_started = False
+    try:
+        meter.configure_logging(points, averaging_time)
+        meter.start_logging()
+        sweep_started = True
+        laser.start_sweep()
+        meter.wait_for_logging(duration, timeout)
+        power = meter.fetch_logging()
+    finally:
+        try:
+            if sweep_started and laser.sweep_running():
+                laser.stop_sweep()
+        finally:
+            meter.set_trigger_input(False)
+
+    return Spectrum(wavelength=start + np.arange(len(power)) * step, power=power)
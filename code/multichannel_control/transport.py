@@ -0,0 +1,411 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import numpy as np
+
+
+class SPITransport(ABC):
+    """
+    Interface between the DAC8568 class and the bus that carries its command words. The DAC needs the chip-select line
+    to be released after every 32 bit word, so besides plain writes a transport has write_frames, which sends a buffer
+    of several words with one chip-select frame per word.
+    """
+
+    bus = None  # SPIBus shared with the transports of other chips on the same bus, None if the chip has its own
+
+    @abstractmethod
+    def write(self, buffer) -> None:
+        """
+        Sends a buffer in a single transaction, with the chip-select line held for all of it.
+
+        :param buffer: Bytes-like object
+        """
+
+    def write_frames(self, buffer, frame_size: int) -> None:
+        """
+        Sends a buffer of several frames, framing each one with the chip-select line. By default every frame is its own
+        transaction. Transports that can frame words themselves should override this and send the whole buffer at once.
+
+        :param buffer: Bytes-like object whose length is a multiple of frame_size
+        :param frame_size: Number of bytes per frame
+        """
+        view = memoryview(buffer).cast("B")
+        for start in range(0, len(view), frame_size):
+            self.write(view[start:start + frame_size])
+
+    def close(self) -> None:
+        """Releases the bus"""
+        pass
+
+
+class BusioSPITransport(SPITransport):
+    """
+    SPI through an Adafruit Blinka busio.SPI port, ex. on the FT232H board. Takes control of pins D0, D1, D3.
+
+    Blinka always opens the first FT232H it finds and has no chip-select of its own, so this transport can only drive
+    one DAC. Use FtdiSPITransport for several boards or several chips on one board.
+    """
+
+    def __init__(self, baud_rate: int):
+        """
+        :param baud_rate: Rate that data is sent from the controller to the DAC
+        """
+
+        # One of these libraries will throw an error when they are imporeted and the interface board isn't connected.
+        # That is why they are kept here instead of the head of the file.
+        import board
+        import busio
+
+        self._spi = busio.SPI(board.SCLK, board.MOSI, None)
+        while not self._spi.try_lock():
+            pass
+        self._spi.configure(baudrate=baud_rate, polarity=1, phase=1, bits=32)
+        self._spi.unlock()
+
+    def write(self, buffer) -> None:
+        self._spi.write(buffer)
+
+    def close(self) -> None:
+        self._spi.deinit()
+
+
+class SPIBus(ABC):
+    """
+    A bus shared by several chips, each with its own chip-select line and transport. write_samples sends the words of
+    several chips in one transfer, interleaved sample by sample, so that their outputs change together. A lock keeps
+    transfers of different threads from interleaving.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()  # Held while a transfer is written to the bus
+
+    def write_samples(self, parts, frame_size: int) -> None:
+        """
+        Sends the samples of several chips in one transfer. The frames of sample i of every chip, in the order of
+        parts, are sent before those of sample i + 1.
+
+        :param parts: A (transport, buffer, offsets) tuple for each chip on the bus. offsets holds the index of the
+            first frame of each sample in buffer followed by the index after its last frame, like the offsets of
+            DAC8568._write_paced. Every chip must have the same number of samples.
+        :param frame_size: Number of bytes per frame
+        """
+        transports, keys, data = [], [], []
+        samples = None
+        for owner, (transport, buffer, offsets) in enumerate(parts):
+            offsets = np.asarray(offsets)
+            assert samples is None or len(offsets) - 1 == samples, "Every chip must have the same number of samples"
+            samples = len(offsets) - 1
+            frames = np.frombuffer(memoryview(buffer).cast("B"), dtype=np.uint8).reshape(-1, frame_size)
+            transports.append(transport)
+            data.append(frames[offsets[0]:offsets[-1]])
+            sample = np.repeat(np.arange(samples), np.diff(offsets))  # Sample of each frame
+            keys.append(np.column_stack((sample, np.full(len(sample), owner))))
+        keys = np.concatenate(keys)
+        if len(keys) == 0:
+            return
+        order = np.lexsort((keys[:, 1], keys[:, 0]))  # By sample, then by chip. lexsort is stable.
+        with self.lock:
+            self._write_ordered(transports, keys[order, 1], np.concatenate(data)[order])
+
+    @abstractmethod
+    def _write_ordered(self, transports: list, owners: np.ndarray, data: np.ndarray) -> None:
+        """
+        Sends frames in one transfer, each with the chip-select line of its chip. Called with the lock held.
+
+        :param transports: The transports of the chips
+        :param owners: Index in transports of the chip of each frame
+        :param data: N x frame_size array with the bytes of each frame
+        """
+
+
+class _FtdiBus(SPIBus):
+    """
+    An FT232H board opened in MPSSE mode and shared by the FtdiSPITransport objects of all chips wired to it. Writes
+    are serialized with the lock, and every chip-select pin in use is driven high while its chip isn't selected.
+    """
+
+    _SCLK = 0x01  # Bit of pin D0
+    _MOSI = 0x02  # Bit of pin D1
+
+    _buses = {}  # type: Dict[str, _FtdiBus]
+    _buses_lock = threading.Lock()
+
+    def __init__(self, url: str, settings: tuple):
+        """
+        :param url: pyftdi URL of the board
+        :param settings: (baud_rate, polarity, phase) of the bus
+        """
+        super().__init__()
+        # pyftdi needs libusb, so it is only imported when a board is used
+        from pyftdi.ftdi import Ftdi
+
+        baud_rate, polarity, phase = settings
+        self.url = url
+        self.settings = settings
+        self.chip_selects = 0  # Bits of the chip-select pins of the transports that use the bus
+        self.clock_idle = _FtdiBus._SCLK if polarity else 0
+        self.set_bits = Ftdi.SET_BITS_LOW
+        self.write_command = Ftdi.WRITE_BYTES_PVE_MSB if polarity else Ftdi.WRITE_BYTES_NVE_MSB
+
+        self.ftdi = Ftdi()
+        # The MPSSE engine needs three clock phases per bit for phase 1, like pyftdi.spi does it
+        frequency = 3 * baud_rate / 2 if phase else baud_rate
+        self.ftdi.open_mpsse_from_url(url, direction=self.direction, initial=self.idle, frequency=frequency)
+        if phase:
+            self.ftdi.enable_3phase_clock(True)
+
+    @property
+    def direction(self) -> int:
+        """Pins driven by the board: clock, data and every chip-select line in use"""
+        return _FtdiBus._SCLK | _FtdiBus._MOSI | self.chip_selects
+
+    @property
+    def idle(self) -> int:
+        """Pin levels between frames: clock at its idle level and all chips deselected"""
+        return self.clock_idle | self.chip_selects
+
+    @staticmethod
+    def acquire(url: str, settings: tuple, cs: int) -> "_FtdiBus":
+        """
+        Opens the board at url, or joins the bus if it is already open, and starts driving chip-select pin cs high.
+
+        :param url: pyftdi URL of the board. Chips on the same board must use the same URL.
+        :param settings: (baud_rate, polarity, phase), which must match those of the other chips on the bus
+        :param cs: Bit of the chip-select pin
+        :return: The bus
+        """
+        with _FtdiBus._buses_lock:
+            bus = _FtdiBus._buses.get(url)
+            if bus is None:
+                bus = _FtdiBus(url, settings)
+                _FtdiBus._buses[url] = bus
+            assert bus.settings == settings, "All chips on a board must use the same baud rate, polarity and phase"
+            assert not bus.chip_selects & cs, "Another chip on the board already uses this chip-select pin"
+            with bus.lock:
+                bus.chip_selects |= cs
+                bus.ftdi.write_data(bytes((bus.set_bits, bus.idle, bus.direction)))
+            return bus
+
+    def release(self, cs: int) -> None:
+        """Stops driving chip-select pin cs, and closes the board once no chip uses it"""
+        with _FtdiBus._buses_lock:
+            with self.lock:
+                self.chip_selects &= ~cs
+            if not self.chip_selects:
+                _FtdiBus._buses.pop(self.url, None)
+                self.ftdi.close()
+
+    def frame_commands(self, data: np.ndarray, chip_selects: np.ndarray) -> bytes:
+        """
+        Builds the MPSSE commands that send each frame with its own chip-select frame: pull the chip-select line of
+        the frame low, clock out the frame, release chip select.
+
+        :param data: N x frame_size array with the bytes of each frame
+        :param chip_selects: Bit of the chip-select pin of each frame
+        :return: The command buffer
+        """
+        frame_size = data.shape[1]
+        commands = np.empty((len(data), 9 + frame_size), dtype=np.uint8)
+        commands[:, 0] = self.set_bits
+        commands[:, 1] = self.idle & ~np.asarray(chip_selects)
+        commands[:, 2] = self.direction
+        commands[:, 3:6] = [self.write_command, (frame_size - 1) & 0xFF, (frame_size - 1) >> 8]
+        commands[:, 6:6 + frame_size] = data
+        commands[:, 6 + frame_size:] = [self.set_bits, self.idle, self.direction]
+        return commands.tobytes()
+
+    def _write_ordered(self, transports: list, owners: np.ndarray, data: np.ndarray) -> None:
+        chip_selects = np.array([transport._cs for transport in transports])[owners]
+        self.ftdi.write_data(self.frame_commands(data, chip_selects))
+
+
+class FtdiSPITransport(SPITransport):
+    """
+    SPI through the MPSSE engine of an FT232H board, driven directly with pyftdi. Uses the same pins and SPI mode as
+    BusioSPITransport: D0 is the clock, D1 the data and D3 the chip-select line.
+
+    busio sends every write as its own USB transfer, so a stream of single-word frames is limited by the USB round
+    trip. Here write_frames builds the chip-select, clock and chip-select release commands of every frame of the buffer
+    into one MPSSE command buffer and hands that to the board in a single USB write, and the board toggles chip select
+    between the words by itself.
+
+    Boards are selected by their pyftdi URL. Several chips can share the clock and data lines of one board with a
+    chip-select pin each (D3 to D7). Their transports then share the opened board as their bus, see SPIBus.
+    """
+
+    def __init__(self, baud_rate: int, url: str = "ftdi://ftdi:232h/1", cs_pin: int = 3, polarity: int = 1,
+                 phase: int = 1):
+        """
+        :param baud_rate: Rate that data is sent from the controller to the DAC
+        :param url: pyftdi URL of the board, ex. "ftdi://ftdi:232h:FT1ABCDE/1" to select a board by serial number.
+            Transports of chips on the same board must use the same URL.
+        :param cs_pin: Pin (D3 to D7) that drives the chip-select line
+        :param polarity: Clock polarity. 1 means the clock idles high.
+        :param phase: Clock phase, as for busio.SPI.configure
+        """
+        assert 3 <= cs_pin <= 7, "The chip-select line must be on one of the pins D3 to D7"
+        self._cs = 1 << cs_pin
+        self.bus = _FtdiBus.acquire(url, (baud_rate, polarity, phase), self._cs)
+
+    def write(self, buffer) -> None:
+        view = memoryview(buffer).cast("B")
+        self.write_frames(view, len(view))
+
+    def write_frames(self, buffer, frame_size: int) -> None:
+        with self.bus.lock:
+            self.bus.ftdi.write_data(self._frame_commands(buffer, frame_size))
+
+    def _frame_commands(self, buffer, frame_size: int) -> bytes:
+        """
+        Builds the MPSSE commands that send each frame of buffer to this chip, see _FtdiBus.frame_commands.
+
+        :param buffer: Bytes-like object whose length is a multiple of frame_size
+        :param frame_size: Number of bytes per frame
+        :return: The command buffer
+        """
+        data = np.frombuffer(memoryview(buffer).cast("B"), dtype=np.uint8).reshape(-1, frame_size)
+        return self.bus.frame_commands(data, np.full(len(data), self._cs))
+
+    def close(self) -> None:
+        self.bus.release(self._cs)
+
+
+class SimulatedSPITransport(SPITransport):
+    """
+    Software stand-in for the FT232H board. It records every word that is written, keeps track of how long the
+    transfers would have taken on real hardware and can decode the recorded words back into DAC output voltages.
+    This makes it possible to test and benchmark the DAC stack without any hardware attached.
+
+    The modelled time of a transaction is transaction_latency + 8 * bytes / baud_rate.
+
+    Like the DAC, which only latches a word when chip select is released after it, write accepts exactly one 32 bit
+    word, so code that sends several words in one transaction fails instead of passing unnoticed.
+    """
+
+    def __init__(self, baud_rate: int = 100000, transaction_latency: float = 0.001, framed_transfers: bool = False,
+                 realtime: bool = False, bus: "SimulatedSPIBus" = None):
+        """
+        :param baud_rate: Modelled SPI clock rate
+        :param transaction_latency: Modelled fixed cost of each transaction in seconds, ex. one USB round trip
+        :param framed_transfers: If true, write_frames is modelled as a single transaction, like an interface that
+            can toggle chip select itself between words
+        :param realtime: If true, every write sleeps for its modelled time
+        :param bus: Optional SimulatedSPIBus shared with the transports of other simulated chips
+        """
+        self.bus = bus
+        self.baud_rate = baud_rate
+        self.transaction_latency = transaction_latency
+        self.framed_transfers = framed_transfers
+        self.realtime = realtime
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the recorded words and counters"""
+        self._data = bytearray()
+        self.transactions = 0
+        self.elapsed = 0.  # Modelled transfer time in seconds
+
+    def write(self, buffer) -> None:
+        assert len(memoryview(buffer).cast("B")) == 4, "The DAC only latches the first word of a transaction"
+        self._transfer(buffer)
+
+    def write_frames(self, buffer, frame_size: int) -> None:
+        if not self.framed_transfers:
+            super().write_frames(buffer, frame_size)
+            return
+        self._transfer(buffer)
+
+    def _transfer(self, buffer) -> None:
+        """Records one transaction"""
+        size = len(self._data)
+        self._data += buffer
+        duration = self.transaction_latency + 8 * (len(self._data) - size) / self.baud_rate
+        self.transactions += 1
+        self.elapsed += duration
+        if self.realtime:
+            time.sleep(duration)
+
+    @property
+    def bytes_written(self) -> int:
+        return len(self._data)
+
+    @property
+    def words(self) -> np.ndarray:
+        """All recorded 32 bit words in the order they were written"""
+        assert len(self._data) % 4 == 0, "A partial word was written"
+        return np.frombuffer(bytes(self._data), dtype=">u4").astype(np.uint32)
+
+    @staticmethod
+    def decode_words(words) -> Dict[str, np.ndarray]:
+        """
+        Splits command words into their fields.
+
+        :param words: Array of 32 bit words
+        :return: Dict with arrays "prefix", "control", "address", "data" and "feature"
+        """
+        words = np.asarray(words, dtype=np.uint32)
+        return {"prefix": words >> 28 & 0xF,
+                "control": words >> 24 & 0xF,
+                "address": words >> 20 & 0xF,
+                "data": words >> 4 & 0xFFFF,
+                "feature": words & 0xF}
+
+    def output_history(self, reference_voltage: float = 2.5, gain: float = 2.) -> np.ndarray:
+        """
+        Replays the recorded words through a model of the DAC registers.
+
+        :param reference_voltage: Reference voltage of the DAC. The internal reference is 2.5V.
+        :param gain: Output amplifier gain of the DAC
+        :return: An M x 8 array of output voltages for channels "A" to "H", with one row for every word that changed
+            at least one output
+        """
+        fields = SimulatedSPITransport.decode_words(self.words)
+        input_registers = np.zeros(8, dtype=np.int64)
+        dac_registers = np.zeros(8, dtype=np.int64)
+        history = []
+
+        for control, address, data in zip(fields["control"].tolist(), fields["address"].tolist(),
+                                          fields["data"].tolist()):
+            selected = slice(None) if address == 0b1111 else slice(address, address + 1)
+            previous = dac_registers.copy()
+            if control in (0b0000, 0b0010, 0b0011):  # WRITE, WRITE_AND_UPDATE_ALL, WRITE_AND_UPDATE
+                input_registers[selected] = data
+            if control in (0b0001, 0b0011):  # UPDATE, WRITE_AND_UPDATE
+                dac_registers[selected] = input_registers[selected]
+            elif control == 0b0010:
+                dac_registers[:] = input_registers
+            elif control == 0b0111:  # Software reset
+                input_registers[:] = 0
+                dac_registers[:] = 0
+            if not np.array_equal(previous, dac_registers):
+                history.append(dac_registers.copy())
+
+        codes = np.array(history, dtype=np.float64).reshape(-1, 8)
+        return codes / 2 ** 16 * reference_voltage * gain
+
+    def outputs(self, reference_voltage: float = 2.5, gain: float = 2.) -> np.ndarray:
+        """
+        :return: The current output voltages of channels "A" to "H" according to the recorded words
+        """
+        history = self.output_history(reference_voltage, gain)
+        return history[-1] if len(history) else np.zeros(8)
+
+
+class SimulatedSPIBus(SPIBus):
+    """
+    Software stand-in for a board with several chips on one bus. Each SimulatedSPITransport on the bus records the
+    words that a combined transfer sends to its chip, and the bus records the order in which the chips were selected.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.transactions = 0  # Combined transfers
+        self.selects = []  # Transport of every frame of the combined transfers, in the order they were sent
+
+    def _write_ordered(self, transports: list, owners: np.ndarray, data: np.ndarray) -> None:
+        self.transactions += 1
+        for owner, frame in zip(owners.tolist(), data):
+            transports[owner]._data += frame.tobytes()
+            self.selects.append(transports[owner])
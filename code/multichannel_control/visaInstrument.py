@@ -0,0 +1,128 @@
+from .stateCache import StateCache
+from .visaSessions import SessionState, get_registry
+
+
+def _visa_io_error():
+    """
+    :return: pyvisa.errors.VisaIOError for use in an except clause, or an empty tuple if pyvisa isn't installed. Then
+        no VISA I/O can fail, and pyvisa stays optional.
+    """
+    try:
+        from pyvisa.errors import VisaIOError
+    except ImportError:
+        return ()
+    return VisaIOError
+
+
+class VisaInstrument:
+    """
+    Base class of the instruments that are controlled with SCPI commands over a VISA session (TSL510, KEYSIGHT81634B,
+    KEYSIGHT8163B). It opens the session through a visaSessions.SessionRegistry, which shares it with the other objects
+    connected to the same instrument, and releases it again. Subclasses set _TARGET to the text that identifies the
+    instrument.
+
+    The settings cache belongs to the session (see visaSessions.SessionState), so objects that share a session also
+    share what they know about the instrument's settings.
+    """
+    _resource = None  # VISA session of the instrument, opened by connect
+    _registry = None  # Session registry that holds the state of _resource
+    _acquired = False  # True if connect acquired _resource from _registry, so close has to release it
+    _state = None  # visaSessions.SessionState of _resource, looked up on first use
+    _wrapper = None  # Optional function that wraps _resource for all I/O, ex. to measure it (see instrumentation)
+    _wrapped = None  # _resource wrapped by _wrapper, made on first use
+    _closed = False  # Set by close, after which the object can't be used
+
+    _TARGET = None  # Text to look for in the reply to '*IDN?'
+
+    def __init__(self, registry=None, cache_ttl: float = 1.0, resource=None):
+        """
+        Constructor doesn't talk to the instrument. The VISA session is opened by connect, which is called
+        automatically the first time the instrument is used.
+
+        :param registry: visaSessions.SessionRegistry to take the session from. Defaults to the process-wide registry.
+        :param cache_ttl: Number of seconds that settings such as units and ranges are cached for (see stateCache).
+            0 disables the cache. The cache is shared with the other objects that use the same session, and the
+            cache_ttl of the first of them applies.
+        :param resource: An already opened VISA resource to use instead of one from the registry, ex. a
+            simulatedInstrument.SimulatedInstrument
+        """
+        self._cache_ttl = cache_ttl
+        self._registry = registry
+        self._resource = resource
+
+    def connect(self) -> None:
+        """
+        Finds and connects to the VISA resource with _TARGET in its ID string. Does nothing if already connected.
+        The session is shared with other objects connected to the same instrument and its address is cached on disk, so
+        later connections don't need to scan the bus (see visaSessions and discovery).
+        Prints confirmation to STDOUT.
+
+        :raise: RuntimeError if cannot connect to the instrument or if the object has been closed
+        """
+        if self._closed:
+            raise RuntimeError("{} has been closed".format(type(self).__name__))
+        if self._resource is not None:
+            return
+        if self._registry is None:
+            self._registry = get_registry()
+        self._resource = self._registry.acquire(self._TARGET)
+        self._acquired = True
+        print("Connected to " + self._resource.query('*IDN?'))
+
+    @property
+    def _inst(self):
+        """The VISA session, wrapped by _wrapper if there is one. Connects first if needed."""
+        if self._resource is None:
+            self.connect()
+        if self._wrapper is None:
+            return self._resource
+        if self._wrapped is None:
+            self._wrapped = self._wrapper(self._resource)
+        return self._wrapped
+
+    @_inst.setter
+    def _inst(self, resource) -> None:
+        self._resource = resource
+        self._state = None
+        self._wrapped = None
+
+    @property
+    def _session(self) -> SessionState:
+        """The state of the VISA session, shared with the other objects that use it. Connects first if needed."""
+        if self._state is None:
+            if self._resource is None:
+                self.connect()
+            registry = get_registry() if self._registry is None else self._registry
+            self._state = registry.state(self._resource, self._cache_ttl)
+        return self._state
+
+    @property
+    def _cache(self) -> StateCache:
+        """The StateCache of settings that were read from or written to the instrument through the session"""
+        return self._session.cache
+
+    def close(self) -> None:
+        """
+        Releases the session. It is closed once no other object uses it. A resource passed to the constructor is left
+        open. Using the object afterwards raises RuntimeError instead of connecting again.
+        """
+        if self._resource is not None:
+            if self._acquired:
+                self._registry.release(self._TARGET)
+                self._acquired = False
+            self._resource = None
+            self._state = None
+            self._wrapped = None
+        self._closed = True
+
+    def get_errors(self) -> str:
+        """
+
+        :return: Returns the contents of the instrument’s error queue.
+        """
+        #:SYSTem:ERRor?
+        errors = self._inst.query(":SYST:ERR?")
+        if not errors.strip().lstrip('+').startswith('0'):
+            # The instrument reported an error, so the cached settings may not match what it is doing
+            self._cache.invalidate()
+        return errors
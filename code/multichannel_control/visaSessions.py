@@ -0,0 +1,141 @@
+import atexit
+import threading
+import weakref
+
+from .discovery import DEFAULT_CACHE_FILE, find_instrument
+from .stateCache import StateCache
+
+
+class SessionState:
+    """
+    What belongs to a VISA session rather than to one of the objects that use it. Several objects can talk to the
+    same instrument through one session, ex. a KEYSIGHT81634B and a KEYSIGHT8163B on the same mainframe, so what one
+    of them writes changes the settings that the others see.
+    """
+
+    def __init__(self, cache_ttl: float = 1.0):
+        """
+        :param cache_ttl: Number of seconds that settings are cached for
+        """
+        self.cache = StateCache(cache_ttl)  # Settings read from or written to the instrument
+        self.lock = threading.Lock()  # Held while a thread runs a sequence of commands that must not be interleaved
+        self.compound_queries = True  # Set to False when the instrument doesn't answer semicolon-joined queries
+
+
+class SessionRegistry:
+    """
+    Owns a single VISA ResourceManager and the sessions opened through it. Sessions are looked up by the text that
+    identifies the instrument (the target passed to discovery.find_instrument) and are reference counted, so several
+    objects that talk to the same instrument share one session and the bus is only scanned when an instrument is
+    opened for the first time.
+    """
+
+    def __init__(self, resource_manager_factory=None, cache_file=DEFAULT_CACHE_FILE):
+        """
+        :param resource_manager_factory: Function that creates the ResourceManager. Defaults to pyvisa.ResourceManager.
+            It is only called when the first session is opened.
+        :param cache_file: Address cache passed on to discovery.find_instrument. None disables the cache.
+        """
+        self._resource_manager_factory = resource_manager_factory
+        self._cache_file = cache_file
+        self._resource_manager = None
+        self._sessions = {}  # target -> [resource, reference count]
+        self._states = weakref.WeakKeyDictionary()  # resource -> SessionState
+        self._lock = threading.RLock()
+
+    @property
+    def resource_manager(self):
+        """The shared ResourceManager, created on first use"""
+        with self._lock:
+            if self._resource_manager is None:
+                if self._resource_manager_factory is None:
+                    import pyvisa
+                    self._resource_manager_factory = pyvisa.ResourceManager
+                self._resource_manager = self._resource_manager_factory()
+            return self._resource_manager
+
+    def acquire(self, target: str):
+        """
+        Returns the session for an instrument, opening it if this is the first user.
+
+        :param target: Text to look for in the reply to '*IDN?', ex. 'TSL-510'
+        :return: The opened resource
+        :raises: RuntimeError if no resource matches target
+        """
+        with self._lock:
+            session = self._sessions.get(target)
+            if session is None:
+                session = [find_instrument(self.resource_manager, target, cache_file=self._cache_file), 0]
+                self._sessions[target] = session
+            session[1] += 1
+            return session[0]
+
+    def release(self, target: str) -> None:
+        """
+        Gives up one reference to a session. The session is closed when the last reference is released.
+
+        :param target: The target the session was acquired with
+        """
+        with self._lock:
+            session = self._sessions.get(target)
+            if session is None:
+                return
+            session[1] -= 1
+            if session[1] <= 0:
+                del self._sessions[target]
+                self._states.pop(session[0], None)
+                session[0].close()
+
+    def state(self, resource, cache_ttl: float = 1.0) -> SessionState:
+        """
+        Returns the state shared by every object that uses a session, creating it for the first one. Resources that
+        were opened elsewhere, ex. a simulatedInstrument.SimulatedInstrument, get a state as well.
+
+        :param resource: The opened resource
+        :param cache_ttl: Number of seconds that settings are cached for, if the state is created by this call
+        :return: The state of the session
+        """
+        with self._lock:
+            state = self._states.get(resource)
+            if state is None:
+                state = SessionState(cache_ttl)
+                self._states[resource] = state
+            return state
+
+    def reference_count(self, target: str) -> int:
+        """
+        :return: Number of users of the session for target, 0 if it isn't open
+        """
+        with self._lock:
+            session = self._sessions.get(target)
+            return 0 if session is None else session[1]
+
+    def close_all(self) -> None:
+        """Closes every session and the ResourceManager"""
+        with self._lock:
+            for resource, _ in self._sessions.values():
+                try:
+                    resource.close()
+                except Exception:
+                    pass
+            self._sessions.clear()
+            self._states.clear()
+            if self._resource_manager is not None and hasattr(self._resource_manager, "close"):
+                self._resource_manager.close()
+            self._resource_manager = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SessionRegistry:
+    """
+    :return: The process-wide SessionRegistry. It is created on first use and closed when the interpreter exits.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SessionRegistry()
+            atexit.register(_registry.close_all)
+        return _registry
@@ -0,0 +1,103 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import numpy as np
+
+
+class WaveformCache:
+    """
+    Keeps encoded DAC waveforms in memory so that replaying the same ramp or sine only costs the bus transfer.
+    Entries are keyed on the command, channel and a hash of the sample array. When the total size of the cached buffers
+    goes over the memory cap the least recently used entries are dropped.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20):
+        """
+        :param max_bytes: Upper bound on the total size of the cached buffers in bytes. A waveform that is larger than
+            this on its own is encoded but never cached.
+        """
+        assert max_bytes >= 0, "max_bytes must not be negative"
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(command, channel, samples, codes: bool = False) -> Tuple[Hashable, ...]:
+        """
+        Builds the cache key for a waveform. The samples are hashed by content, so two equal arrays map to the same
+        entry even if they are different objects.
+
+        :param command: Command(s) the waveform is encoded with
+        :param channel: Channel(s) the waveform is encoded for
+        :param samples: Sample array
+        :param codes: If the samples are DAC codes instead of values between 0 and 1
+        :return: A hashable key
+        """
+        samples = np.ascontiguousarray(samples)
+        digest = hashlib.blake2b(samples.data, digest_size=16).digest()
+        return (WaveformCache._hashable(command), WaveformCache._hashable(channel),
+                samples.dtype.str, samples.shape, digest, codes)
+
+    @staticmethod
+    def _hashable(value) -> Hashable:
+        """Converts a scalar or an array of commands/channels into something that can be part of a key"""
+        if isinstance(value, (str, int)):
+            return value
+        value = np.asarray(value)
+        return value.dtype.str, value.shape, value.tobytes()
+
+    def get_or_encode(self, command, channel, samples, encode: Callable, codes: bool = False) -> np.ndarray:
+        """
+        Returns the encoded waveform from the cache, or encodes and stores it on a miss.
+
+        :param command: Command(s) passed on to encode
+        :param channel: Channel(s) passed on to encode
+        :param samples: Sample array passed on to encode
+        :param encode: Function with the signature of DAC8568.encode_words
+        :param codes: Passed on to encode
+        :return: The encoded buffer. It is read only because it is shared between calls.
+        """
+        key = WaveformCache.make_key(command, channel, samples, codes)
+        buffer = self._entries.get(key)
+        if buffer is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return buffer
+
+        self.misses += 1
+        buffer = encode(command, channel, samples, codes=codes)
+        buffer.flags.writeable = False
+        if buffer.nbytes <= self._max_bytes:
+            self._entries[key] = buffer
+            self._size_bytes += buffer.nbytes
+            self._evict()
+        return buffer
+
+    def _evict(self) -> None:
+        """Drops the least recently used entries until the cache fits in its memory cap"""
+        while self._size_bytes > self._max_bytes:
+            _, buffer = self._entries.popitem(last=False)
+            self._size_bytes -= buffer.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries. The hit, miss and eviction counters are kept."""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached buffers in bytes"""
+        return self._size_bytes
+
+    @property
+    def max_bytes(self) -> int:
+        """Memory cap in bytes"""
+        return self._max_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,222 @@
+import os
+import struct
+from typing import Sequence
+
+import numpy as np
+
+from .powerSource import DAC8568
+
+MAGIC = b"DAC8568W"
+VERSION = 1
+
+# magic, version, encoded, channel count, words per frame, sample rate, frame count, loop start, loop end, channels
+_HEADER = struct.Struct("<8sHHHHdQQQ8s")
+_HEADER_SIZE = 64  # The data starts here, so it is aligned for the memory map
+
+_VALUE_DTYPE = np.dtype("<u2")  # 16 bit DAC codes
+_WORD_DTYPE = np.dtype(">u4")  # Command words in the byte order they are sent in
+
+
+def _words_per_frame(channels: Sequence[str]) -> int:
+    """A single channel is played with one "WRITE_AND_UPDATE" per sample, several channels like DAC8568.stream_frames"""
+    return 1 if len(channels) == 1 else len(channels) + 1
+
+
+def _encode(channels: Sequence[str], frames: np.ndarray) -> np.ndarray:
+    """Encodes an N x len(channels) array of 16 bit codes into the command words that play it"""
+    if len(channels) == 1:
+        return DAC8568.encode_words("WRITE_AND_UPDATE", channels[0], frames[:, 0], codes=True)
+    return DAC8568.encode_frames(channels, frames, codes=True)
+
+
+class WaveformWriter:
+    """
+    Writes a waveform file one block of frames at a time, so waveforms larger than the RAM can be created.
+
+    A waveform file holds a 64 byte header followed by the frames. The header stores the channel characters, the sample
+    rate and the loop section. The frames are either 16 bit DAC codes, one per channel (half the size), or the command
+    words that are sent to the DAC (no encoding when the file is played).
+
+    Example::
+
+        with WaveformWriter("sine.dacw", channels=("A", "B"), sample_rate=10000, encoded=True) as writer:
+            for block in blocks:
+                writer.write(block)
+        DAC8568(baud_rate=100000).stream_file(WaveformFile("sine.dacw"))
+    """
+
+    def __init__(self, path: str, channels: Sequence[str] = ("A",), sample_rate: float = None, encoded: bool = False,
+                 loop_start: int = 0, loop_end: int = None):
+        """
+        :param path: File name. An existing file is overwritten.
+        :param channels: The channel characters that correspond to the columns of the frames, at most 8
+        :param sample_rate: Frames per second that the waveform is meant to be played at. None if it isn't fixed.
+        :param encoded: If true, command words are stored instead of 16 bit values
+        :param loop_start: First frame of the section that is repeated when the waveform is looped
+        :param loop_end: Frame after the last frame of the loop section. Defaults to the end of the waveform.
+        """
+        channels = tuple(channels)
+        assert 0 < len(channels) <= len(DAC8568._OUTPUTS), "Expected 1 to 8 channels"
+        for channel in channels:
+            assert channel in DAC8568._OUTPUTS, "Invalid channel: {}".format(channel)
+        assert loop_start >= 0 and (loop_end is None or loop_end > loop_start), "Invalid loop section"
+
+        self.path = path
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.encoded = encoded
+        self.loop_start = loop_start
+        self.loop_end = loop_end
+        self.frame_count = 0
+        self._file = open(path, "wb")
+        self._write_header()
+        self._file.seek(_HEADER_SIZE)
+
+    def write(self, frames, codes: bool = False) -> None:
+        """
+        Appends frames.
+
+        :param frames: An N x len(channels) array of values between 0 (inclusive) and 1(inclusive). A 1D array is
+            taken as the samples of a single channel.
+        :param codes: If true, frames holds 16 bit integer DAC codes instead of values
+        """
+        frames = np.asarray(frames)
+        if frames.ndim == 1:
+            frames = frames[:, np.newaxis]
+        assert frames.ndim == 2 and frames.shape[1] == len(self.channels), \
+            "Expected frames of shape (N, {})".format(len(self.channels))
+        frames = DAC8568._values_to_data_bits(frames, codes)
+        data = _encode(self.channels, frames) if self.encoded else frames.astype(_VALUE_DTYPE)
+        self._file.write(memoryview(np.ascontiguousarray(data)).cast("B"))
+        self.frame_count += len(frames)
+
+    def close(self) -> None:
+        """Writes the final header and closes the file"""
+        if self._file.closed:
+            return
+        try:
+            assert self.loop_end is None or self.loop_end <= self.frame_count, \
+                "The loop section ends after the last frame"
+            self._file.seek(0)
+            self._write_header()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "WaveformWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write_header(self) -> None:
+        loop_end = self.frame_count if self.loop_end is None else self.loop_end
+        header = _HEADER.pack(MAGIC, VERSION, int(self.encoded), len(self.channels),
+                              _words_per_frame(self.channels), self.sample_rate or 0., self.frame_count,
+                              self.loop_start, loop_end, "".join(self.channels).encode("ascii"))
+        self._file.write(header.ljust(_HEADER_SIZE, b"\0"))
+
+
+def save_waveform(path: str, frames, channels: Sequence[str] = ("A",), codes: bool = False, **kwargs) -> None:
+    """
+    Writes a waveform file in one go.
+
+    :param path: File name
+    :param frames: An N x len(channels) array of values, or a 1D array for a single channel
+    :param channels: The channel characters that correspond to the columns of frames
+    :param codes: If true, frames holds 16 bit integer DAC codes instead of values
+    :param kwargs: Passed on to WaveformWriter, ex. sample_rate or encoded
+    """
+    with WaveformWriter(path, channels, **kwargs) as writer:
+        writer.write(frames, codes)
+
+
+class WaveformFile:
+    """
+    A waveform file written with WaveformWriter, memory-mapped read-only. Only the parts of the file that are played
+    are read from disk, and the operating system can drop them from RAM again, so files of any size can be played.
+    Play it with DAC8568.stream_file or waveformPlayer.WaveformPlayer.play_file.
+
+    close, or leaving a with block, releases the memory map. Until then the file stays open, which on Windows means it
+    can't be deleted or overwritten.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: File name
+        :raise: ValueError if the file is not a waveform file of a supported version
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a waveform file".format(path))
+        (_, version, encoded, channel_count, words_per_frame, sample_rate, frame_count, loop_start, loop_end,
+         channels) = _HEADER.unpack_from(header)
+        if version != VERSION:
+            raise ValueError("Unsupported waveform file version {}".format(version))
+
+        self.path = path
+        self.channels = tuple(channels[:channel_count].decode("ascii"))
+        self.encoded = bool(encoded)
+        self.words_per_frame = words_per_frame
+        self.sample_rate = sample_rate or None
+        self.frame_count = frame_count
+        self.loop_start = loop_start
+        self.loop_end = loop_end
+
+        if encoded:
+            dtype, shape = _WORD_DTYPE, (frame_count * words_per_frame,)
+        else:
+            dtype, shape = _VALUE_DTYPE, (frame_count, channel_count)
+        if os.path.getsize(path) < _HEADER_SIZE + int(np.prod(shape)) * dtype.itemsize:
+            raise ValueError("{} is shorter than its header says".format(path))
+        if frame_count == 0:
+            self._data = np.empty(shape, dtype=dtype)
+        else:
+            self._data = np.memmap(path, dtype=dtype, mode="r", offset=_HEADER_SIZE, shape=shape)
+
+    @property
+    def _mapped(self) -> np.ndarray:
+        """The memory-mapped data of the file"""
+        if self._data is None:
+            raise ValueError("{} is closed".format(self.path))
+        return self._data
+
+    @property
+    def frames(self) -> np.ndarray:
+        """
+        The frames as an N x len(channels) array of 16 bit codes. This is a view of the file for files of values, and
+        is decoded into RAM for files of encoded words.
+        """
+        if not self.encoded:
+            return self._mapped
+        words = self._mapped.reshape(self.frame_count, self.words_per_frame)[:, :len(self.channels)]
+        return ((words >> 4) & 0xFFFF).astype(np.uint16)
+
+    def words(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        The command words that play a range of frames.
+
+        :param start: First frame
+        :param stop: Frame after the last frame. Defaults to the end of the waveform.
+        :return: A flat array of big-endian words. For files of encoded words this is a view of the memory map.
+        """
+        stop = self.frame_count if stop is None else min(stop, self.frame_count)
+        if self.encoded:
+            return self._mapped[start * self.words_per_frame:stop * self.words_per_frame]
+        return _encode(self.channels, self._mapped[start:stop])
+
+    def close(self) -> None:
+        """
+        Releases the memory map. Arrays returned by frames and words are views of it, so the file is only unmapped once
+        they are gone too. Using the waveform after close raises ValueError.
+        """
+        self._data = None
+
+    def __enter__(self) -> "WaveformFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.frame_count
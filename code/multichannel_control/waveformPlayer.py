@@ -0,0 +1,268 @@
+import queue
+import threading
+from typing import Iterable
+
+import numpy as np
+
+from .powerSource import DAC8568
+from .sampleScheduler import SampleScheduler
+
+_END = object()  # Marks the end of a program in the chunk queue
+
+
+class WaveformPlayer:
+    """
+    Plays waveforms on a DAC8568 from a background thread so the calling thread is free to take measurements.
+    A feeder thread cuts the encoded waveform into chunks (or encodes chunks as they are generated) and puts them in a
+    small bounded queue, and a worker thread takes the chunks off the queue and writes them to the DAC. With the default
+    queue depth of 2 one chunk is being sent while the next one is ready, like a double buffer.
+
+    While a player is running it owns the DAC, so don't call the DAC from another thread at the same time.
+
+    If generating, encoding or sending a chunk raises an exception, playback ends and the exception is raised by the
+    next call of wait or stop.
+    """
+
+    def __init__(self, dac: DAC8568, sample_rate: float = None, chunk_size: int = 1024, queue_depth: int = 2):
+        """
+        :param dac: The DAC that the waveforms are played on
+        :param sample_rate: Target number of samples (or frames) per second. If None, samples are sent as fast as the
+            bus allows. Otherwise the writes are paced by a SampleScheduler, available as the scheduler attribute
+            once playback has started.
+        :param chunk_size: Number of samples per chunk in the queue
+        :param queue_depth: Number of chunks that can be waiting in the queue
+        """
+        assert chunk_size > 0, "chunk_size must be positive"
+        assert queue_depth > 0, "queue_depth must be positive"
+        self._dac = dac
+        self.sample_rate = sample_rate
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._resumed = threading.Event()  # Cleared while paused
+        self._stopping = threading.Event()
+        self._feeder = None
+        self._worker = None
+        self._error = None  # Exception raised in the feeder or worker thread
+        self.scheduler = None
+
+        self.underruns = 0  # Number of times the worker was ready to send but the queue was empty
+        self.chunks_played = 0
+        self.samples_played = 0
+
+    def play(self, channel: str, samples, loop: bool = False, command: str = "WRITE_AND_UPDATE",
+             codes: bool = False) -> None:
+        """
+        Starts playing a waveform on one channel. Any waveform that is already playing is stopped first.
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param samples: Array of values between 0 (inclusive) and 1(inclusive)
+        :param loop: If true the waveform is repeated until stop is called
+        :param command: The command used for each sample. Defaults to "WRITE_AND_UPDATE".
+        :param codes: If true, samples are 16 bit integer DAC codes instead of values
+        """
+        words = self._dac._encode(command, channel, samples, codes)
+        self._start(self._slice_chunks, (words, 1, loop), words_per_sample=1)
+
+    def play_frames(self, frames, channels=DAC8568._OUTPUTS, loop: bool = False, codes: bool = False) -> None:
+        """
+        Starts playing a multi-channel waveform frame by frame, with the same framing as DAC8568.stream_frames.
+
+        :param frames: An N x len(channels) array. Row i holds the values of every channel for frame i.
+        :param channels: The channel characters that correspond to the columns of frames. Defaults to "A" to "H".
+        :param loop: If true the waveform is repeated until stop is called
+        :param codes: If true, frames holds 16 bit integer DAC codes instead of values
+        """
+        frames = np.asarray(frames)
+        assert frames.ndim == 2 and frames.shape[1] == len(channels), \
+            "Expected frames of shape (N, {})".format(len(channels))
+        words_per_frame = len(channels) + 1
+        words = self._dac._encode_frames(channels, frames, codes)
+        self._start(self._slice_chunks, (words, words_per_frame, loop), words_per_sample=words_per_frame)
+
+    def play_chunks(self, channel: str, sample_chunks: Iterable, command: str = "WRITE_AND_UPDATE",
+                    codes: bool = False) -> None:
+        """
+        Starts playing a waveform that is generated while it plays. Each chunk is encoded in the feeder thread, so
+        generating and encoding the next chunk overlaps with sending the current one.
+
+        :param channel: The character that represents the output that you want to change. Ex. "A" or "H".
+        :param sample_chunks: Iterable of sample arrays, ex. a generator
+        :param command: The command used for each sample. Defaults to "WRITE_AND_UPDATE".
+        :param codes: If true, the chunks hold 16 bit integer DAC codes instead of values
+        """
+        self._start(self._encode_chunks, (command, channel, sample_chunks, codes), words_per_sample=1)
+
+    def play_file(self, waveform, loop: bool = False) -> None:
+        """
+        Starts playing a waveform file. Chunks of files of encoded words are views of the memory map, so nothing is
+        copied or encoded. Chunks of files of values are encoded in the feeder thread.
+
+        If the player has no sample rate, the sample rate stored in the file is used.
+
+        :param waveform: A waveformFile.WaveformFile
+        :param loop: If true, the frames up to the end of the loop section of the file are played once and then the
+            loop section is repeated until stop is called
+        """
+        self._start(self._file_chunks, (waveform, loop), words_per_sample=waveform.words_per_frame,
+                    sample_rate=self.sample_rate or waveform.sample_rate)
+
+    def _start(self, feed, feed_args: tuple, words_per_sample: int, sample_rate: float = None) -> None:
+        """Stops the current program and starts the feeder and worker threads for a new one"""
+        self.stop()
+        self.underruns = 0
+        self.chunks_played = 0
+        self.samples_played = 0
+        self._stopping.clear()
+        self._resumed.set()
+        sample_rate = self.sample_rate if sample_rate is None else sample_rate
+        self.scheduler = SampleScheduler(sample_rate) if sample_rate else None
+        self._feeder = threading.Thread(target=self._feed, args=(feed, feed_args), daemon=True)
+        self._worker = threading.Thread(target=self._play, args=(words_per_sample,), daemon=True)
+        self._feeder.start()
+        self._worker.start()
+
+    def pause(self) -> None:
+        """Stops sending after the current chunk. The outputs hold their last value."""
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        """Continues a paused waveform"""
+        self._resumed.set()
+
+    def stop(self) -> None:
+        """
+        Stops playback and waits for the background threads to finish
+
+        :raise: The exception that ended the program early, if any
+        """
+        self._stopping.set()
+        self._resumed.set()
+        for thread in (self._feeder, self._worker):
+            if thread is not None:
+                thread.join()
+        self._feeder = None
+        self._worker = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._raise_error()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Blocks until a non-looping waveform has finished playing.
+
+        :param timeout: Maximum time to wait in seconds
+        :return: True if playback has finished
+        :raise: The exception that ended the program early, if any
+        """
+        if self._worker is not None:
+            self._worker.join(timeout)
+        if self.is_playing:
+            return False
+        self._raise_error()
+        return True
+
+    def _raise_error(self) -> None:
+        """Raises the exception of the feeder or worker thread once"""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    @property
+    def is_playing(self) -> bool:
+        """True while the worker thread is running, including while paused"""
+        return self._worker is not None and self._worker.is_alive()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    def _slice_chunks(self, words: np.ndarray, words_per_sample: int, loop: bool):
+        """Yields views of an encoded buffer, restarting at the beginning in loop mode. An empty buffer yields
+        nothing, also in loop mode."""
+        chunk_words = self._chunk_size * words_per_sample
+        while len(words) and not self._stopping.is_set():
+            for start in range(0, len(words), chunk_words):
+                yield words[start:start + chunk_words]
+            if not loop:
+                return
+
+    def _file_chunks(self, waveform, loop: bool):
+        """Yields the words of a waveform file chunk by chunk, repeating its loop section in loop mode"""
+        loop = loop and waveform.loop_end > waveform.loop_start
+        start, stop = 0, waveform.loop_end if loop else waveform.frame_count
+        while True:
+            for chunk_start in range(start, stop, self._chunk_size):
+                yield waveform.words(chunk_start, min(chunk_start + self._chunk_size, stop))
+            if not loop:
+                return
+            start = waveform.loop_start
+
+    def _encode_chunks(self, command: str, channel: str, sample_chunks: Iterable, codes: bool):
+        """Yields each chunk of samples encoded with DAC8568.encode_words"""
+        for samples in sample_chunks:
+            yield DAC8568.encode_words(command, channel, samples, codes=codes)
+
+    def _feed(self, feed, feed_args: tuple) -> None:
+        """Feeder thread: puts encoded chunks on the queue, blocking while it is full"""
+        try:
+            for chunk in feed(*feed_args):
+                if not self._put(chunk):
+                    return
+        except Exception as error:
+            # The worker plays the chunks that are already queued and then stops at _END
+            self._error = error
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        """Puts an item on the queue unless playback is stopped first. Returns False if it was stopped."""
+        while not self._stopping.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self):
+        """Takes the next chunk from the queue. Returns None if playback is stopped first."""
+        while not self._stopping.is_set():
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _play(self, words_per_sample: int) -> None:
+        """Worker thread: runs _send_chunks and stops the feeder if it fails"""
+        try:
+            self._send_chunks(words_per_sample)
+        except Exception as error:
+            self._error = error
+            self._stopping.set()
+
+    def _send_chunks(self, words_per_sample: int) -> None:
+        """Writes chunks to the DAC, paced by the scheduler if there is one, until _END or stop"""
+        while not self._stopping.is_set():
+            if self.is_paused:
+                self._resumed.wait()
+                if self.scheduler is not None:
+                    self.scheduler.rebase()
+                continue
+
+            try:
+                chunk = self._queue.get_nowait()
+            except queue.Empty:
+                if self.chunks_played > 0:
+                    self.underruns += 1
+                chunk = self._get()
+            if chunk is None or chunk is _END:
+                return
+
+            samples = len(chunk) // words_per_sample
+            if self.scheduler is None:
+                self._dac._write_frames(chunk, len(chunk))
+            else:
+                offsets = self._dac._sample_offsets(len(chunk), words_per_sample)
+                self._dac._write_paced(chunk, offsets, self.scheduler, samples)
+            self.chunks_played += 1
+            self.samples_played += samples
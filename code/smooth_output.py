@@ -1,7 +1,7 @@
 #Demo to show smooth output from the DAC
 
 import numpy as np
-from code.powerSource import DAC8568
+from multichannel_control.powerSource import DAC8568
 
 def generate_points():
     n = 1000
@@ -15,8 +15,7 @@ def smooth_point():
 
     dac = DAC8568(baud_rate=100000)
     while True:
-        for y in Y:
-            dac.write_and_update(channel="A", value=float(y))
+        dac.stream_waveform(channel="A", samples=Y)
 
 if __name__=='__main__':
     smooth_point()
\ No newline at end of file
@@ -1,7 +1,6 @@
-import sys
-sys.path.insert(1, '../code/')
-from lightSource import TSL510
+from multichannel_control import TSL510
 
 if __name__=='__main__':
-    light = TSL510();
+    light = TSL510()
+    light.connect()
     print(light.status())
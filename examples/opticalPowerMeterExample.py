@@ -1,11 +1,8 @@
-import sys
-
-sys.path.insert(1, '../code/')
-from tools import PowerUnit
-from opticalPowerMeter import KEYSIGHT81634B
+from multichannel_control import KEYSIGHT81634B, MeasurementRecorder, PowerUnit
 
 if __name__ == '__main__':
-    meter = KEYSIGHT81634B();
+    meter = KEYSIGHT81634B()
+    meter.connect()
 
     meter.set_power_unit(PowerUnit.W)
 
@@ -13,3 +10,12 @@ if __name__ == '__main__':
 
     for _ in range(10):
         print(meter.get_power())
+
+    # Fast block capture with the meter's internal logging function
+    readings = meter.log_power(samples=1000, averaging_time=0.0001)
+    print(readings.mean(), readings.std())
+
+    # Long captures go to memory-mapped files on disk instead of Python lists
+    with MeasurementRecorder("power_capture", fields=("power",)) as recorder:
+        for _ in range(10000):
+            recorder.record(meter.get_power())
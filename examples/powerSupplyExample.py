@@ -1,7 +1,5 @@
 import numpy as np
-import sys
-sys.path.insert(1, '../code/')
-from powerSource import DAC8568
+from multichannel_control import DAC8568, WaveformCache
 
 def generate_points():
     n = 1000
@@ -13,10 +11,9 @@ def generate_points():
 def smooth_point():
     _, Y = generate_points()
 
-    dac = DAC8568(baud_rate=100000)
+    dac = DAC8568(baud_rate=100000, waveform_cache=WaveformCache())
     while True:
-        for y in Y:
-            dac.write_and_update(channel="A", value=float(y))
+        dac.stream_waveform(channel="A", samples=Y)
 
 if __name__=='__main__':
     smooth_point()
\ No newline at end of file
@@ -0,0 +1,17 @@
+from setuptools import setup
+
+setup(
+    name="multichannel_control",
+    version="0.0.1",
+    description="Control of a multichannel DAC, a tunable laser and an optical power meter",
+    author="James Whitehead",
+    url="https://multichannel-control.readthedocs.io/en/latest/",
+    package_dir={"": "code"},
+    packages=["multichannel_control"],
+    python_requires=">=3.7",
+    install_requires=["numpy"],
+    extras_require={
+        "visa": ["pyvisa"],  # TSL510 and KEYSIGHT81634B
+        "ft232h": ["adafruit-blinka", "pyftdi"],  # DAC8568 through the FT232H board
+    },
+)